@@ -38,9 +38,6 @@ npx esbuild ./webapp/editEntry.js --bundle --minify --sourcemap --outfile=./soci
 echo "Bundling writePost.js..."
 npx esbuild ./webapp/writePost.js --bundle --minify --sourcemap --outfile=./socialdistribution/static/writePost.min.js || exit 1
 
-echo "Bundling renderPosts.js..."
-npx esbuild ./webapp/renderPosts.js --bundle --minify --sourcemap --outfile=./socialdistribution/static/renderPosts.min.js || exit 1
-
 echo "Bundling livePreview.js..."
 npx esbuild ./webapp/livePreview.js --bundle --minify --sourcemap --outfile=./socialdistribution/static/livePreview.min.js || exit 1
 
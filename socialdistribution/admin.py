@@ -6,6 +6,9 @@ from .models import Entry
 from .models import Comment
 from .models import Like
 from .models import RemoteNode
+from .models import NodeSyncJob
+from .models import InboxItem
+from . import sync_jobs
 from django import forms
 # localhost:8000/admin
 # username: admin
@@ -126,6 +129,44 @@ class RemoteNodeAdminForm(forms.ModelForm):
         return node
 
 
+class NodeSyncJobInline(admin.TabularInline):
+    model = NodeSyncJob
+    fields = ("kind", "state", "rerun", "runs", "requested_at", "started_at", "finished_at", "last_error")
+    readonly_fields = fields
+    extra = 0
+    can_delete = False
+
+    def has_add_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(NodeSyncJob)
+class NodeSyncJobAdmin(admin.ModelAdmin):
+    list_display = ("node", "kind", "state", "rerun", "runs", "requested_at", "started_at", "finished_at")
+    list_filter = ("state", "kind")
+    readonly_fields = [field.name for field in NodeSyncJob._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(InboxItem)
+class InboxItemAdmin(admin.ModelAdmin):
+    list_display = ("type", "owner", "sender", "received_at")
+    list_filter = ("type",)
+    search_fields = ("sender", "owner__username")
+    readonly_fields = [field.name for field in InboxItem._meta.fields]
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
 @admin.register(RemoteNode)
 class RemoteNodeAdmin(admin.ModelAdmin):
     form = RemoteNodeAdminForm
@@ -134,8 +175,37 @@ class RemoteNodeAdmin(admin.ModelAdmin):
         "service_account_username",
         "service_account_password",
         "service_account_active",
+        "sync_status",
     )
     readonly_fields = ("service_account",)
+    inlines = [NodeSyncJobInline]
+    actions = ["resync_now", "resend_local_content"]
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).select_related("service_account").prefetch_related("sync_jobs")
+
+    def sync_status(self, obj):
+        return ", ".join(f"{job.kind}: {job.get_state_display().lower()}" for job in obj.sync_jobs.all())
+    sync_status.short_description = "Sync jobs"
+
+    def _schedule(self, request, queryset, kinds):
+        started = coalesced = 0
+        for node in queryset:
+            count = len(sync_jobs.schedule(node, kinds))
+            started += count
+            coalesced += len(kinds) - count
+        message = f"Started {started} sync job(s)"
+        if coalesced:
+            message += f"; {coalesced} already running will run again when they finish"
+        self.message_user(request, message + ".")
+
+    @admin.action(description="Resync now (pull entries, comments and likes)")
+    def resync_now(self, request, queryset):
+        self._schedule(request, queryset, sync_jobs.PULL_KINDS)
+
+    @admin.action(description="Resend all local content")
+    def resend_local_content(self, request, queryset):
+        self._schedule(request, queryset, (NodeSyncJob.BACKFILL,))
 
     def service_account_username(self, obj):
         if obj.service_account:
@@ -0,0 +1,153 @@
+"""
+Shared cache of author representations.
+
+The author object is embedded in every entry, comment and like, so one
+response serializes the same few authors over and over, and the next
+response does it again.  Representations are cached per author id in the
+default cache, which every worker shares, and stamped with the author's
+``updated_at`` and with the author's version at the time of the read:
+
+* ``for_author(author)`` and ``for_authors(authors)`` serve Author
+  instances, rebuilding any whose cached ``updated_at`` differs from the
+  instance;
+* ``for_ids(ids)`` serves many authors by id with one cache round trip and,
+  for the misses, one query, without loading the Author instances.  It has
+  no ``updated_at`` to compare, so it rejects entries whose version is not
+  the author's current one.
+
+``invalidate(ids)`` drops entries and gives the authors a new version when a
+profile changes, so a representation a slower request built from the old
+row and stored afterwards is rejected too.  ``Author.save()`` triggers it
+through the signal in ``models/author.py``; ``AuthorIdentityMap`` calls it
+after updating remote authors in bulk.
+"""
+import hashlib
+import uuid
+from urllib.parse import quote
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from socialdistribution import metrics
+
+KEY_PREFIX = "author-repr"
+VERSION_PREFIX = "author-repr-version"
+# Seconds an unchanged representation is kept.
+TTL = 60 * 60
+# Author columns the representation is built from.
+COLUMNS = ("id", "host", "display_name", "github_link", "profile_image")
+# Ids per IN (...) list when loading misses; stays under SQLite's variable limit.
+LOOKUP_CHUNK = 400
+
+
+def build(values, prefix="", base=None):
+    """Return the author object for ``COLUMNS`` read from ``values`` (keys may carry ``prefix``)."""
+    if base is None:
+        base = settings.BASE_URL.rstrip("/")
+    author_id = values[prefix + "id"]
+    return {
+        "type": "author",
+        "id": author_id,
+        "host": values[prefix + "host"],
+        "displayName": values[prefix + "display_name"],
+        "github": values[prefix + "github_link"],
+        "profileImage": values[prefix + "profile_image"],
+        "web": f"{base}/authors/{quote(author_id, safe='')}/",
+    }
+
+
+def _key(author_id):
+    # ``web`` depends on BASE_URL, so the key does too.
+    digest = hashlib.sha1(f"{settings.BASE_URL}|{author_id}".encode()).hexdigest()
+    return f"{KEY_PREFIX}:{digest}"
+
+
+def _version_key(author_id):
+    return f"{VERSION_PREFIX}:{hashlib.sha1(author_id.encode()).hexdigest()}"
+
+
+def _lookup(author_ids):
+    """Return ``(entries, versions)`` by author id, read in one round trip."""
+    keys = {}
+    for author_id in author_ids:
+        keys[_key(author_id)] = ("entry", author_id)
+        keys[_version_key(author_id)] = ("version", author_id)
+    entries, versions = {}, {}
+    for key, value in cache.get_many(keys).items():
+        kind, author_id = keys[key]
+        (entries if kind == "entry" else versions)[author_id] = value
+    return entries, versions
+
+
+def for_authors(authors):
+    """Return the representations of Author instances, in order."""
+    entries, versions = _lookup({author.pk for author in authors})
+    result, built = [], {}
+    for author in authors:
+        entry = entries.get(author.pk)
+        hit = entry is not None and entry[0] == author.updated_at
+        metrics.cache_lookup("author_repr", hit)
+        if not hit:
+            data = build({c: getattr(author, c) for c in COLUMNS})
+            entry = entries[author.pk] = (author.updated_at, versions.get(author.pk), data)
+            built[_key(author.pk)] = entry
+        result.append(entry[2])
+    if built:
+        cache.set_many(built, TTL)
+    return result
+
+
+def for_author(author):
+    """Return the representation of an Author instance."""
+    return for_authors([author])[0]
+
+
+def for_ids(ids):
+    """Return ``{author id: representation}`` for ``ids``; unknown ids are left out."""
+    ids = set(ids)
+    if not ids:
+        return {}
+    entries, versions = _lookup(ids)
+    found = {
+        author_id: entry[2] for author_id, entry in entries.items()
+        if entry[1] == versions.get(author_id)
+    }
+    missing = [author_id for author_id in ids if author_id not in found]
+    for author_id in ids:
+        metrics.cache_lookup("author_repr", author_id in found)
+    if missing:
+        from socialdistribution.models import Author
+
+        base = settings.BASE_URL.rstrip("/")
+        loaded = {}
+        for start in range(0, len(missing), LOOKUP_CHUNK):
+            rows = Author.objects.filter(id__in=missing[start:start + LOOKUP_CHUNK]).values(*COLUMNS, "updated_at")
+            for row in rows:
+                data = found[row["id"]] = build(row, base=base)
+                # Stamped with the version read before the query, so an
+                # invalidation that lands in between rejects this entry.
+                loaded[_key(row["id"])] = (row["updated_at"], versions.get(row["id"]), data)
+        cache.set_many(loaded, TTL)
+    return found
+
+
+def author_of(obj):
+    """Return the representation of ``obj.author``, loading the author only on a miss."""
+    if type(obj).author.is_cached(obj):
+        return for_author(obj.author)
+    return for_ids([obj.author_id]).get(obj.author_id) or for_author(obj.author)
+
+
+def invalidate(ids):
+    """Drop the cached representations of ``ids``, now and once the transaction commits."""
+    ids = list(ids)
+    if not ids:
+        return
+
+    def drop():
+        cache.delete_many([_key(author_id) for author_id in ids])
+        # Kept longer than TTL so it outlives any entry stamped with the old version.
+        cache.set_many({_version_key(author_id): uuid.uuid4().hex for author_id in ids}, 2 * TTL)
+
+    drop()
+    # A request that read the old row before the commit may have put it back.
+    transaction.on_commit(drop)
@@ -0,0 +1,53 @@
+"""
+Conditional GET for the API.
+
+Peers poll our entries, authors and their comment and like collections on
+every ``sync_remote_*`` run.  Views that mix in ``ConditionalGetMixin``
+build a weak ETag from values they already have or can get with one
+aggregate query: ``updated_at`` (or the newest ``created_at``) and the
+denormalized counts.  A matching ``If-None-Match`` is answered with
+``304 Not Modified`` before anything is serialized.
+
+The ETag also covers the path, the query string (pages, ``?fields=``,
+``?render=``) and the viewer, whose permissions pick what a list holds.
+It is weak: it changes when the resource or its counts change, but not
+when an embedded author edits their profile.
+
+Detail resources also send ``Last-Modified``.  It is informational only:
+counts change without moving it, so ``If-Modified-Since`` alone never
+produces a 304.
+"""
+import hashlib
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def weak_etag(request, *parts):
+    """A weak ETag for ``parts`` as seen at this URL by this viewer."""
+    viewer = request.user.pk if request.user.is_authenticated else ""
+    source = "\n".join(str(p) for p in (request.get_full_path(), viewer, *parts))
+    return 'W/"%s"' % hashlib.sha1(source.encode()).hexdigest()
+
+
+class ConditionalGetMixin:
+    """
+    ``If-None-Match`` handling for APIViews.
+
+    Call ``not_modified()`` once access has been checked; return its
+    response if it is not ``None``.  The validators are added to the final
+    200 or 304 response.
+    """
+
+    def not_modified(self, request, *parts, last_modified=None):
+        etag = weak_etag(request, *parts)
+        self._validators = {"ETag": etag}
+        if last_modified is not None:
+            self._validators["Last-Modified"] = http_date(last_modified.timestamp())
+        return get_conditional_response(request, etag=etag)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if response.status_code in (200, 304):
+            for header, value in getattr(self, "_validators", {}).items():
+                response.setdefault(header, value)
+        return response
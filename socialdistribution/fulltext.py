@@ -0,0 +1,162 @@
+"""
+Full-text index over entry titles, descriptions and content.
+
+PostgreSQL keeps a weighted ``tsvector`` per entry in a side table with a
+GIN index; SQLite uses an FTS5 virtual table.  Both are created by
+migration 0009 and kept current one row at a time by the Entry signal
+handlers, so searches never scan the entry table.  Base64 payloads (image
+entries and inline ``data:`` URIs) are stripped before indexing.
+
+This module talks to the database directly and imports no models, so the
+model modules and migrations can use it freely.
+"""
+import hashlib
+import re
+from django.db import connection
+
+TABLE = "socialdistribution_entry_fts"
+
+# Entries whose whole body is an encoded payload; only their title and
+# description are indexed.
+BASE64_CONTENT_TYPES = {"application/base64", "image/png;base64", "image/jpeg;base64"}
+DATA_URI = re.compile(r"data:[\w/+.-]+;base64,[A-Za-z0-9+/=\s]*")
+# Enough for any real post; keeps one huge entry from bloating the index.
+MAX_INDEXED_CHARS = 100_000
+# Ranked matches considered per search before visibility filtering.
+MAX_MATCHES = 1000
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+_available = {}
+
+
+def supported(vendor=None):
+    return (vendor or connection.vendor) in ("postgresql", "sqlite")
+
+
+def available():
+    """Whether the index table exists on the current database."""
+    alias = connection.alias
+    if alias not in _available:
+        _available[alias] = supported() and TABLE in connection.introspection.table_names()
+    return _available[alias]
+
+
+def indexable_content(content, content_type):
+    """Return the text of ``content`` worth indexing."""
+    if content_type in BASE64_CONTENT_TYPES or (content_type or "").endswith(";base64"):
+        return ""
+    return DATA_URI.sub(" ", content or "")[:MAX_INDEXED_CHARS]
+
+
+def _rowid(entry_id):
+    # FTS5 rows need an integer key; a 63-bit digest of the FQID is stable
+    # and lets updates and deletes hit the rowid B-tree.
+    return int.from_bytes(hashlib.sha1(entry_id.encode()).digest()[:8], "big") >> 1
+
+
+def create(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == "postgresql":
+        schema_editor.execute(
+            # No FK to the entry table: rows are removed by the Entry
+            # post_delete handler, and an FK would block Django's TRUNCATE flush.
+            f'CREATE TABLE IF NOT EXISTS {TABLE} ('
+            f'entry_id varchar(300) PRIMARY KEY, document tsvector NOT NULL)'
+        )
+        schema_editor.execute(
+            f"CREATE INDEX IF NOT EXISTS {TABLE}_document ON {TABLE} USING gin (document)"
+        )
+    elif vendor == "sqlite":
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+            f"entry_id UNINDEXED, title, description, content, "
+            f"tokenize = 'unicode61 remove_diacritics 2')"
+        )
+    _available.clear()
+
+
+def drop(schema_editor):
+    if supported(schema_editor.connection.vendor):
+        schema_editor.execute(f"DROP TABLE IF EXISTS {TABLE}")
+    _available.clear()
+
+
+def index_document(entry_id, title, description, content, content_type, cursor=None):
+    """Insert or replace the index row for one entry."""
+    text = indexable_content(content, content_type)
+    own_cursor = cursor is None
+    cursor = cursor or connection.cursor()
+    try:
+        if cursor.db.vendor == "postgresql":
+            cursor.execute(
+                f"INSERT INTO {TABLE} (entry_id, document) VALUES (%s, "
+                f"setweight(to_tsvector('english', %s), 'A') || "
+                f"setweight(to_tsvector('english', %s), 'B') || "
+                f"setweight(to_tsvector('english', %s), 'C')) "
+                f"ON CONFLICT (entry_id) DO UPDATE SET document = EXCLUDED.document",
+                [entry_id, title or "", description or "", text],
+            )
+        else:
+            rowid = _rowid(entry_id)
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [rowid])
+            cursor.execute(
+                f"INSERT INTO {TABLE} (rowid, entry_id, title, description, content) "
+                f"VALUES (%s, %s, %s, %s, %s)",
+                [rowid, entry_id, title or "", description or "", text],
+            )
+    finally:
+        if own_cursor:
+            cursor.close()
+
+
+def index_entry(entry):
+    """Bring the index row for ``entry`` up to date (removing deleted entries)."""
+    if not available():
+        return
+    if entry.is_deleted or entry.visibility == "DELETED":
+        remove_entry(entry.pk)
+        return
+    index_document(entry.pk, entry.title, entry.description, entry.content, entry.contentType)
+
+
+def remove_entry(entry_id):
+    if not available():
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(f"DELETE FROM {TABLE} WHERE entry_id = %s", [entry_id])
+        else:
+            cursor.execute(f"DELETE FROM {TABLE} WHERE rowid = %s", [_rowid(entry_id)])
+
+
+def _fts5_query(query):
+    # Quote every word so user input can never be parsed as FTS5 syntax;
+    # the trailing * makes the last word a prefix for search-as-you-type.
+    words = _WORD.findall(query)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+def match_ids(query, limit=MAX_MATCHES):
+    """Return up to ``limit`` matching entry ids, best match first."""
+    with connection.cursor() as cursor:
+        if connection.vendor == "postgresql":
+            cursor.execute(
+                f"SELECT entry_id FROM {TABLE}, websearch_to_tsquery('english', %s) q "
+                f"WHERE document @@ q ORDER BY ts_rank(document, q) DESC LIMIT %s",
+                [query, limit],
+            )
+        else:
+            fts_query = _fts5_query(query)
+            if fts_query is None:
+                return []
+            # Column weights: entry_id (unindexed), title, description, content.
+            cursor.execute(
+                f"SELECT entry_id FROM {TABLE} WHERE {TABLE} MATCH %s "
+                f"ORDER BY bm25({TABLE}, 0.0, 10.0, 4.0, 1.0) LIMIT %s",
+                [fts_query, limit],
+            )
+        return [row[0] for row in cursor.fetchall()]
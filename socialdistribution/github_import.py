@@ -0,0 +1,288 @@
+"""
+GitHub activity importer.
+
+Turns local authors' public GitHub events into PUBLIC entries.  For every
+author with a ``github_link`` the importer:
+
+- waits out GitHub's ``X-Poll-Interval`` before polling a feed again,
+- repeats the stored ``ETag`` so unchanged feeds come back as a 304, which
+  GitHub does not count against the rate limit,
+- fetches several feeds at once over one pooled session, and stops issuing
+  requests as soon as the rate limit is exhausted,
+- locks the authors being imported, checks all candidate events with one
+  query per chunk and inserts the new ones with a single ``bulk_create``;
+  under the lock a concurrent run cannot insert the same events in between,
+  so exactly the inserted entries are indexed and broadcast,
+- hands every new entry to one batched remote broadcast after commit.
+
+The API root is ``settings.GITHUB_API_URL`` so local runs and tests can
+point the importer at a stub server.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone as dt_timezone
+from urllib.parse import urlparse
+import requests
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from socialdistribution import fulltext, instrumentation, outbound, page_cache
+from socialdistribution.models import Author, Entry, GitHubFeed
+
+DEFAULT_API_URL = "https://api.github.com"
+# GitHub's documented default when no X-Poll-Interval is sent.
+DEFAULT_POLL_INTERVAL = 60
+MAX_WORKERS = 4
+TIMEOUT = 10
+# Ids checked per existence query; stays under SQLite's variable limit.
+LOOKUP_CHUNK = 500
+
+
+def github_username(link):
+    """Return the GitHub login from a profile URL, or ``""``."""
+    path = urlparse(link or "").path.strip("/")
+    return path.split("/")[0] if path else ""
+
+
+def entry_id_for(author, event_id):
+    return f"{settings.BASE_URL.rstrip('/')}/api/authors/{author.uuid}/entries/{event_id}"
+
+
+def event_fields(ev):
+    """Return the Entry fields for one GitHub event."""
+    ev_type = ev.get("type", "")
+    repo_name = ev.get("repo", {}).get("name", "")
+
+    # For PushEvent, list commit messages; otherwise just show the repo name.
+    lines = []
+    if ev_type == "PushEvent":
+        for c in ev.get("payload", {}).get("commits", []):
+            msg = c.get("message", "").strip()
+            if msg:
+                lines.append(f"{repo_name}: {msg}")
+    if not lines:
+        lines = [repo_name]
+
+    dt = None
+    created_at = ev.get("created_at")
+    if created_at:
+        dt = parse_datetime(created_at)
+        if dt and timezone.is_naive(dt):
+            dt = timezone.make_aware(dt, dt_timezone.utc)
+    if not dt:
+        dt = timezone.now()
+
+    return {
+        "visibility": "PUBLIC",
+        "title": f"[GitHub] {ev_type}",
+        "content": "\n".join(lines),
+        "contentType": "text/plain",
+        "description": ev_type,
+        "created_at": dt,
+        "updated_at": dt,
+    }
+
+
+def _int_header(headers, name, default=None):
+    try:
+        return int(headers.get(name))
+    except (TypeError, ValueError):
+        return default
+
+
+class ImportReport:
+    """Outcome of one importer run."""
+
+    def __init__(self):
+        self.created = []       # new Entry objects
+        self.polled = 0         # feeds requested from GitHub
+        self.not_modified = 0   # feeds answered with 304
+        self.not_due = 0        # feeds skipped because of X-Poll-Interval
+        self.rate_limited = 0   # feeds skipped because the rate limit ran out
+        self.errors = []        # (author, message)
+
+
+class GitHubImporter:
+    def __init__(self, max_workers=MAX_WORKERS, api_url=None, token=None, broadcast=True):
+        self.max_workers = max_workers
+        self.api_url = (api_url or getattr(settings, "GITHUB_API_URL", DEFAULT_API_URL)).rstrip("/")
+        self.headers = {"Accept": "application/vnd.github+json"}
+        token = token or getattr(settings, "GITHUB_TOKEN", None)
+        if token:
+            self.headers["Authorization"] = f"token {token}"
+        self.broadcast = broadcast
+        self._session = instrumentation.ProfiledSession()
+        # Epoch seconds until which GitHub has no requests left for us; the
+        # fetch threads share it, so it is only touched under the lock.
+        self._blocked_until = 0
+        self._blocked_lock = threading.Lock()
+        self._broadcasts = []
+
+    def _fetch(self, job):
+        """Poll one feed. Runs in a worker thread, so it must not touch the database."""
+        username, etag = job
+        with self._blocked_lock:
+            blocked_until = self._blocked_until
+        if time.time() < blocked_until:
+            return {"status": "rate_limited"}
+
+        headers = dict(self.headers)
+        if etag:
+            headers["If-None-Match"] = etag
+        try:
+            resp = self._session.get(
+                f"{self.api_url}/users/{username}/events/public",
+                headers=headers,
+                timeout=TIMEOUT,
+            )
+        except requests.RequestException as e:
+            return {"status": 0, "error": str(e)}
+
+        result = {
+            "status": resp.status_code,
+            "interval": _int_header(resp.headers, "X-Poll-Interval", DEFAULT_POLL_INTERVAL),
+        }
+        if _int_header(resp.headers, "X-RateLimit-Remaining") == 0:
+            reset = _int_header(resp.headers, "X-RateLimit-Reset", int(time.time()) + 60)
+            with self._blocked_lock:
+                self._blocked_until = max(self._blocked_until, reset)
+            result["reset"] = reset
+
+        if resp.status_code == 200:
+            try:
+                events = resp.json()
+            except ValueError:
+                return {**result, "status": 0, "error": "GitHub returned invalid JSON"}
+            result["events"] = events if isinstance(events, list) else []
+            result["etag"] = resp.headers.get("ETag", "")
+        elif resp.status_code != 304:
+            result["error"] = f"GitHub returned {resp.status_code}"
+        return result
+
+    def run(self, authors, force=False):
+        """
+        Import new events for ``authors``.
+
+        ``force`` polls every feed even if its poll interval has not passed;
+        the ETag still makes an unchanged feed cheap.
+        """
+        report = ImportReport()
+        now = timezone.now()
+        authors = list(authors)
+        feeds = {f.author_id: f for f in GitHubFeed.objects.filter(author__in=authors)}
+
+        jobs = []
+        for author in authors:
+            username = github_username(author.github_link)
+            if not username:
+                report.errors.append((author, f"Invalid github_link: {author.github_link}"))
+                continue
+            feed = feeds.get(author.pk) or GitHubFeed(author=author, username=username)
+            if feed.username != username:
+                feed.username, feed.etag = username, ""
+            elif not force and feed.pk and feed.next_poll_at > now:
+                report.not_due += 1
+                continue
+            jobs.append((author, feed))
+
+        if jobs:
+            workers = max(1, min(self.max_workers, len(jobs)))
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(self._fetch, [(f.username, f.etag) for _, f in jobs]))
+        else:
+            results = []
+
+        candidates = {}
+        touched = []
+        for (author, feed), result in zip(jobs, results):
+            if result["status"] == "rate_limited":
+                report.rate_limited += 1
+                continue
+            report.polled += 1
+            feed.last_status = result["status"]
+            feed.poll_interval = result.get("interval") or DEFAULT_POLL_INTERVAL
+            feed.next_poll_at = now + timedelta(seconds=feed.poll_interval)
+            if "reset" in result:
+                reset_at = datetime.fromtimestamp(result["reset"], tz=dt_timezone.utc)
+                feed.next_poll_at = max(feed.next_poll_at, reset_at)
+            touched.append(feed)
+
+            if result["status"] == 304:
+                report.not_modified += 1
+            elif result["status"] == 200:
+                feed.etag = result["etag"][:200]
+                for ev in result["events"]:
+                    event_id = ev.get("id")
+                    if event_id:
+                        candidates[entry_id_for(author, event_id)] = (author, ev)
+            else:
+                report.errors.append((author, result.get("error", "")))
+
+        with transaction.atomic():
+            self._lock_authors({author.pk for author, _ in candidates.values()})
+            ids = list(candidates)
+            existing = set()
+            for i in range(0, len(ids), LOOKUP_CHUNK):
+                existing.update(
+                    Entry.objects.filter(id__in=ids[i:i + LOOKUP_CHUNK]).values_list("id", flat=True)
+                )
+            new_entries = [
+                Entry(id=entry_id, author=author, **event_fields(ev))
+                for entry_id, (author, ev) in candidates.items()
+                if entry_id not in existing
+            ]
+            Entry.objects.bulk_create(new_entries)
+            GitHubFeed.objects.bulk_create([f for f in touched if f.pk is None])
+            GitHubFeed.objects.bulk_update(
+                [f for f in touched if f.pk is not None],
+                ["username", "etag", "poll_interval", "next_poll_at", "last_status"],
+            )
+            # bulk_create skips the Entry signals, so index the new rows here.
+            for entry in new_entries:
+                fulltext.index_entry(entry)
+            if new_entries:
+                page_cache.purge_on_commit()
+            if self.broadcast and new_entries:
+                self._broadcast_on_commit(new_entries)
+
+        report.created = new_entries
+        return report
+
+    @staticmethod
+    def _lock_authors(pks):
+        """Hold the authors' rows until commit so concurrent runs import them one at a time."""
+        # A fixed order keeps two runs with overlapping authors from deadlocking.
+        pks = sorted(pks)
+        for i in range(0, len(pks), LOOKUP_CHUNK):
+            list(Author.objects.select_for_update().filter(pk__in=pks[i:i + LOOKUP_CHUNK])
+                 .order_by("pk").values_list("pk", flat=True))
+
+    def _broadcast_on_commit(self, entries):
+        from socialdistribution.serializers.entrydetailserializer import EntryDetailSerializer
+        from socialdistribution.utils import broadcast_entries_to_remotes
+
+        data = EntryDetailSerializer(entries, many=True).data
+
+        def start():
+            thread = threading.Thread(target=broadcast_entries_to_remotes, args=(list(data),), daemon=True)
+            self._broadcasts.append(thread)
+            thread.start()
+
+        transaction.on_commit(start)
+
+    def wait(self, timeout=None):
+        """
+        Wait until this importer's broadcasts are queued and every outbound
+        delivery has been sent; return ``False`` on timeout.
+
+        The broadcast and delivery threads are daemons, so a process that
+        exits after ``run()``, such as the management command, calls this first.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        for thread in self._broadcasts:
+            thread.join(None if deadline is None else max(0, deadline - time.monotonic()))
+            if thread.is_alive():
+                return False
+        return outbound.drain(None if deadline is None else max(0, deadline - time.monotonic()))
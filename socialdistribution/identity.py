@@ -0,0 +1,186 @@
+"""
+Identity map for remote authors.
+
+Inbox deliveries and node syncs name the same remote authors over and over:
+a sync page lists each author once, then again on every entry, comment and
+like it imports.  An ``AuthorIdentityMap`` resolves each author once per
+request or batch and hands back the same instance for every later mention.
+A profile change is only recorded when the incoming data differs from what
+is stored, and all recorded changes are written by ``flush()`` with a single
+``bulk_update``::
+
+    with AuthorIdentityMap() as authors:
+        authors.prefetch(page, default_host=base)
+        for item in page:
+            author = authors.resolve(item, default_host=base)
+
+New authors are still inserted straight away, since the objects that
+mention them need the row for their foreign keys.
+"""
+import uuid
+from urllib.parse import urlparse
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from socialdistribution.models import Author
+from socialdistribution.models.author import profiles_changed
+
+# Keys per IN (...) list; stays under SQLite's variable limit.
+LOOKUP_CHUNK = 400
+# Remote fields copied onto a known author when they are present and differ.
+REMOTE_FIELDS = (
+    ("display_name", ("displayName",)),
+    ("profile_image", ("profileImage", "profile_image")),
+    ("github_link", ("github",)),
+)
+
+
+def remote_identity(data, default_host=None):
+    """Return ``(fqid, uuid, host)`` for a remote author object, or ``None`` without an id."""
+    author_url = data.get("id") if isinstance(data, dict) else None
+    if not author_url:
+        return None
+
+    author_fqid = str(author_url).rstrip("/")
+    author_uuid = author_fqid.split("/")[-1]
+    if default_host:
+        base = default_host.rstrip("/")
+    else:
+        parsed = urlparse(str(author_url))
+        base = f"{parsed.scheme}://{parsed.netloc}"
+    host = base.rstrip("/")
+    host = host + "/" if host.endswith("/api") else host + "/api/"
+    return author_fqid, author_uuid, host
+
+
+def _is_uuid(value):
+    try:
+        uuid.UUID(str(value))
+    except ValueError:
+        return False
+    return True
+
+
+def _remote_value(data, keys):
+    for key in keys:
+        if data.get(key):
+            return data[key]
+    return None
+
+
+class AuthorIdentityMap:
+    """Per-request or per-batch cache of resolved authors with deferred profile writes."""
+
+    def __init__(self):
+        self._authors = {}   # fqid or uuid string -> Author
+        self._missing = set()  # fqids known not to exist yet
+        self._dirty = {}     # pk -> (Author, changed field names)
+        self.lookups = 0     # database lookups made, for tests and logging
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        # Profile changes are independent of whatever failed, so keep them.
+        self.flush()
+        return False
+
+    def _remember(self, author):
+        self._authors[author.pk] = author
+        self._authors[str(author.uuid)] = author
+
+    def _cached(self, fqid, author_uuid):
+        return self._authors.get(author_uuid) or self._authors.get(fqid)
+
+    def prefetch(self, items, default_host=None):
+        """Load the authors named by ``items`` with one query per chunk."""
+        identities = [remote_identity(item, default_host) for item in items]
+        wanted = [i for i in identities if i and not self._cached(i[0], i[1])]
+        for start in range(0, len(wanted), LOOKUP_CHUNK):
+            chunk = wanted[start:start + LOOKUP_CHUNK]
+            uuids = [u for _, u, _ in chunk if _is_uuid(u)]
+            self.lookups += 1
+            for author in Author.objects.filter(Q(uuid__in=uuids) | Q(id__in=[f for f, _, _ in chunk])):
+                self._remember(author)
+        for fqid, author_uuid, _ in wanted:
+            if not self._cached(fqid, author_uuid):
+                self._missing.add(fqid)
+
+    def _lookup(self, fqid, author_uuid):
+        if fqid in self._missing:
+            return None
+        self.lookups += 1
+        author = None
+        if _is_uuid(author_uuid):
+            author = Author.objects.filter(uuid=author_uuid).first()
+        if author is None:
+            author = Author.objects.filter(id=fqid).first()
+        if author is not None:
+            self._remember(author)
+        else:
+            self._missing.add(fqid)
+        return author
+
+    def resolve(self, data, default_host=None):
+        """Return the Author for a remote author object, creating it if needed."""
+        identity = remote_identity(data, default_host)
+        if identity is None:
+            return None
+        fqid, author_uuid, host = identity
+
+        author = self._cached(fqid, author_uuid) or self._lookup(fqid, author_uuid)
+        if author is None:
+            return self._create(fqid, author_uuid, host, data)
+        self._merge(author, host, data)
+        return author
+
+    def _create(self, fqid, author_uuid, host, data):
+        author = Author(
+            id=fqid,
+            uuid=author_uuid,
+            username=author_uuid[:60],
+            display_name=data.get("displayName", author_uuid),
+            host=host,
+            profile_image=data.get("profileImage", data.get("profile_image", "")),
+            github_link=data.get("github", ""),
+        )
+        author.set_unusable_password()
+        author.is_approved = True
+        author.save()
+        self._missing.discard(fqid)
+        self._remember(author)
+        return author
+
+    def _merge(self, author, host, data):
+        """Apply changed remote fields to ``author`` and mark them for ``flush()``."""
+        changes = {}
+        local_host = settings.BASE_URL.rstrip("/") + "/api/"
+        if author.host != host and author.host.rstrip("/") != local_host.rstrip("/"):
+            changes["host"] = host
+        for field, keys in REMOTE_FIELDS:
+            value = _remote_value(data, keys)
+            if value and getattr(author, field) != value:
+                changes[field] = value
+        if not changes:
+            return
+        for field, value in changes.items():
+            setattr(author, field, value)
+        self._dirty.setdefault(author.pk, (author, set()))[1].update(changes)
+
+    def flush(self):
+        """Write every recorded profile change with one ``bulk_update``; return the author count."""
+        if not self._dirty:
+            return 0
+        dirty, self._dirty = list(self._dirty.values()), {}
+        fields = set().union(*(changed for _, changed in dirty))
+        # bulk_update bypasses Author.save(), so keep what it maintains in step.
+        now = timezone.now()
+        authors = []
+        for author, changed in dirty:
+            author.refresh_derived_fields(Author.PROFILE_FIELDS.intersection(changed), now)
+            authors.append(author)
+        changed = Author.PROFILE_FIELDS.intersection(fields)
+        fields |= Author.derived_fields(fields, changed)
+        Author.objects.bulk_update(authors, sorted(fields), batch_size=LOOKUP_CHUNK)
+        profiles_changed([author.pk for author in authors], changed)
+        return len(authors)
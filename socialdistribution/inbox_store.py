@@ -0,0 +1,89 @@
+"""
+Storage of received inbox items.
+
+Every accepted inbox POST looks up the owner's primary key with
+``owner_id()`` and hands its payload to ``record()``, which writes it with
+one INSERT before the response goes out.
+
+Items are deliberately not buffered and written in batches across
+requests, although that would save about one query per delivery: a
+per-process buffer is invisible to GETs served by the other workers, and
+is lost when a worker is killed or a batch INSERT fails.  A delivery holds
+one object, so each request writes exactly one row.
+
+Items older than ``INBOX_RETENTION_DAYS`` are deleted by ``prune()``, which
+runs after every ``PRUNE_EVERY`` items a process writes and from the
+``prune_inbox`` management command.
+"""
+import logging
+import threading
+from datetime import timedelta
+from django.conf import settings
+from django.utils import timezone
+from socialdistribution import renderers
+
+logger = logging.getLogger(__name__)
+
+# Defaults for the settings of the same name.
+INBOX_RETENTION_DAYS = 30
+# Items written between two automatic prunes.
+PRUNE_EVERY = 5000
+
+_lock = threading.Lock()
+_written = 0
+
+
+def sender_of(payload):
+    """Return the FQID of the author that sent ``payload``, or ``""``."""
+    actor = payload.get("actor" if payload.get("type") == "follow" else "author")
+    if isinstance(actor, dict) and actor.get("id"):
+        return str(actor["id"]).rstrip("/")[:200]
+    return ""
+
+
+def owner_id(author_uuid):
+    """Return the primary key of the local author with ``author_uuid``, or ``None``."""
+    from socialdistribution.models import Author
+
+    # Looked up rather than rebuilt from BASE_URL, which may not match the stored ids.
+    return Author.objects.filter(uuid=author_uuid).values_list("pk", flat=True).first()
+
+
+def record(owner, obj_type, payload):
+    """Store one received item for ``owner`` (an author primary key); return whether it was saved."""
+    from socialdistribution.models import InboxItem
+
+    global _written
+    item = InboxItem(
+        owner_id=owner, type=obj_type, sender=sender_of(payload),
+        received_at=timezone.now(), payload=renderers.dumps(payload).decode(),
+    )
+    logger.debug(
+        "inbox received type=%s owner=%s sender=%s bytes=%d payload=%s",
+        obj_type, owner, item.sender, len(item.payload), item.payload,
+    )
+    # The URL may name an author that does not exist.
+    if owner is None:
+        logger.debug("inbox dropped items=1 reason=unknown_owner")
+        return False
+    InboxItem.objects.bulk_create([item])
+    with _lock:
+        _written += 1
+        due = _written % PRUNE_EVERY == 0
+    if due:
+        prune()
+    return True
+
+
+def prune(days=None):
+    """Delete items received more than ``days`` (default ``INBOX_RETENTION_DAYS``) ago; return the count."""
+    from socialdistribution.models import InboxItem
+
+    if days is None:
+        days = getattr(settings, "INBOX_RETENTION_DAYS", INBOX_RETENTION_DAYS)
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = InboxItem.objects.filter(received_at__lt=cutoff).delete()
+    if deleted:
+        logger.info("inbox pruned items=%d older_than_days=%s", deleted, days)
+    return deleted
+
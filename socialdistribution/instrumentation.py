@@ -0,0 +1,296 @@
+"""
+Per-request performance instrumentation.
+
+``PerformanceMiddleware`` profiles every request it wraps:
+
+- SQL: number of queries and time spent, via ``connection.execute_wrapper``.
+  A statement run again with the same parameters is a duplicate; the same
+  statement run ``SIMILAR_QUERY_THRESHOLD`` or more times with different
+  parameters is flagged as a likely N+1 loop.  Queries run while a
+  streaming response's body is produced count too.
+- Outbound HTTP: number of requests and time spent in ``ProfiledSession``
+  (and ``get``/``post``), which the federation and GitHub code send
+  through.  These calls are also recorded in socialdistribution.metrics
+  whether or not a request is being profiled.
+- Serializers: time spent building ``.data`` of the serializers that use
+  ``ProfiledSerializerMixin``.
+- Total latency.
+
+The totals go out in a ``Server-Timing`` header, so they show up in the
+browser's network panel; for a streaming response the header is sent
+before the body, so it only covers the view.  Requests slower than
+``SLOW_REQUEST_MS`` are logged with their slowest and most repeated
+queries.  Latencies are kept per view in a bounded sample so
+/admin/performance/ can show percentiles for this process.
+
+Outbound HTTP and serializer time are only attributed to the request on
+whose thread they happen; background broadcasts are not counted.
+"""
+import contextvars
+import logging
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import ExitStack, contextmanager
+from urllib.parse import urlparse
+import requests
+from django.conf import settings
+from django.db import connections
+from rest_framework import serializers
+from socialdistribution import metrics
+
+logger = logging.getLogger(__name__)
+
+# Requests slower than this are logged; override with settings.SLOW_REQUEST_MS.
+SLOW_REQUEST_MS = 1000
+# The same statement this many times in one request is reported as N+1.
+SIMILAR_QUERY_THRESHOLD = 5
+# Queries listed in a slow-request log line.
+TOP_QUERIES = 5
+# Latest requests kept per view for the percentiles.
+SAMPLES_PER_VIEW = 500
+
+_current = contextvars.ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """Everything measured for one request."""
+
+    def __init__(self):
+        self.queries = []          # (sql, params, seconds)
+        self.http_calls = []       # (method, url, seconds)
+        self.serializer_time = 0.0
+        self._serializer_depth = 0
+        self.total = 0.0
+
+    @property
+    def db_time(self):
+        return sum(q[2] for q in self.queries)
+
+    @property
+    def http_time(self):
+        return sum(c[2] for c in self.http_calls)
+
+    def duplicate_count(self):
+        """Queries repeated with identical SQL and parameters, beyond their first run."""
+        counts = Counter((sql, repr(params)) for sql, params, _ in self.queries)
+        return sum(n - 1 for n in counts.values())
+
+    def similar_queries(self, threshold=SIMILAR_QUERY_THRESHOLD):
+        """``[(sql, count)]`` for statements repeated at least ``threshold`` times."""
+        counts = Counter(sql for sql, _, _ in self.queries)
+        return [(sql, n) for sql, n in counts.most_common() if n >= threshold]
+
+    def record_query(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append((sql, params, time.perf_counter() - start))
+
+    def server_timing(self):
+        return ", ".join([
+            f'db;dur={self.db_time * 1000:.1f};desc="{len(self.queries)} queries, '
+            f'{self.duplicate_count()} duplicate"',
+            f'http;dur={self.http_time * 1000:.1f};desc="{len(self.http_calls)} outbound"',
+            f"serialize;dur={self.serializer_time * 1000:.1f}",
+            f"total;dur={self.total * 1000:.1f}",
+        ])
+
+
+def current_profile():
+    """The profile of the request running on this thread, or ``None``."""
+    return _current.get()
+
+
+class ViewStats:
+    """Recent samples per view, kept in this process."""
+
+    def __init__(self, size=SAMPLES_PER_VIEW):
+        self._lock = threading.Lock()
+        self._samples = defaultdict(lambda: deque(maxlen=size))
+        self._counts = Counter()
+
+    def add(self, view, profile):
+        sample = (profile.total, len(profile.queries), profile.duplicate_count(),
+                  profile.http_time, profile.serializer_time)
+        with self._lock:
+            self._samples[view].append(sample)
+            self._counts[view] += 1
+
+    def clear(self):
+        with self._lock:
+            self._samples.clear()
+            self._counts.clear()
+
+    def summary(self):
+        """One row per view, slowest p95 first; times are in milliseconds."""
+        with self._lock:
+            snapshot = {view: list(samples) for view, samples in self._samples.items()}
+            counts = dict(self._counts)
+        rows = []
+        for view, samples in snapshot.items():
+            latencies = sorted(s[0] * 1000 for s in samples)
+            n = len(samples)
+            rows.append({
+                "view": view,
+                "requests": counts[view],
+                "p50": _percentile(latencies, 50),
+                "p95": _percentile(latencies, 95),
+                "p99": _percentile(latencies, 99),
+                "queries": sum(s[1] for s in samples) / n,
+                "duplicates": sum(s[2] for s in samples) / n,
+                "http_ms": sum(s[3] for s in samples) * 1000 / n,
+                "serialize_ms": sum(s[4] for s in samples) * 1000 / n,
+            })
+        rows.sort(key=lambda r: r["p95"], reverse=True)
+        return rows
+
+
+def _percentile(ordered, pct):
+    if not ordered:
+        return 0.0
+    # Nearest-rank percentile over the sorted sample.
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+view_stats = ViewStats()
+
+
+class ProfiledSession(requests.Session):
+    """``requests.Session`` that counts its requests in the metrics and the current profile."""
+
+    def send(self, request, **kwargs):
+        node = urlparse(request.url).netloc
+        outcome = "failed"
+        start = time.perf_counter()
+        try:
+            response = super().send(request, **kwargs)
+            outcome = "ok" if response.status_code < 400 else "http_error"
+            return response
+        finally:
+            elapsed = time.perf_counter() - start
+            metrics.outbound_requests.inc(node=node, outcome=outcome)
+            metrics.outbound_seconds.observe(elapsed, node=node)
+            profile = _current.get()
+            if profile is not None:
+                profile.http_calls.append((request.method, request.url, elapsed))
+
+
+def get(url, **kwargs):
+    """``requests.get`` through a ``ProfiledSession``."""
+    with ProfiledSession() as session:
+        return session.get(url, **kwargs)
+
+
+def post(url, **kwargs):
+    """``requests.post`` through a ``ProfiledSession``."""
+    with ProfiledSession() as session:
+        return session.post(url, **kwargs)
+
+
+@contextmanager
+def serializing():
+    """Add the time spent in the block to the current profile's serializer time."""
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    # Only the outermost block is timed; nested ones are inside it.
+    profile._serializer_depth += 1
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile._serializer_depth -= 1
+        if not profile._serializer_depth:
+            profile.serializer_time += time.perf_counter() - start
+
+
+class ProfiledSerializerMixin:
+    """
+    Time ``serializer.data`` into the current profile.
+
+    Put it before the DRF base class, and set ``Meta.list_serializer_class``
+    to ``ProfiledListSerializer`` (or a subclass) so ``many=True`` is timed too.
+    """
+
+    @property
+    def data(self):
+        with serializing():
+            return super().data
+
+
+class ProfiledListSerializer(ProfiledSerializerMixin, serializers.ListSerializer):
+    pass
+
+
+def _view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "unresolved"
+    return match.view_name or match.route or match._func_path
+
+
+class PerformanceMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        with self._profiling(profile):
+            response = self.get_response(request)
+
+        response["Server-Timing"] = profile.server_timing()
+        if response.streaming and not response.is_async:
+            response.streaming_content = self._stream(request, profile, response.streaming_content)
+        else:
+            self._finish(request, profile)
+        return response
+
+    @contextmanager
+    def _profiling(self, profile):
+        """Attribute the block's queries, outbound calls and time to ``profile``."""
+        token = _current.set(profile)
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for conn in connections.all():
+                    stack.enter_context(conn.execute_wrapper(profile.record_query))
+                yield
+        finally:
+            profile.total += time.perf_counter() - start
+            _current.reset(token)
+
+    def _stream(self, request, profile, content):
+        """Yield ``content``, profiling the production of each chunk; finish once it ends."""
+        iterator = iter(content)
+        try:
+            while True:
+                with self._profiling(profile):
+                    chunk = next(iterator, None)
+                if chunk is None:
+                    return
+                yield chunk
+        finally:
+            self._finish(request, profile)
+
+    def _finish(self, request, profile):
+        view_stats.add(_view_name(request), profile)
+        self._log_if_slow(request, profile)
+
+    def _log_if_slow(self, request, profile):
+        threshold = getattr(settings, "SLOW_REQUEST_MS", SLOW_REQUEST_MS)
+        if threshold is None or profile.total * 1000 < threshold:
+            return
+        slowest = sorted(profile.queries, key=lambda q: q[2], reverse=True)[:TOP_QUERIES]
+        lines = [f"  {seconds * 1000:.1f}ms {sql}" for sql, _, seconds in slowest]
+        lines += [f"  repeated {n}x: {sql}" for sql, n in profile.similar_queries()[:TOP_QUERIES]]
+        logger.warning(
+            "Slow request %s %s: %.0fms, %d queries (%.0fms), %d outbound (%.0fms)\n%s",
+            request.method, request.path, profile.total * 1000,
+            len(profile.queries), profile.db_time * 1000,
+            len(profile.http_calls), profile.http_time * 1000,
+            "\n".join(lines),
+        )
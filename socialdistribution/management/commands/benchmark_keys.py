@@ -0,0 +1,243 @@
+import os
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+import uuid
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Two layouts of the hottest tables.  "url" mirrors the current schema where
+# the FQID strings are the primary and foreign keys; "int" is the proposed
+# layout with bigint surrogate keys and the FQID kept as a unique column.
+SCHEMAS = {
+    "url": """
+        CREATE TABLE author (id VARCHAR(200) PRIMARY KEY, display_name VARCHAR(60));
+        CREATE TABLE entry (
+            id VARCHAR(300) PRIMARY KEY,
+            author_id VARCHAR(200) REFERENCES author(id),
+            created_at TEXT
+        );
+        CREATE TABLE "like" (
+            id VARCHAR(300) PRIMARY KEY,
+            entry_id VARCHAR(300) REFERENCES entry(id),
+            author_id VARCHAR(200) REFERENCES author(id),
+            created_at TEXT
+        );
+        CREATE TABLE followrequest (
+            id INTEGER PRIMARY KEY,
+            from_author_id VARCHAR(200) REFERENCES author(id),
+            to_author_id VARCHAR(200) REFERENCES author(id),
+            accepted BOOLEAN
+        );
+        CREATE INDEX entry_author_idx ON entry(author_id);
+        CREATE INDEX like_entry_idx ON "like"(entry_id);
+        CREATE INDEX like_author_idx ON "like"(author_id);
+        CREATE INDEX follow_from_idx ON followrequest(from_author_id);
+        CREATE INDEX follow_to_idx ON followrequest(to_author_id);
+    """,
+    "int": """
+        CREATE TABLE author (
+            pk INTEGER PRIMARY KEY,
+            id VARCHAR(200) UNIQUE,
+            display_name VARCHAR(60)
+        );
+        CREATE TABLE entry (
+            pk INTEGER PRIMARY KEY,
+            id VARCHAR(300) UNIQUE,
+            author_id BIGINT REFERENCES author(pk),
+            created_at TEXT
+        );
+        CREATE TABLE "like" (
+            pk INTEGER PRIMARY KEY,
+            id VARCHAR(300) UNIQUE,
+            entry_id BIGINT REFERENCES entry(pk),
+            author_id BIGINT REFERENCES author(pk),
+            created_at TEXT
+        );
+        CREATE TABLE followrequest (
+            id INTEGER PRIMARY KEY,
+            from_author_id BIGINT REFERENCES author(pk),
+            to_author_id BIGINT REFERENCES author(pk),
+            accepted BOOLEAN
+        );
+        CREATE INDEX entry_author_idx ON entry(author_id);
+        CREATE INDEX like_entry_idx ON "like"(entry_id);
+        CREATE INDEX like_author_idx ON "like"(author_id);
+        CREATE INDEX follow_from_idx ON followrequest(from_author_id);
+        CREATE INDEX follow_to_idx ON followrequest(to_author_id);
+    """,
+}
+
+# The joins the views run most: likes per entry for one author's page, the
+# friend self-join, and resolving like authors for an entry.
+QUERIES = {
+    "entry likes by author": """
+        SELECT e.id, COUNT(l.id) FROM entry e
+        LEFT JOIN "like" l ON l.entry_id = e.{key}
+        WHERE e.author_id = ? GROUP BY e.id
+    """,
+    "friends self-join": """
+        SELECT a.id FROM followrequest f1
+        JOIN followrequest f2
+          ON f2.from_author_id = f1.to_author_id AND f2.to_author_id = f1.from_author_id
+        JOIN author a ON a.{key} = f1.to_author_id
+        WHERE f1.from_author_id = ? AND f1.accepted AND f2.accepted
+    """,
+    "like authors for entries": """
+        SELECT l.id, a.display_name FROM "like" l
+        JOIN author a ON a.{key} = l.author_id
+        JOIN entry e ON e.{key} = l.entry_id
+        WHERE e.author_id = ?
+    """,
+}
+
+
+class Command(BaseCommand):
+    help = """
+    Compare URL-string keys against bigint surrogate keys on a seeded copy
+    of the author/entry/like/follow tables.
+
+    Both layouts are built in scratch SQLite files with identical data and
+    indexes; the command reports per-index size and the median time of the
+    hottest joins.  The live database is never touched.
+
+    The "int" layout is where docs/SURROGATE_KEYS.md ends up: bigint
+    surrogate primary and foreign keys, with the FQID ``id`` kept as a
+    unique indexed column so the public API is unchanged.  That document
+    is the staged migration plan; run this at production row counts
+    before its key swap.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=2000)
+        parser.add_argument("--entries-per-author", type=int, default=10)
+        parser.add_argument("--likes-per-entry", type=int, default=5)
+        parser.add_argument("--follows-per-author", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=200,
+                            help="Number of timed runs per query.")
+        parser.add_argument("--seed", type=int, default=404)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        data = self._dataset(rng, options)
+        self.stdout.write(
+            f"Seeded {len(data['authors'])} authors, {len(data['entries'])} entries, "
+            f"{len(data['likes'])} likes, {len(data['follows'])} follow edges."
+        )
+
+        results = {}
+        with tempfile.TemporaryDirectory() as tmp:
+            for layout in SCHEMAS:
+                path = os.path.join(tmp, f"{layout}.sqlite3")
+                conn = sqlite3.connect(path)
+                try:
+                    author_key = self._load(conn, layout, data)
+                    results[layout] = {
+                        "sizes": self._index_sizes(conn),
+                        "file": os.path.getsize(path),
+                        "timings": self._time_queries(
+                            conn, layout, data, author_key, rng, options["repeat"]
+                        ),
+                    }
+                finally:
+                    conn.close()
+
+        self._report(results)
+
+    def _dataset(self, rng, options):
+        base = settings.BASE_URL.rstrip("/")
+        authors = [f"{base}/api/authors/{uuid.UUID(int=rng.getrandbits(128))}"
+                   for _ in range(options["authors"])]
+        entries = []
+        for author in authors:
+            for _ in range(options["entries_per_author"]):
+                entry_id = f"{author}/entries/{uuid.UUID(int=rng.getrandbits(128))}"
+                entries.append((entry_id, author))
+        likes = []
+        for entry_id, _ in entries:
+            for liker in rng.sample(authors, min(options["likes_per_entry"], len(authors))):
+                likes.append((f"{liker}/liked/{uuid.UUID(int=rng.getrandbits(128))}", entry_id, liker))
+        follows = set()
+        for author in authors:
+            for other in rng.sample(authors, min(options["follows_per_author"], len(authors))):
+                if other != author:
+                    follows.add((author, other))
+        return {"authors": authors, "entries": entries, "likes": likes, "follows": sorted(follows)}
+
+    def _load(self, conn, layout, data):
+        conn.executescript(SCHEMAS[layout])
+        if layout == "url":
+            author_key = {a: a for a in data["authors"]}
+            entry_key = {e: e for e, _ in data["entries"]}
+        else:
+            author_key = {a: i for i, a in enumerate(data["authors"], start=1)}
+            entry_key = {e: i for i, (e, _) in enumerate(data["entries"], start=1)}
+
+        with conn:
+            if layout == "url":
+                conn.executemany("INSERT INTO author VALUES (?, ?)",
+                                 ((a, a[-8:]) for a in data["authors"]))
+                conn.executemany("INSERT INTO entry VALUES (?, ?, '2025-07-28')",
+                                 ((e, a) for e, a in data["entries"]))
+                conn.executemany('INSERT INTO "like" VALUES (?, ?, ?, \'2025-07-28\')', data["likes"])
+            else:
+                conn.executemany("INSERT INTO author VALUES (?, ?, ?)",
+                                 ((author_key[a], a, a[-8:]) for a in data["authors"]))
+                conn.executemany("INSERT INTO entry VALUES (?, ?, ?, '2025-07-28')",
+                                 ((entry_key[e], e, author_key[a]) for e, a in data["entries"]))
+                conn.executemany(
+                    'INSERT INTO "like" VALUES (?, ?, ?, ?, \'2025-07-28\')',
+                    ((i, l, entry_key[e], author_key[a])
+                     for i, (l, e, a) in enumerate(data["likes"], start=1)),
+                )
+            conn.executemany(
+                "INSERT INTO followrequest (from_author_id, to_author_id, accepted) VALUES (?, ?, 1)",
+                ((author_key[f], author_key[t]) for f, t in data["follows"]),
+            )
+        conn.execute("ANALYZE")
+        return author_key
+
+    def _index_sizes(self, conn):
+        try:
+            rows = conn.execute(
+                "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name ORDER BY name"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            # SQLite built without the dbstat virtual table.
+            return {}
+        return {name: size for name, size in rows if name != "sqlite_schema"}
+
+    def _time_queries(self, conn, layout, data, author_key, rng, repeat):
+        key = "id" if layout == "url" else "pk"
+        sample = rng.sample(data["authors"], min(repeat, len(data["authors"])))
+        probes = [author_key[a] for a in sample]
+        timings = {}
+        for name, sql in QUERIES.items():
+            sql = sql.format(key=key)
+            samples = []
+            for i in range(repeat):
+                start = time.perf_counter()
+                conn.execute(sql, (probes[i % len(probes)],)).fetchall()
+                samples.append(time.perf_counter() - start)
+            timings[name] = statistics.median(samples)
+        return timings
+
+    def _report(self, results):
+        url, num = results["url"], results["int"]
+        self.stdout.write("\nStorage (bytes)")
+        self.stdout.write(f"  {'object':<28}{'url keys':>14}{'int keys':>14}{'saved':>9}")
+        for name in sorted(set(url["sizes"]) | set(num["sizes"])):
+            before, after = url["sizes"].get(name, 0), num["sizes"].get(name, 0)
+            saved = f"{(1 - after / before) * 100:.0f}%" if before else "-"
+            self.stdout.write(f"  {name:<28}{before:>14,}{after:>14,}{saved:>9}")
+        self.stdout.write(f"  {'total file':<28}{url['file']:>14,}{num['file']:>14,}")
+
+        self.stdout.write("\nMedian join time (ms)")
+        self.stdout.write(f"  {'query':<28}{'url keys':>14}{'int keys':>14}{'speedup':>9}")
+        for name in QUERIES:
+            before, after = url["timings"][name] * 1000, num["timings"][name] * 1000
+            speedup = f"{before / after:.2f}x" if after else "-"
+            self.stdout.write(f"  {name:<28}{before:>14.3f}{after:>14.3f}{speedup:>9}")
+        self.stdout.write(self.style.SUCCESS("\nKey benchmark complete."))
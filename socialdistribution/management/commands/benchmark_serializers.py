@@ -0,0 +1,163 @@
+import json
+import random
+import statistics
+import time
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.renderers import JSONRenderer
+from socialdistribution import renderers
+from socialdistribution.scratch_db import scratch_database
+
+
+class Command(BaseCommand):
+    help = """
+    Compare the DRF serializers with the plain ones used by the list
+    endpoints, per object type (author, like, comment, entry).
+
+    Each path is timed from queryset to JSON bytes: the DRF serializer
+    rendered by DRF's JSONRenderer against the plain serializer rendered by
+    FastJSONRenderer.  The report gives objects per second for both, the
+    speed-up of the encoder alone, the queries each path ran, and whether
+    both produced the same JSON.
+
+    Everything runs in a scratch database that is dropped afterwards.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--authors", type=int, default=20)
+        parser.add_argument("--entries", type=int, default=100)
+        parser.add_argument("--comments-per-entry", type=int, default=5)
+        parser.add_argument("--likes-per-entry", type=int, default=5)
+        parser.add_argument("--likes-per-comment", type=int, default=2)
+        parser.add_argument("--repeat", type=int, default=5,
+                            help="Timed runs per path; the median is reported.")
+        parser.add_argument("--seed", type=int, default=404)
+        parser.add_argument(
+            "--in-place", action="store_true",
+            help="Use the configured database instead of a scratch copy; for tests.",
+        )
+
+    def handle(self, *args, **options):
+        if options["in_place"]:
+            self._benchmark(options)
+            return
+        self.stdout.write("Creating scratch database...")
+        with scratch_database("serializer-bench"):
+            self._benchmark(options)
+
+    def _benchmark(self, options):
+        self._seed(random.Random(options["seed"]), options)
+        results = [self._measure(name, drf, plain, options["repeat"])
+                   for name, drf, plain in self._cases()]
+        self._report(results)
+
+    def _seed(self, rng, options):
+        from socialdistribution.models import Author, Comment, Entry, Like
+
+        authors = [
+            Author.objects.create_user(
+                username=f"bench_{i}", password=None, display_name=f"Bench {i}", is_approved=True,
+                github_link=f"https://github.com/bench{i}",
+            )
+            for i in range(max(options["authors"], 1))
+        ]
+        for i in range(options["entries"]):
+            entry = Entry.objects.create(
+                author=rng.choice(authors), title=f"Entry {i}", description="Benchmark entry",
+                content=f"# Entry {i}\n\nSome *markdown* with a [link](https://example.com/{i}).",
+                contentType="text/markdown", visibility="PUBLIC",
+            )
+            for author in rng.sample(authors, min(options["likes_per_entry"], len(authors))):
+                Like.objects.create(entry=entry, author=author)
+            for _ in range(options["comments_per_entry"]):
+                comment = Comment.objects.create(entry=entry, author=rng.choice(authors), comment="Nice one")
+                for author in rng.sample(authors, min(options["likes_per_comment"], len(authors))):
+                    Like.objects.create(comment=comment, author=author)
+        self.stdout.write(
+            f"Seeded {Author.objects.count()} authors, {Entry.objects.count()} entries, "
+            f"{Comment.objects.count()} comments, {Like.objects.count()} likes."
+        )
+
+    def _cases(self):
+        from socialdistribution.models import Author, Comment, Entry, Like
+        from socialdistribution.serializers import (
+            AuthorSerializer, CommentSerializer, EntryDetailSerializer, LikeSerializer,
+            PlainAuthorSerializer, PlainCommentSerializer, PlainEntrySerializer, PlainLikeSerializer,
+        )
+
+        # Each case: (type, DRF path, plain path), both from a queryset to a list.
+        for name, queryset, drf, plain in (
+            ("author", Author.objects.order_by("id"), AuthorSerializer, PlainAuthorSerializer),
+            ("like", Like.objects.order_by("-created_at", "-pk"), LikeSerializer, PlainLikeSerializer),
+            ("comment", Comment.objects.order_by("-created_at", "-pk"), CommentSerializer, PlainCommentSerializer),
+            ("entry", Entry.objects.order_by("-created_at", "-pk"), EntryDetailSerializer, PlainEntrySerializer),
+        ):
+            yield (
+                name,
+                lambda qs=queryset, s=drf: s(list(qs), many=True).data,
+                lambda qs=queryset, s=plain: s(s.rows(qs)).data,
+            )
+
+    def _measure(self, name, drf, plain, repeat):
+        drf_renderer = JSONRenderer()
+        result = {"type": name}
+        for label, build, render in (("drf", drf, drf_renderer.render), ("plain", plain, renderers.dumps)):
+            data, queries = self._count_queries(build)
+            body = render(data)
+            result[label] = {
+                "objects": len(data),
+                "queries": queries,
+                "body": body,
+                "seconds": statistics.median(self._time(lambda: render(build())) for _ in range(repeat)),
+            }
+            if label == "plain":
+                result["encode"] = (
+                    statistics.median(self._time(lambda: drf_renderer.render(data)) for _ in range(repeat)),
+                    statistics.median(self._time(lambda: renderers.dumps(data)) for _ in range(repeat)),
+                )
+        result["same"] = json.loads(result["drf"]["body"]) == json.loads(result["plain"]["body"])
+        return result
+
+    @staticmethod
+    def _count_queries(fn):
+        # A wrapper rather than the query log, which only keeps the last 9000.
+        count = 0
+
+        def counter(execute, sql, params, many, context):
+            nonlocal count
+            count += 1
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(counter):
+            result = fn()
+        return result, count
+
+    @staticmethod
+    def _time(fn):
+        start = time.perf_counter()
+        fn()
+        return time.perf_counter() - start
+
+    def _report(self, results):
+        encoder = f"orjson {renderers.orjson.__version__}" if renderers.orjson else "DRF JSONRenderer (orjson not installed)"
+        self.stdout.write(f"\nJSON encoder: {encoder}")
+        self.stdout.write("\nSerialization throughput (objects/s, median run)")
+        self.stdout.write(
+            f"  {'type':<9}{'objects':>8}{'drf':>11}{'plain':>11}{'speed-up':>10}"
+            f"{'encode':>9}{'drf q':>7}{'plain q':>9}{'same':>6}"
+        )
+        for r in results:
+            drf, plain = r["drf"], r["plain"]
+            drf_rate = drf["objects"] / drf["seconds"] if drf["seconds"] else 0
+            plain_rate = plain["objects"] / plain["seconds"] if plain["seconds"] else 0
+            speedup = plain_rate / drf_rate if drf_rate else 0
+            drf_encode, fast_encode = r["encode"]
+            encode = drf_encode / fast_encode if fast_encode else 0
+            self.stdout.write(
+                f"  {r['type']:<9}{plain['objects']:>8}{drf_rate:>11.0f}{plain_rate:>11.0f}"
+                f"{speedup:>9.1f}x{encode:>8.1f}x{drf['queries']:>7}{plain['queries']:>9}"
+                f"{'yes' if r['same'] else 'NO':>6}"
+            )
+        if not all(r["same"] for r in results):
+            self.stdout.write(self.style.WARNING("\nPlain and DRF output differ for some types."))
+        self.stdout.write(self.style.SUCCESS("\nSerializer benchmark complete."))
@@ -0,0 +1,24 @@
+from django.core.management.base import BaseCommand
+from socialdistribution import inbox_store
+
+
+class Command(BaseCommand):
+    help = """
+    Delete stored inbox items older than the retention period
+    (settings.INBOX_RETENTION_DAYS, or --days).
+
+    Each server process also prunes after every 5000 items it stores;
+    run this from cron to keep the table small on quiet nodes.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--days",
+            type=int,
+            default=None,
+            help="Keep items received within this many days (default: INBOX_RETENTION_DAYS).",
+        )
+
+    def handle(self, *args, **options):
+        deleted = inbox_store.prune(options["days"])
+        self.stdout.write(self.style.SUCCESS(f"Pruned {deleted} inbox items."))
@@ -0,0 +1,103 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from socialdistribution.models import Entry, Comment, Like
+
+
+def _count(model, **filters):
+    """Return a correlated COUNT(*) subquery over ``model`` for ``filters``."""
+    qs = (
+        model.objects.filter(**filters)
+        .order_by()
+        .values(*filters)
+        .annotate(c=Count("pk"))
+        .values("c")
+    )
+    return Coalesce(Subquery(qs, output_field=IntegerField()), 0)
+
+
+class Command(BaseCommand):
+    help = """
+    Recompute the denormalized like/comment counters on Entry and Comment
+    and repair any rows that have drifted from the real counts.
+
+    Rows are walked in primary key order, --batch-size rows at a time, and
+    each batch is fixed in its own transaction.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=500,
+            help="Number of rows to check per batch (default: 500).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted rows without updating them.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = max(1, options["batch_size"])
+        dry_run = options["dry_run"]
+
+        entries_fixed = self._reconcile(
+            Entry,
+            {
+                "like_count": _count(Like, entry=OuterRef("pk")),
+                "comment_count": _count(Comment, entry=OuterRef("pk")),
+            },
+            batch_size,
+            dry_run,
+        )
+        comments_fixed = self._reconcile(
+            Comment,
+            {"like_count": _count(Like, comment=OuterRef("pk"))},
+            batch_size,
+            dry_run,
+        )
+
+        verb = "Found" if dry_run else "Repaired"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {entries_fixed} entr{'y' if entries_fixed == 1 else 'ies'} "
+            f"and {comments_fixed} comment{'' if comments_fixed == 1 else 's'} "
+            f"with drifted counters."
+        ))
+
+    def _reconcile(self, model, counters, batch_size, dry_run):
+        """Fix ``counters`` on ``model`` in keyset-paginated batches."""
+        fields = list(counters)
+        annotations = {f"actual_{name}": expr for name, expr in counters.items()}
+        fixed = 0
+        last_pk = None
+
+        while True:
+            qs = model.objects.order_by("pk")
+            if last_pk is not None:
+                qs = qs.filter(pk__gt=last_pk)
+            rows = list(
+                qs.annotate(**annotations).only("pk", *fields)[:batch_size]
+            )
+            if not rows:
+                break
+            last_pk = rows[-1].pk
+
+            drifted = []
+            for row in rows:
+                changed = False
+                for name in fields:
+                    actual = getattr(row, f"actual_{name}")
+                    if getattr(row, name) != actual:
+                        setattr(row, name, actual)
+                        changed = True
+                if changed:
+                    drifted.append(row)
+
+            if drifted and not dry_run:
+                with transaction.atomic():
+                    model.objects.bulk_update(drifted, fields)
+            fixed += len(drifted)
+
+        return fixed
@@ -0,0 +1,551 @@
+import json
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from base64 import b64encode
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone as dt_timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from socialdistribution.scratch_db import scratch_database
+
+PHASES = ("sync", "send_all", "broadcast", "inbox")
+# Seconds between samples of the process thread count.
+THREAD_SAMPLE_INTERVAL = 0.005
+
+ROUTES = [
+    ("authors", re.compile(r"^/api/authors/?$")),
+    ("entries", re.compile(r"^/api/authors/(?P<author>[^/]+)/entries/?$")),
+    ("comments", re.compile(r"^/api/authors/(?P<author>[^/]+)/entries/(?P<entry>[^/]+)/comments/?$")),
+    ("likes", re.compile(r"^/api/authors/(?P<author>[^/]+)/entries/(?P<entry>[^/]+)/likes/?$")),
+    ("comment_likes", re.compile(
+        r"^/api/authors/(?P<author>[^/]+)/entries/(?P<entry>[^/]+)/comments/(?P<comment>[^/]+)/likes/?$"
+    )),
+]
+INBOX_ROUTE = re.compile(r"^/api/authors/(?P<author>[^/]+)/inbox/?$")
+
+
+def _pct(ordered, pct):
+    """Nearest-rank percentile of a sorted list, or 0."""
+    if not ordered:
+        return 0.0
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class StubNode:
+    """
+    A fake peer on 127.0.0.1 serving a fixed set of authors, entries,
+    comments and likes, and recording every object POSTed to its inboxes.
+
+    Every request waits ``latency`` seconds (+/- 50%) and fails with a 503
+    at ``failure_rate``.  Keep-alive is on, so a client that reuses its
+    connections shows up as fewer ``connections`` than ``requests``.
+    """
+
+    def __init__(self, index, authors, entries_per_author, latency, failure_rate, seed):
+        self.index = index
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.failures = 0
+        self.connections = 0
+        self.open_connections = 0
+        self.peak_connections = 0
+        self.deliveries = []  # (received_at, object id, status)
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                stub._handle(self, "GET")
+
+            def do_POST(self):
+                stub._handle(self, "POST")
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+
+            def process_request(self, request, client_address):
+                with stub._lock:
+                    stub.connections += 1
+                    stub.open_connections += 1
+                    stub.peak_connections = max(stub.peak_connections, stub.open_connections)
+                super().process_request(request, client_address)
+
+            def shutdown_request(self, request):
+                with stub._lock:
+                    stub.open_connections -= 1
+                super().shutdown_request(request)
+
+        self._server = Server(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self._server.server_address[1]}/"
+        self._build(authors, entries_per_author)
+
+    def _build(self, authors, entries_per_author):
+        base = self.base_url.rstrip("/")
+        published = datetime(2025, 1, 1, tzinfo=dt_timezone.utc).isoformat()
+        self.authors = [
+            {
+                "type": "author",
+                "id": f"{base}/api/authors/{uuid.UUID(int=self._rng.getrandbits(128))}",
+                "host": f"{base}/api/",
+                "displayName": f"Stub {self.index}.{i}",
+                "github": "",
+                "profileImage": "",
+            }
+            for i in range(authors)
+        ]
+        self.entries, self.comments, self.likes, self.comment_likes = {}, {}, {}, {}
+        for author in self.authors:
+            author_uuid = author["id"].rsplit("/", 1)[-1]
+            entries = self.entries[author_uuid] = []
+            for i in range(entries_per_author):
+                entry_uuid = str(uuid.UUID(int=self._rng.getrandbits(128)))
+                entry_id = f"{author['id']}/entries/{entry_uuid}"
+                entries.append({
+                    "type": "entry", "id": entry_id, "author": author,
+                    "title": f"Stub entry {i}", "description": "", "content": "Hello from a stub node",
+                    "contentType": "text/plain", "visibility": "PUBLIC", "published": published,
+                })
+                other = self.authors[(self.authors.index(author) + 1) % len(self.authors)]
+                comment_uuid = str(uuid.UUID(int=self._rng.getrandbits(128)))
+                comment_id = f"{other['id']}/commented/{comment_uuid}"
+                self.comments[entry_uuid] = [{
+                    "type": "comment", "id": comment_id, "author": other, "entry": entry_id,
+                    "comment": "Nice", "contentType": "text/plain", "published": published,
+                }]
+                self.likes[entry_uuid] = [{
+                    "type": "like", "id": f"{other['id']}/liked/{uuid.UUID(int=self._rng.getrandbits(128))}",
+                    "author": other, "object": entry_id, "published": published,
+                }]
+                self.comment_likes[comment_uuid] = [{
+                    "type": "like", "id": f"{author['id']}/liked/{uuid.UUID(int=self._rng.getrandbits(128))}",
+                    "author": author, "object": comment_id, "published": published,
+                }]
+
+    def _body(self, route, match):
+        if route == "authors":
+            return {"type": "authors", "authors": self.authors}
+        if route == "entries":
+            return {"type": "entries", "src": self.entries.get(match["author"], [])}
+        if route == "comments":
+            return {"type": "comments", "src": self.comments.get(match["entry"], [])}
+        if route == "likes":
+            return {"type": "likes", "src": self.likes.get(match["entry"], [])}
+        return {"type": "likes", "src": self.comment_likes.get(match["comment"], [])}
+
+    def _handle(self, handler, method):
+        length = int(handler.headers.get("Content-Length") or 0)
+        raw = handler.rfile.read(length) if length else b""
+        path = urlparse(handler.path).path
+        with self._lock:
+            self.requests += 1
+            failed = self._rng.random() < self.failure_rate
+            delay = self.latency * self._rng.uniform(0.5, 1.5)
+        if delay:
+            time.sleep(delay)
+
+        status, body = 404, {"detail": "Not found."}
+        if failed:
+            status, body = 503, {"detail": "Simulated failure."}
+        elif method == "POST" and INBOX_ROUTE.match(path):
+            status, body = 201, {}
+        elif method == "GET":
+            for route, pattern in ROUTES:
+                match = pattern.match(path)
+                if match:
+                    status, body = 200, self._body(route, match)
+                    break
+
+        if method == "POST" and INBOX_ROUTE.match(path):
+            try:
+                object_id = json.loads(raw or b"{}").get("id")
+            except ValueError:
+                object_id = None
+            with self._lock:
+                self.deliveries.append((time.perf_counter(), object_id, status))
+        with self._lock:
+            self.failures += status >= 500
+
+        payload = json.dumps(body).encode()
+        handler.send_response(status)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(payload)))
+        handler.end_headers()
+        handler.wfile.write(payload)
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def counters(self):
+        with self._lock:
+            return {"requests": self.requests, "failures": self.failures,
+                    "connections": self.connections, "deliveries": len(self.deliveries)}
+
+
+class ThreadSampler:
+    """Peak ``threading.active_count()`` while the block runs."""
+
+    def __enter__(self):
+        self.peak = threading.active_count()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        while not self._stop.wait(THREAD_SAMPLE_INTERVAL):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        return False
+
+
+class Command(BaseCommand):
+    help = """
+    Load-test federation against in-process stub peers.
+
+    Starts --nodes stub nodes on 127.0.0.1, each serving --authors authors
+    with their entries, comments and likes, and registers them as remote
+    nodes.  The command then drives, in order:
+
+    - sync:      sync_remote_entries/comments/likes for every node
+    - send_all:  send_all_to_new_remote for every node
+    - broadcast: broadcast_entry/comment/like_to_remotes for local objects
+    - inbox:     a flood of inbound likes, comments and entries at the local
+                 inbox, sent as the nodes' service accounts
+
+    For each phase it reports throughput, the peak thread count, requests
+    and TCP connections seen by the stubs, and delivery latency from the
+    call that sent an object to its arrival at a stub inbox.
+
+    Everything runs in a scratch database that is dropped afterwards, so
+    the configured database and real remote nodes are never touched.
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--nodes", type=int, default=3)
+        parser.add_argument("--authors", type=int, default=10,
+                            help="Authors served by each stub node.")
+        parser.add_argument("--entries-per-author", type=int, default=3)
+        parser.add_argument("--local-authors", type=int, default=5)
+        parser.add_argument("--broadcasts", type=int, default=10,
+                            help="Objects sent by each broadcast function.")
+        parser.add_argument("--flood", type=int, default=200,
+                            help="Inbound inbox POSTs.")
+        parser.add_argument("--concurrency", type=int, default=8,
+                            help="Parallel senders in the inbox flood.")
+        parser.add_argument("--latency-ms", type=float, default=20.0,
+                            help="Mean stub response time.")
+        parser.add_argument("--failure-rate", type=float, default=0.0,
+                            help="Share of stub requests answered with a 503.")
+        parser.add_argument("--phases", default=",".join(PHASES),
+                            help=f"Comma-separated subset of {', '.join(PHASES)}.")
+        parser.add_argument("--timeout", type=float, default=60.0,
+                            help="Seconds to wait for background deliveries to finish.")
+        parser.add_argument("--seed", type=int, default=404)
+        parser.add_argument(
+            "--in-place", action="store_true",
+            help="Use the configured database instead of a scratch copy; for tests.",
+        )
+
+    def handle(self, *args, **options):
+        phases = [p.strip() for p in options["phases"].split(",") if p.strip()]
+        unknown = set(phases) - set(PHASES)
+        if unknown:
+            raise CommandError(f"Unknown phase(s): {', '.join(sorted(unknown))}")
+        if not 0 <= options["failure_rate"] <= 1:
+            raise CommandError("--failure-rate must be between 0 and 1.")
+
+        if options["in_place"]:
+            self._simulate(phases, options)
+            return
+
+        self.stdout.write("Creating scratch database...")
+        with scratch_database("federation-sim"):
+            self._simulate(phases, options)
+
+    def _simulate(self, phases, options):
+        rng = random.Random(options["seed"])
+        stubs = [
+            StubNode(i, options["authors"], options["entries_per_author"],
+                     options["latency_ms"] / 1000, options["failure_rate"], rng.getrandbits(32))
+            for i in range(options["nodes"])
+        ]
+        for stub in stubs:
+            stub.start()
+        # Every flooded inbox POST is slower than SLOW_REQUEST_MS and the
+        # rejected ones log as bad requests; this report covers both.
+        quiet = [logging.getLogger(name) for name in ("socialdistribution.instrumentation", "django.request")]
+        levels = [logger.level for logger in quiet]
+        for logger in quiet:
+            logger.setLevel(logging.ERROR)
+        try:
+            self._seed(stubs, options)
+            self.stdout.write(
+                f"Started {len(stubs)} stub node(s) with {options['authors']} authors each; "
+                f"latency {options['latency_ms']:g}ms, failure rate {options['failure_rate']:.0%}."
+            )
+            results = []
+            for phase in phases:
+                results.append(getattr(self, f"_phase_{phase}")(stubs, options))
+            self._report(results)
+        finally:
+            for logger, level in zip(quiet, levels):
+                logger.setLevel(level)
+            for stub in stubs:
+                stub.stop()
+
+    def _seed(self, stubs, options):
+        from socialdistribution.models import Author, Comment, Entry, Like, RemoteNode
+
+        self.local_authors = []
+        for i in range(options["local_authors"]):
+            self.local_authors.append(Author.objects.create_user(
+                username=f"sim_local_{i}", password=None, display_name=f"Local {i}", is_approved=True,
+            ))
+        self.local_entries = [
+            Entry.objects.create(author=author, title=f"Local entry {i}", content="Hello, peers",
+                                 visibility="PUBLIC")
+            for i in range(options["broadcasts"])
+            for author in [self.local_authors[i % len(self.local_authors)]]
+        ]
+        self.local_comments, self.local_likes = [], []
+        for i, entry in enumerate(self.local_entries):
+            author = self.local_authors[(i + 1) % len(self.local_authors)]
+            self.local_comments.append(Comment.objects.create(entry=entry, author=author, comment="Local reply"))
+            self.local_likes.append(Like.objects.create(entry=entry, author=author))
+
+        # bulk_create skips RemoteNode's post_save, which would schedule the
+        # sync and backfill jobs on their own before any phase is measured.
+        self.credentials = {}
+        nodes = []
+        for stub in stubs:
+            password = uuid.uuid4().hex
+            account = Author.objects.create_user(
+                username=f"sim_node_{stub.index}", password=password,
+                display_name=urlparse(stub.base_url).netloc,
+            )
+            self.credentials[stub.base_url] = (account.username, password)
+            nodes.append(RemoteNode(base_url=stub.base_url, username="sim", password="sim",
+                                    service_account=account, service_account_password=password))
+        RemoteNode.objects.bulk_create(nodes)
+        self.nodes = list(RemoteNode.objects.filter(base_url__in=[s.base_url for s in stubs]))
+        self.local_host = urlparse(settings.BASE_URL).netloc
+
+    def _measure(self, name, stubs, run, timeout):
+        """Run one phase, wait for its background threads, and collect what the stubs saw."""
+        before = [stub.counters() for stub in stubs]
+        baseline = threading.active_count()
+        with ThreadSampler() as threads:
+            start = time.perf_counter()
+            sent_at, ops, extra = run()
+            deadline = time.monotonic() + timeout
+            # Broadcasts return before their per-author threads finish.
+            while threading.active_count() > baseline + 1 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            elapsed = time.perf_counter() - start
+
+        latencies, delivered = [], 0
+        for stub, counts in zip(stubs, before):
+            with stub._lock:
+                new = stub.deliveries[counts["deliveries"]:]
+            for received_at, object_id, status in new:
+                delivered += status < 300
+                sent = sent_at.get(object_id, start) if isinstance(sent_at, dict) else start
+                latencies.append(received_at - sent)
+        latencies.sort()
+        after = [stub.counters() for stub in stubs]
+        totals = {
+            key: sum(a[key] - b[key] for a, b in zip(after, before))
+            for key in ("requests", "failures", "connections", "deliveries")
+        }
+        return {
+            "phase": name, "ops": ops, "seconds": elapsed, "peak_threads": threads.peak,
+            "delivered": delivered, "latencies": latencies,
+            "timed_out": threading.active_count() > baseline + 1, **totals, **extra,
+        }
+
+    def _phase_sync(self, stubs, options):
+        from socialdistribution.models import Comment, Entry, Like
+        from socialdistribution.utils import sync_remote_comments, sync_remote_entries, sync_remote_likes
+
+        def run():
+            counts = (Entry.objects.count(), Comment.objects.count(), Like.objects.count())
+            for node in self.nodes:
+                sync_remote_entries(node)
+                sync_remote_comments(node)
+                sync_remote_likes(node)
+            imported = (Entry.objects.count() - counts[0] + Comment.objects.count() - counts[1]
+                        + Like.objects.count() - counts[2])
+            return {}, imported, {"note": f"{imported} objects imported"}
+
+        return self._measure("sync", stubs, run, options["timeout"])
+
+    def _phase_send_all(self, stubs, options):
+        from socialdistribution import outbound
+        from socialdistribution.utils import send_all_to_new_remote
+
+        def run():
+            for node in self.nodes:
+                try:
+                    send_all_to_new_remote(node)
+                except outbound.DeliveryFailed:
+                    # The stubs count the failed requests.
+                    pass
+            return {}, len(self.nodes), {"note": "inbox POSTs per node"}
+
+        return self._measure("send_all", stubs, run, options["timeout"])
+
+    def _phase_broadcast(self, stubs, options):
+        from socialdistribution.serializers import CommentSerializer, EntryDetailSerializer, LikeSerializer
+        from socialdistribution.utils import (
+            broadcast_comment_to_remotes, broadcast_entry_to_remotes, broadcast_like_to_remotes,
+        )
+
+        payloads = (
+            [(broadcast_entry_to_remotes, EntryDetailSerializer(e).data) for e in self.local_entries]
+            + [(broadcast_comment_to_remotes, CommentSerializer(c).data) for c in self.local_comments]
+            + [(broadcast_like_to_remotes, LikeSerializer(l).data) for l in self.local_likes]
+        )
+
+        def run():
+            sent_at = {}
+            for broadcast, data in payloads:
+                sent_at[data["id"]] = time.perf_counter()
+                broadcast(data)
+            return sent_at, len(payloads), {"note": "objects broadcast"}
+
+        return self._measure("broadcast", stubs, run, options["timeout"])
+
+    def _phase_inbox(self, stubs, options):
+        from socialdistribution.utils import sync_remote_authors
+
+        for node in self.nodes:
+            sync_remote_authors(node)
+        jobs = []
+        entries = self.local_entries or []
+        published = datetime.now(dt_timezone.utc).isoformat()
+        for i in range(options["flood"]):
+            stub = stubs[i % len(stubs)]
+            author = stub.authors[(i // len(stubs)) % len(stub.authors)]
+            target = self.local_authors[i % len(self.local_authors)]
+            kind = ("like", "comment", "entry")[i % 3]
+            if kind != "entry" and not entries:
+                kind = "entry"
+            if kind == "like":
+                # One like per (author, entry); cycle through the entries first.
+                entry = entries[(i // (3 * len(stubs) * len(stub.authors))) % len(entries)]
+                payload = {"type": "like", "id": f"{author['id']}/liked/{uuid.uuid4()}",
+                           "author": author, "object": entry.id, "published": published}
+            elif kind == "comment":
+                entry = entries[i % len(entries)]
+                payload = {"type": "comment", "id": f"{author['id']}/commented/{uuid.uuid4()}",
+                           "author": author, "entry": entry.id, "comment": "Flooded",
+                           "contentType": "text/plain", "published": published}
+            else:
+                payload = {"type": "entry", "id": f"{author['id']}/entries/{uuid.uuid4()}",
+                           "author": author, "title": "Flood", "content": "Flooded",
+                           "contentType": "text/plain", "visibility": "PUBLIC",
+                           "published": published}
+            jobs.append((stub.base_url, target, payload))
+
+        local = threading.local()
+        host = self.local_host
+
+        def send(job):
+            base_url, target, payload = job
+            if not hasattr(local, "client"):
+                local.client = Client(HTTP_HOST=host)
+            username, password = self.credentials[base_url]
+            token = b64encode(f"{username}:{password}".encode()).decode()
+            start = time.perf_counter()
+            response = local.client.post(
+                f"/api/authors/{target.uuid}/inbox/", payload,
+                content_type="application/json", HTTP_AUTHORIZATION=f"Basic {token}",
+            )
+            return response.status_code, time.perf_counter() - start
+
+        def send_in_worker(job):
+            try:
+                return send(job)
+            finally:
+                connection.close()
+
+        def run():
+            workers = max(1, options["concurrency"])
+            if workers == 1:
+                results = [send(job) for job in jobs]
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(send_in_worker, jobs))
+            statuses = {}
+            for code, _ in results:
+                statuses[code] = statuses.get(code, 0) + 1
+            self.inbox_latencies = sorted(seconds for _, seconds in results)
+            summary = ", ".join(f"{n}x{code}" for code, n in sorted(statuses.items()))
+            return {}, len(jobs), {"note": f"responses {summary}; stub deliveries are re-broadcasts"}
+
+        result = self._measure("inbox", stubs, run, options["timeout"])
+        result["response_latencies"] = self.inbox_latencies
+        return result
+
+    def _report(self, results):
+        self.stdout.write("\nThroughput")
+        self.stdout.write(
+            f"  {'phase':<11}{'ops':>7}{'seconds':>9}{'ops/s':>9}{'peak thr':>10}"
+            f"{'stub req':>10}{'conns':>7}{'503s':>6}"
+        )
+        for r in results:
+            rate = r["ops"] / r["seconds"] if r["seconds"] else 0
+            self.stdout.write(
+                f"  {r['phase']:<11}{r['ops']:>7}{r['seconds']:>9.2f}{rate:>9.1f}"
+                f"{r['peak_threads']:>10}{r['requests']:>10}{r['connections']:>7}{r['failures']:>6}"
+            )
+
+        self.stdout.write("\nDelivery to stub inboxes (ms)")
+        self.stdout.write(f"  {'phase':<11}{'posts':>7}{'ok':>7}{'p50':>9}{'p95':>9}{'max':>9}")
+        for r in results:
+            lat = [s * 1000 for s in r["latencies"]]
+            self.stdout.write(
+                f"  {r['phase']:<11}{r['deliveries']:>7}{r['delivered']:>7}"
+                f"{_pct(lat, 50):>9.1f}{_pct(lat, 95):>9.1f}{(lat[-1] if lat else 0):>9.1f}"
+            )
+
+        for r in results:
+            if "response_latencies" in r:
+                lat = [s * 1000 for s in r["response_latencies"]]
+                self.stdout.write(
+                    f"\nInbox response time (ms): p50 {_pct(lat, 50):.1f}, "
+                    f"p95 {_pct(lat, 95):.1f}, max {(lat[-1] if lat else 0):.1f}"
+                )
+
+        self.stdout.write("")
+        for r in results:
+            self.stdout.write(f"  {r['phase']}: {r['note']}")
+            if r["timed_out"]:
+                self.stdout.write(self.style.WARNING(
+                    f"  {r['phase']}: background threads still running at the timeout."
+                ))
+        self.stdout.write(self.style.SUCCESS("\nFederation simulation complete."))
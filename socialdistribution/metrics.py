@@ -0,0 +1,318 @@
+"""
+In-process metrics exported in the Prometheus text format.
+
+Each process keeps its own counters, gauges and histograms in memory and
+writes a snapshot to ``settings.METRICS_DIR`` at most every
+``SNAPSHOT_INTERVAL`` seconds.  Every gunicorn worker has its own file, so
+the /admin/metrics/ endpoint can merge all of them into one node-wide view.
+Nothing outside this process is needed besides a shared directory.
+
+Counters and histograms are summed across the files of running processes.
+Files are named by pid; a worker removes its file when it exits, and a
+scrape deletes the files of processes that are gone (killed workers) or
+that have not been rewritten for ``STALE_AFTER``.  Totals therefore drop
+when a worker goes away, which Prometheus treats as a counter reset.
+Gauges take the largest value; the only gauges here are timestamps.
+
+This module imports no models, so models and utilities can record metrics
+without import cycles.
+"""
+import atexit
+import json
+import os
+import tempfile
+import threading
+import time
+from bisect import bisect_left
+from django.conf import settings
+
+SNAPSHOT_INTERVAL = 5
+# Seconds after which a snapshot file is dropped even if its pid is running,
+# since the pid may have been reused by an unrelated process.
+STALE_AFTER = 24 * 60 * 60
+# Seconds; tuned for HTTP round trips and page renders.
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_lock = threading.Lock()
+_registry = {}
+_last_snapshot = 0.0
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name, help_text, labelnames=()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = self.values.get(key, 0) + amount
+        _maybe_snapshot()
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            self.values[key] = value
+        _maybe_snapshot()
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with _lock:
+            counts, total = self.values.get(key, ([0] * (len(self.buckets) + 1), 0.0))
+            # Per-bucket counts; the last slot is +Inf.  Made cumulative on export.
+            counts[bisect_left(self.buckets, value)] += 1
+            self.values[key] = (counts, total + value)
+        _maybe_snapshot()
+
+
+def _register(metric):
+    _registry[metric.name] = metric
+    return metric
+
+
+def counter(name, help_text, labelnames=()):
+    return _register(Counter(name, help_text, labelnames))
+
+
+def gauge(name, help_text, labelnames=()):
+    return _register(Gauge(name, help_text, labelnames))
+
+
+def histogram(name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+    return _register(Histogram(name, help_text, labelnames, buckets))
+
+
+# --- Metrics recorded by the app -------------------------------------------
+
+inbox_requests = counter(
+    "socialdistribution_inbox_requests_total",
+    "Inbox POSTs by object type and response status.", ("type", "status"),
+)
+outbound_requests = counter(
+    "socialdistribution_outbound_requests_total",
+    "Outbound HTTP requests by remote host and outcome.", ("node", "outcome"),
+)
+outbound_seconds = histogram(
+    "socialdistribution_outbound_request_seconds",
+    "Outbound HTTP request latency by remote host.", ("node",),
+)
+outbound_queue_seconds = histogram(
+    "socialdistribution_outbound_queue_seconds",
+    "Time inbox deliveries waited in the outbound queue, by lane.", ("lane",),
+    buckets=DEFAULT_BUCKETS + (30.0, 60.0, 300.0),
+)
+sync_items = counter(
+    "socialdistribution_sync_items_total",
+    "Objects imported by node syncs.", ("node", "kind"),
+)
+sync_last_run = gauge(
+    "socialdistribution_sync_last_run_timestamp_seconds",
+    "When a node sync last finished.", ("node", "kind"),
+)
+image_bytes = counter(
+    "socialdistribution_image_bytes_served_total",
+    "Decoded image bytes served by the image endpoints.",
+)
+cache_requests = counter(
+    "socialdistribution_cache_requests_total",
+    "Cache lookups by cache and result (hit or miss).", ("cache", "result"),
+)
+rate_limited = counter(
+    "socialdistribution_rate_limited_total",
+    "API requests refused with 429 by client (peer host, local or anonymous) and scope.",
+    ("client", "scope"),
+)
+feed_render_seconds = histogram(
+    "socialdistribution_feed_render_seconds",
+    "Time to build and render the feed page.",
+)
+
+
+def cache_lookup(name, hit):
+    cache_requests.inc(cache=name, result="hit" if hit else "miss")
+
+
+# --- Snapshots and export --------------------------------------------------
+
+def metrics_dir():
+    return getattr(settings, "METRICS_DIR", None) or os.path.join(
+        tempfile.gettempdir(), "socialdistribution-metrics"
+    )
+
+
+def _snapshot():
+    with _lock:
+        return {
+            name: {
+                "kind": metric.kind,
+                "values": [[list(key), value] for key, value in metric.values.items()],
+            }
+            for name, metric in _registry.items()
+        }
+
+
+def write_snapshot():
+    """Write this process's values to its file in ``metrics_dir()``."""
+    global _last_snapshot
+    directory = metrics_dir()
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w") as f:
+        json.dump(_snapshot(), f)
+    # Atomic, so a scrape never reads a half-written file.  The pid is read
+    # here rather than at import, since gunicorn may fork after importing.
+    os.replace(tmp, _snapshot_path(directory, os.getpid()))
+    _last_snapshot = time.monotonic()
+
+
+def _snapshot_path(directory, pid):
+    return os.path.join(directory, f"{pid}.json")
+
+
+def _running(pid):
+    if os.name == "nt":
+        # os.kill() cannot probe a process there; rely on STALE_AFTER.
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+def _is_stale(path, pid):
+    if pid == os.getpid():
+        return False
+    try:
+        age = time.time() - os.path.getmtime(path)
+    except OSError:
+        return True
+    return pid is None or age > STALE_AFTER or not _running(pid)
+
+
+def _maybe_snapshot():
+    if time.monotonic() - _last_snapshot >= SNAPSHOT_INTERVAL:
+        try:
+            write_snapshot()
+        except OSError:
+            pass
+
+
+def _merged():
+    """Combine the snapshot files of every process (including this one, freshly written)."""
+    write_snapshot()
+    merged = {}
+    directory = metrics_dir()
+    for filename in sorted(os.listdir(directory)):
+        if not filename.endswith(".json"):
+            continue
+        path = os.path.join(directory, filename)
+        stem = filename[:-len(".json")]
+        if _is_stale(path, int(stem) if stem.isdigit() else None):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            continue
+        try:
+            with open(path) as f:
+                snapshot = json.load(f)
+        except (OSError, ValueError):
+            continue
+        for name, data in snapshot.items():
+            if name not in _registry:
+                continue
+            values = merged.setdefault(name, {})
+            for key, value in data["values"]:
+                key = tuple(key)
+                if key not in values:
+                    values[key] = value
+                elif data["kind"] == "histogram":
+                    counts, total = values[key]
+                    values[key] = ([a + b for a, b in zip(counts, value[0])], total + value[1])
+                elif data["kind"] == "gauge":
+                    values[key] = max(values[key], value)
+                else:
+                    values[key] += value
+    return merged
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _labels(names, key, extra=()):
+    pairs = [*zip(names, key), *extra]
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}"
+
+
+def render():
+    """Return every metric, merged across processes, in Prometheus text format."""
+    merged = _merged()
+    lines = []
+    for name, metric in _registry.items():
+        lines.append(f"# HELP {name} {metric.help}")
+        lines.append(f"# TYPE {name} {metric.kind}")
+        for key, value in sorted(merged.get(name, {}).items()):
+            if metric.kind == "histogram":
+                counts, total = value
+                cumulative = 0
+                for bound, count in zip([*map(str, metric.buckets), "+Inf"], counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_labels(metric.labelnames, key, [('le', bound)])} {cumulative}")
+                lines.append(f"{name}_sum{_labels(metric.labelnames, key)} {total}")
+                lines.append(f"{name}_count{_labels(metric.labelnames, key)} {cumulative}")
+            else:
+                lines.append(f"{name}{_labels(metric.labelnames, key)} {value}")
+    return "\n".join(lines) + "\n"
+
+
+def reset():
+    """Forget this process's values and every snapshot file; for tests."""
+    global _last_snapshot
+    with _lock:
+        for metric in _registry.values():
+            metric.values.clear()
+    directory = metrics_dir()
+    if os.path.isdir(directory):
+        for filename in os.listdir(directory):
+            if filename.endswith(".json"):
+                os.remove(os.path.join(directory, filename))
+    _last_snapshot = 0.0
+
+
+@atexit.register
+def _remove_snapshot():
+    try:
+        os.remove(_snapshot_path(metrics_dir(), os.getpid()))
+    except OSError:
+        pass
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.2 on 2026-10-19 11:40
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(model, **filters):
+    qs = (
+        model.objects.filter(**filters)
+        .order_by()
+        .values(*filters)
+        .annotate(c=Count('pk'))
+        .values('c')
+    )
+    return Coalesce(Subquery(qs, output_field=IntegerField()), 0)
+
+
+def backfill_counters(apps, schema_editor):
+    Entry = apps.get_model('socialdistribution', 'Entry')
+    Comment = apps.get_model('socialdistribution', 'Comment')
+    Like = apps.get_model('socialdistribution', 'Like')
+    Entry.objects.update(
+        like_count=_count(Like, entry=OuterRef('pk')),
+        comment_count=_count(Comment, entry=OuterRef('pk')),
+    )
+    Comment.objects.update(like_count=_count(Like, comment=OuterRef('pk')))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0003_comment_uuid_alter_comment_id'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
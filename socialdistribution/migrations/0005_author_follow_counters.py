@@ -0,0 +1,46 @@
+# Generated by Django 5.2.2 on 2026-10-19 11:44
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_follow_counts(apps, schema_editor):
+    Author = apps.get_model('socialdistribution', 'Author')
+    FollowRequest = apps.get_model('socialdistribution', 'FollowRequest')
+
+    def accepted(field):
+        qs = (
+            FollowRequest.objects.filter(accepted=True, **{field: OuterRef('pk')})
+            .order_by()
+            .values(field)
+            .annotate(c=Count('pk'))
+            .values('c')
+        )
+        return Coalesce(Subquery(qs, output_field=IntegerField()), 0)
+
+    Author.objects.update(
+        follower_count=accepted('to_author'),
+        following_count=accepted('from_author'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0004_denormalized_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='follower_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_follow_counts, migrations.RunPython.noop),
+    ]
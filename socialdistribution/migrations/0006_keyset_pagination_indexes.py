@@ -0,0 +1,37 @@
+# Generated by Django 5.2.2 on 2026-10-19 11:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0005_author_follow_counters'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['entry', '-created_at', '-id'], name='comment_entry_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='comment_author_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='entry',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='entry_author_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['entry', '-created_at', '-id'], name='like_entry_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['comment', '-created_at', '-id'], name='like_comment_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='like',
+            index=models.Index(fields=['author', '-created_at', '-id'], name='like_author_keyset_idx'),
+        ),
+    ]
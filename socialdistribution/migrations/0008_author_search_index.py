@@ -0,0 +1,73 @@
+# Generated by Django 5.2.2 on 2026-10-19 12:05
+
+import unicodedata
+
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = {
+    "author_search_name_trgm": "search_name",
+    "author_search_username_trgm": "search_username",
+}
+
+
+def normalize_search(text):
+    # Frozen copy of models.author.normalize_search as of this migration.
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.casefold().split())[:120]
+
+
+def backfill_search_columns(apps, schema_editor):
+    Author = apps.get_model("socialdistribution", "Author")
+    batch = []
+    for author in Author.objects.only("pk", "display_name", "username").iterator(chunk_size=500):
+        author.search_name = normalize_search(author.display_name)
+        author.search_username = normalize_search(author.username)
+        batch.append(author)
+        if len(batch) >= 500:
+            Author.objects.bulk_update(batch, ["search_name", "search_username"])
+            batch = []
+    if batch:
+        Author.objects.bulk_update(batch, ["search_name", "search_username"])
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # Substring / fuzzy matching uses pg_trgm; other backends fall back to
+    # the in-process index in socialdistribution.search.
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    table = apps.get_model("socialdistribution", "Author")._meta.db_table
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, column in TRIGRAM_INDEXES.items():
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {name} ON "{table}" USING gin ("{column}" gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for name in TRIGRAM_INDEXES:
+        schema_editor.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0007_author_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='author',
+            name='search_name',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=120),
+        ),
+        migrations.AddField(
+            model_name='author',
+            name='search_username',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=120),
+        ),
+        migrations.RunPython(backfill_search_columns, migrations.RunPython.noop),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
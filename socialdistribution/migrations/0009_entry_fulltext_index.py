@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from socialdistribution import fulltext
+
+
+def create_index(apps, schema_editor):
+    if not fulltext.supported(schema_editor.connection.vendor):
+        return
+    fulltext.create(schema_editor)
+    Entry = apps.get_model("socialdistribution", "Entry")
+    entries = (
+        Entry.objects.filter(is_deleted=False)
+        .exclude(visibility="DELETED")
+        .values_list("id", "title", "description", "content", "contentType")
+    )
+    with schema_editor.connection.cursor() as cursor:
+        for row in entries.iterator(chunk_size=500):
+            fulltext.index_document(*row, cursor=cursor)
+
+
+def drop_index(apps, schema_editor):
+    fulltext.drop(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0008_author_search_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index, drop_index),
+    ]
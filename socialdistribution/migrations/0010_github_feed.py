@@ -0,0 +1,28 @@
+# Generated by Django 5.2.2 on 2026-10-19 12:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0009_entry_fulltext_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GitHubFeed',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('username', models.CharField(blank=True, max_length=100)),
+                ('etag', models.CharField(blank=True, max_length=200)),
+                ('poll_interval', models.PositiveIntegerField(default=60)),
+                ('next_poll_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('last_status', models.PositiveSmallIntegerField(default=0)),
+                ('author', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='github_feed', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
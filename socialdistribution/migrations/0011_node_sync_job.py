@@ -0,0 +1,33 @@
+# Generated by Django 5.2.2 on 2026-10-19 12:49
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0010_github_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NodeSyncJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('backfill', 'Send local content'), ('entries', 'Pull entries'), ('comments', 'Pull comments'), ('likes', 'Pull likes')], max_length=20)),
+                ('state', models.CharField(choices=[('idle', 'Never run'), ('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='idle', max_length=20)),
+                ('rerun', models.BooleanField(default=False)),
+                ('runs', models.PositiveIntegerField(default=0)),
+                ('requested_at', models.DateTimeField(blank=True, null=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('last_error', models.TextField(blank=True)),
+                ('node', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sync_jobs', to='socialdistribution.remotenode')),
+            ],
+            options={
+                'ordering': ['node_id', 'kind'],
+                'constraints': [models.UniqueConstraint(fields=('node', 'kind'), name='unique_sync_job_per_node_kind')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.2 on 2026-10-19 12:54
+
+import hashlib
+
+from django.db import migrations, models
+from markdown_it import MarkdownIt
+
+
+def render_markdown_entries(apps, schema_editor):
+    # Rendered directly rather than through socialdistribution.rendering,
+    # which would pull the cache and metrics into the migration.
+    markdown = MarkdownIt("commonmark", {"html": False})
+    Entry = apps.get_model('socialdistribution', 'Entry')
+    batch = []
+    for entry in Entry.objects.filter(contentType='text/markdown').only('pk', 'content').iterator(chunk_size=500):
+        entry.content_hash = hashlib.sha256((entry.content or '').encode()).hexdigest()
+        entry.content_html = markdown.render(entry.content or '')
+        batch.append(entry)
+        if len(batch) == 500:
+            Entry.objects.bulk_update(batch, ['content_html', 'content_hash'])
+            batch = []
+    if batch:
+        Entry.objects.bulk_update(batch, ['content_html', 'content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0011_node_sync_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='entry',
+            name='content_hash',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='entry',
+            name='content_html',
+            field=models.TextField(blank=True, editable=False),
+        ),
+        migrations.RunPython(render_markdown_entries, migrations.RunPython.noop),
+    ]
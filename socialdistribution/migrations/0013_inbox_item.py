@@ -0,0 +1,31 @@
+# Generated by Django 5.2.2 on 2026-10-19 13:36
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('socialdistribution', '0012_entry_content_html'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InboxItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('type', models.CharField(max_length=16)),
+                ('sender', models.CharField(blank=True, db_index=True, max_length=200)),
+                ('received_at', models.DateTimeField(db_index=True, default=django.utils.timezone.now)),
+                ('payload', models.TextField()),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='inbox_items', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-received_at', '-id'],
+                'indexes': [models.Index(fields=['owner', '-received_at', '-id'], name='inbox_owner_received_idx'), models.Index(fields=['owner', 'type', '-received_at', '-id'], name='inbox_owner_type_idx')],
+            },
+        ),
+    ]
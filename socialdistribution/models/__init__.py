@@ -3,5 +3,7 @@ from .followrequest import FollowRequest
 from .entry import Entry
 from .comment import Comment
 from .like import Like
-from .node import RemoteNode
+from .node import RemoteNode, NodeSyncJob
+from .github import GitHubFeed
+from .inbox import InboxItem
 
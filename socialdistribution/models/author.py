@@ -1,10 +1,34 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
+import unicodedata
 import uuid
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from socialdistribution import author_cache
 
 FIELD_MAX_LENGTH = 60
+SEARCH_MAX_LENGTH = FIELD_MAX_LENGTH * 2
+
+# Replaced whenever a searchable author field changes; search caches key on it.
+SEARCH_VERSION_KEY = "author-search-version"
+
+
+def normalize_search(text) -> str:
+    """Case- and accent-fold ``text`` and collapse whitespace for searching."""
+    text = unicodedata.normalize("NFKD", text or "")
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    return " ".join(text.casefold().split())[:SEARCH_MAX_LENGTH]
+
+
+def bump_search_version():
+    """Invalidate every cached author search result."""
+    # A fresh token rather than a counter, so a cleared cache never brings
+    # back a version an in-process index was already built for.
+    cache.set(SEARCH_VERSION_KEY, uuid.uuid4().hex, None)
 
 # Whats going to be saved in DB
 # CREATE TABLE author (
@@ -33,11 +57,17 @@ class Author(AbstractUser):
         display_name (str): Public name shown in the UI.
         github_link (str, optional): Optional GitHub profile URL.
         profile_image (str, optional): Optional avatar image URL.
+        updated_at (datetime): Last change to the public author representation.
+        search_name / search_username (str): Normalized copies of display_name
+            and username backing the indexed author search.
+        follower_count (int): Denormalized number of accepted followers.
+        following_count (int): Denormalized number of accepted followings.
 
     Notes:
         - Uses UUID for the primary key to avoid collisions across distributed systems.
         - Provides custom admin display names via Meta class.
         - `username`, `password`, and other auth-related fields are inherited.
+        - The follow counters are refreshed by the FollowRequest signal handlers.
     """
     # uuid4 used to generate a random and unique identifier (UUID).
     # helps avoid ID collisions, especially when multiple systems or users are involved.
@@ -72,6 +102,23 @@ class Author(AbstractUser):
 
     is_approved = models.BooleanField(default=False)
 
+    search_name = models.CharField(max_length=SEARCH_MAX_LENGTH, default="", db_index=True, editable=False)
+    search_username = models.CharField(max_length=SEARCH_MAX_LENGTH, default="", db_index=True, editable=False)
+
+    follower_count = models.PositiveIntegerField(default=0, editable=False)
+    following_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Bumped only when a field shown in the public author object changes, so
+    # peers can sync the author directory incrementally (?updated_since=).
+    updated_at = models.DateTimeField(default=timezone.now, db_index=True, editable=False)
+
+    COUNTER_FIELDS = ("follower_count", "following_count")
+    PROFILE_FIELDS = frozenset({
+        "id", "username", "display_name", "github_link", "profile_image",
+        "description", "host",
+    })
+    SEARCH_FIELDS = {"display_name": "search_name", "username": "search_username"}
+
     class Meta:
         # customize how this model appears in the Django admin and elsewhere
         verbose_name = "Author"
@@ -89,5 +136,79 @@ class Author(AbstractUser):
     def save(self, *args, **kwargs):
         if not self.id:
             self.id = self.fqid
+        update_fields = kwargs.get("update_fields")
+        self._profile_changes = self._changed_profile_fields(update_fields)
+        self.refresh_derived_fields(self._profile_changes)
+        if update_fields is not None:
+            kwargs["update_fields"] = {*update_fields, *self.derived_fields(update_fields, self._profile_changes)}
         super().save(*args, **kwargs)
-    
\ No newline at end of file
+        self._loaded_values = self._profile_snapshot()
+
+    def refresh_derived_fields(self, changed, now=None):
+        """
+        Recompute the search columns and, when profile fields ``changed``,
+        move ``updated_at``.  Used by ``save()`` and by writers that bypass
+        it, which then call ``profiles_changed()`` once the rows are written.
+        """
+        for source, column in self.SEARCH_FIELDS.items():
+            setattr(self, column, normalize_search(getattr(self, source)))
+        if changed:
+            self.updated_at = now or timezone.now()
+
+    @classmethod
+    def derived_fields(cls, fields, changed):
+        """Columns ``refresh_derived_fields()`` touched that a write of ``fields`` must include."""
+        derived = {column for source, column in cls.SEARCH_FIELDS.items() if source in fields}
+        if changed:
+            derived.add("updated_at")
+        return derived
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _profile_snapshot(self):
+        return {f: getattr(self, f) for f in self.PROFILE_FIELDS - self.get_deferred_fields()}
+
+    def _changed_profile_fields(self, update_fields):
+        """Profile fields this save writes with a value other than the stored one."""
+        fields = self.PROFILE_FIELDS if update_fields is None else self.PROFILE_FIELDS.intersection(update_fields)
+        if self._state.adding:
+            return set(fields)
+        loaded = getattr(self, "_loaded_values", {})
+        return {
+            f for f in fields - self.get_deferred_fields()
+            if f not in loaded or loaded[f] != getattr(self, f)
+        }
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        # Follow counters are owned by the FollowRequest signals, so a full
+        # save leaves them out of the UPDATE. It still falls back to an
+        # INSERT (counters included) when the row is gone.
+        if update_fields is None:
+            values = [v for v in values if v[0].name not in self.COUNTER_FIELDS]
+        return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+
+
+def profiles_changed(pks, changed):
+    """Drop cached searches and representations made stale by writing profile fields ``changed``."""
+    if {"host", *Author.SEARCH_FIELDS}.intersection(changed):
+        bump_search_version()
+    if changed:
+        author_cache.invalidate(pks)
+
+
+@receiver(post_save, sender=Author)
+@receiver(post_delete, sender=Author)
+def on_author_changed(sender, instance, signal, created=False, **kwargs):
+    """Invalidate what the saved or deleted author's profile made stale."""
+    if created:
+        # Nothing has cached a new author yet; it only joins search results.
+        bump_search_version()
+    elif signal is post_delete:
+        profiles_changed([instance.pk], Author.PROFILE_FIELDS)
+    else:
+        # Raw saves (fixtures) skip Author.save(); assume everything changed.
+        profiles_changed([instance.pk], getattr(instance, "_profile_changes", Author.PROFILE_FIELDS))
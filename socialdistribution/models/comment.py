@@ -1,5 +1,8 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.conf import settings
 from .entry import Entry
 from .author import Author
@@ -19,6 +22,9 @@ class Comment(models.Model):
       - id: full URL to this comment
       - entry: full URL to the entry
       - likes: paginated likes structure
+
+    ``like_count`` is a denormalized counter kept up to date by the Like
+    signal handlers.
     """
     id = models.CharField(primary_key=True, max_length=300, editable=False)
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
@@ -37,6 +43,16 @@ class Comment(models.Model):
     comment = models.TextField()
     content_type = models.CharField(max_length=50, default='text/plain')
     created_at = models.DateTimeField(auto_now_add=True)
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+
+    COUNTER_FIELDS = ("like_count",)
+
+    class Meta:
+        # Keyset pagination walks (created_at, id) within one entry/author.
+        indexes = [
+            models.Index(fields=['entry', '-created_at', '-id'], name='comment_entry_keyset_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='comment_author_keyset_idx'),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.id:
@@ -46,9 +62,39 @@ class Comment(models.Model):
             if not base.endswith('/api'):
                 base = f"{base}/api"
             self.id = f"{base}/authors/{author_uuid}/commented/{comment_uuid}"
-        super().save(*args, **kwargs)
+        elif not self._state.adding and kwargs.get("update_fields") is None \
+                and not kwargs.get("force_insert"):
+            # Leave like_count to the F() updates done by the Like signals.
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        # The counter update in post_save must commit together with the row.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         display = self.author.display_name if self.author else 'Unknown'
         return f"Comment by {display} on {self.entry.id}"
 
+
+
+def adjust_counter(model, pk, field, delta):
+    """Atomically add ``delta`` to a counter column without going below zero."""
+    if pk is None:
+        return
+    qs = model.objects.filter(pk=pk)
+    if delta < 0:
+        qs = qs.filter(**{f"{field}__gte": -delta})
+    qs.update(**{field: F(field) + delta})
+
+
+@receiver(post_save, sender=Comment)
+def on_comment_created(sender, instance, created, **kwargs):
+    if created:
+        adjust_counter(Entry, instance.entry_id, "comment_count", 1)
+
+
+@receiver(post_delete, sender=Comment)
+def on_comment_deleted(sender, instance, **kwargs):
+    adjust_counter(Entry, instance.entry_id, "comment_count", -1)
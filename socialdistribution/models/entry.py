@@ -2,6 +2,9 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 import uuid
 from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from socialdistribution import fulltext, page_cache, rendering
 from .author import Author
 from django.utils import timezone
 from django.conf import settings
@@ -25,6 +28,21 @@ class Entry(models.Model):
         - updated_at: Timestamp when the post was last modified.
         - description: Optional short summary.
         - is_deleted: Soft-delete flag to hide entry from feed without removing from DB.
+        - like_count: Denormalized number of likes on this entry.
+        - comment_count: Denormalized number of comments on this entry.
+        - content_html: Sanitized HTML of markdown content, rendered on save.
+        - content_hash: SHA-256 of the content ``content_html`` was rendered from.
+
+    Notes:
+        - The counters are maintained with F() increments by the Like and
+          Comment signal handlers; ``reconcile_counters`` repairs any drift.
+        - ``updated_at`` moves forward when a save changes one of
+          ``EDIT_FIELDS``; re-saving identical data (a repeated sync)
+          leaves it alone, so it can key cached entry cards.
+        - Markdown is rendered by socialdistribution.rendering, and only
+          again when the content hash changes.
+        - The full-text index (socialdistribution.fulltext) is updated by the
+          signal handlers below whenever searchable fields change.
     """
     # Unique ID for the post (used in URL)
     id = models.CharField(
@@ -77,6 +95,23 @@ class Entry(models.Model):
     description = models.CharField(max_length=200, blank=True)
 
     is_deleted = models.BooleanField(default=False)
+
+    like_count = models.PositiveIntegerField(default=0, editable=False)
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+
+    content_html = models.TextField(blank=True, editable=False)
+    content_hash = models.CharField(max_length=64, blank=True, editable=False)
+
+    COUNTER_FIELDS = ("like_count", "comment_count")
+    RENDERED_FIELDS = ("content_html", "content_hash")
+    EDIT_FIELDS = frozenset({"title", "description", "content", "contentType", "visibility", "is_deleted"})
+
+    class Meta:
+        # Keyset pagination walks (created_at, id) within one author.
+        indexes = [
+            models.Index(fields=['author', '-created_at', '-id'], name='entry_author_keyset_idx'),
+        ]
+
     def save(self, *args, **kwargs):
         if not self.id:
             entry_id = kwargs.pop("force_id", None) or str(uuid.uuid4())
@@ -84,7 +119,53 @@ class Entry(models.Model):
             self.id = (
                 f"{settings.BASE_URL}/api/authors/{author_uuid}/entries/{entry_id}"
             )
+        elif not self._state.adding and kwargs.get("update_fields") is None \
+                and not kwargs.get("force_insert"):
+            # Never write back in-memory counters on a full save; they may be
+            # stale compared to the F() increments done by other requests.
+            kwargs["update_fields"] = [
+                f.name for f in self._meta.concrete_fields
+                if not f.primary_key and f.name not in self.COUNTER_FIELDS
+            ]
+        self._render_content()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"content", "contentType"}.intersection(update_fields):
+            kwargs["update_fields"] = update_fields = {*update_fields, *self.RENDERED_FIELDS}
+        if not self._state.adding:
+            self._touch_if_edited(kwargs)
         super().save(*args, **kwargs)
+        self._loaded_values = {f: getattr(self, f) for f in (*self.EDIT_FIELDS, "updated_at")}
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def _touch_if_edited(self, kwargs):
+        update_fields = kwargs.get("update_fields")
+        fields = self.EDIT_FIELDS if update_fields is None else self.EDIT_FIELDS.intersection(update_fields)
+        if not fields:
+            return
+        loaded = getattr(self, "_loaded_values", {})
+        if all(f in loaded and loaded[f] == getattr(self, f) for f in fields):
+            # Nothing visible changed; keep the stored time even if the
+            # caller passed another (imports send the published time).
+            if "updated_at" in loaded:
+                self.updated_at = loaded["updated_at"]
+            return
+        self.updated_at = timezone.now()
+        if update_fields is not None and "updated_at" not in update_fields:
+            kwargs["update_fields"] = [*update_fields, "updated_at"]
+
+    def _render_content(self):
+        if self.contentType != rendering.MARKDOWN:
+            self.content_html = self.content_hash = ""
+            return
+        digest = rendering.content_hash(self.content)
+        if digest != self.content_hash:
+            self.content_html = rendering.render_markdown(self.content, digest)
+            self.content_hash = digest
 
     def __str__(self):
         return f"{self.title} ({self.author.display_name})"
@@ -93,3 +174,33 @@ class Entry(models.Model):
     def uuid(self) -> str:
         """Return the UUID portion of the entry's ID."""
         return str(self.id).rstrip("/").split("/")[-1]
+
+
+# Fields whose change affects the full-text index row.
+SEARCH_INDEX_FIELDS = {"title", "description", "content", "contentType", "visibility", "is_deleted"}
+
+
+def _changes_public_pages(entry, created):
+    """Whether saving ``entry`` changed what guests see on a public page."""
+    loaded = getattr(entry, "_loaded_values", {})
+    if created or "updated_at" not in loaded:
+        return entry.visibility == "PUBLIC"
+    if entry.updated_at == loaded["updated_at"]:
+        # save() only moves updated_at when an edit field changed.
+        return False
+    return "PUBLIC" in (entry.visibility, loaded.get("visibility"))
+
+
+@receiver(post_save, sender=Entry)
+def on_entry_saved(sender, instance, created=False, update_fields=None, **kwargs):
+    if update_fields is None or SEARCH_INDEX_FIELDS.intersection(update_fields):
+        fulltext.index_entry(instance)
+    if _changes_public_pages(instance, created):
+        page_cache.purge_on_commit()
+
+
+@receiver(post_delete, sender=Entry)
+def on_entry_deleted(sender, instance, **kwargs):
+    fulltext.remove_entry(instance.pk)
+    if instance.visibility == "PUBLIC":
+        page_cache.purge_on_commit()
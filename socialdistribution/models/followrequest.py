@@ -1,5 +1,12 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
+import hashlib
+from django.core.cache import cache
 from django.db import models
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from socialdistribution import metrics
 from .author import Author
 
 class FollowRequest(models.Model):
@@ -27,4 +34,81 @@ class FollowRequest(models.Model):
 
     pending      = models.BooleanField(default=True)
     accepted     = models.BooleanField(default=False)
-    created_at   = models.DateTimeField(auto_now_add=True)
\ No newline at end of file
+    created_at   = models.DateTimeField(auto_now_add=True)
+
+
+def _accepted_count(field):
+    """Correlated COUNT of accepted follow edges where ``field`` is the author."""
+    qs = (
+        FollowRequest.objects.filter(accepted=True, **{field: OuterRef("pk")})
+        .order_by()
+        .values(field)
+        .annotate(c=Count("pk"))
+        .values("c")
+    )
+    return Coalesce(Subquery(qs, output_field=IntegerField()), 0)
+
+
+def refresh_follow_counts(from_author_id, to_author_id):
+    """Recompute the cached follow counters for both ends of an edge."""
+    Author.objects.filter(pk=to_author_id).update(
+        follower_count=_accepted_count("to_author")
+    )
+    Author.objects.filter(pk=from_author_id).update(
+        following_count=_accepted_count("from_author")
+    )
+
+
+def follow_counts(author_ids):
+    """Return ``{author_id: {"follower_count", "following_count"}}`` in one query."""
+    rows = Author.objects.filter(pk__in=list(author_ids)).values_list(
+        "id", "follower_count", "following_count"
+    )
+    return {
+        author_id: {"follower_count": followers, "following_count": following}
+        for author_id, followers, following in rows
+    }
+
+
+# Seconds a cached (following, followers) pair may be reused; edits to an
+# author's edges also evict it immediately.
+FOLLOW_SETS_TTL = 300
+
+
+def _follow_sets_key(author_id):
+    return "follow-sets:" + hashlib.sha1(str(author_id).encode()).hexdigest()
+
+
+def follow_id_sets(author_id):
+    """
+    Return ``(following_ids, follower_ids)`` of accepted edges for an author.
+
+    Both are cached, so visibility checks on hot paths cost no queries; the
+    friend set is their intersection.
+    """
+    key = _follow_sets_key(author_id)
+    sets = cache.get(key)
+    metrics.cache_lookup("follow_sets", sets is not None)
+    if sets is None:
+        following, followers = set(), set()
+        edges = FollowRequest.objects.filter(accepted=True).filter(
+            models.Q(from_author_id=author_id) | models.Q(to_author_id=author_id)
+        ).values_list("from_author_id", "to_author_id")
+        for from_id, to_id in edges:
+            if from_id == author_id:
+                following.add(to_id)
+            if to_id == author_id:
+                followers.add(from_id)
+        sets = (frozenset(following), frozenset(followers))
+        cache.set(key, sets, FOLLOW_SETS_TTL)
+    return sets
+
+
+@receiver(post_save, sender=FollowRequest)
+@receiver(post_delete, sender=FollowRequest)
+def on_follow_request_changed(sender, instance, **kwargs):
+    refresh_follow_counts(instance.from_author_id, instance.to_author_id)
+    cache.delete_many([
+        _follow_sets_key(instance.from_author_id),
+        _follow_sets_key(instance.to_author_id),
+    ])
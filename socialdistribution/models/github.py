@@ -0,0 +1,32 @@
+from django.db import models
+from django.utils import timezone
+from .author import Author
+
+
+class GitHubFeed(models.Model):
+    """
+    Polling state for one author's public GitHub event feed.
+
+    GitHub answers a request that repeats the last ``ETag`` with
+    ``304 Not Modified`` (which does not count against the rate limit) and
+    asks clients to wait ``X-Poll-Interval`` seconds between polls.  Both
+    are remembered here so the importer only downloads new events, and only
+    when GitHub is ready to serve them.
+
+    Fields:
+        - author: The local author whose ``github_link`` is polled.
+        - username: GitHub login the state belongs to; a changed link resets it.
+        - etag: ETag of the last 200 response.
+        - poll_interval: Seconds GitHub asked us to wait between polls.
+        - next_poll_at: Earliest time the feed should be polled again.
+        - last_status: HTTP status (or 0 for a network error) of the last poll.
+    """
+    author = models.OneToOneField(Author, related_name="github_feed", on_delete=models.CASCADE)
+    username = models.CharField(max_length=100, blank=True)
+    etag = models.CharField(max_length=200, blank=True)
+    poll_interval = models.PositiveIntegerField(default=60)
+    next_poll_at = models.DateTimeField(default=timezone.now, db_index=True)
+    last_status = models.PositiveSmallIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.username} ({self.author_id})"
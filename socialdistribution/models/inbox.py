@@ -0,0 +1,38 @@
+from django.db import models
+from django.utils import timezone
+from .author import Author
+
+
+class InboxItem(models.Model):
+    """
+    Record of one object delivered to an author's inbox.
+
+    Deliveries are still applied to Entry, Comment, Like and FollowRequest
+    as they arrive; this table keeps what was sent, so the owner can page
+    through their inbox and federation problems can be traced afterwards.
+    Rows are written as deliveries are accepted and pruned after a
+    retention period; see
+    socialdistribution.inbox_store.
+
+    Fields:
+        - owner: The local author whose inbox received the item.
+        - type: ``entry``, ``comment``, ``like`` or ``follow``.
+        - sender: FQID of the author (or follow actor) that sent it; blank if the payload named none.
+        - received_at: When the delivery was accepted.
+        - payload: The delivered object as compact JSON.
+    """
+    owner = models.ForeignKey(Author, related_name="inbox_items", on_delete=models.CASCADE)
+    type = models.CharField(max_length=16)
+    sender = models.CharField(max_length=200, blank=True, db_index=True)
+    received_at = models.DateTimeField(default=timezone.now, db_index=True)
+    payload = models.TextField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "-received_at", "-id"], name="inbox_owner_received_idx"),
+            models.Index(fields=["owner", "type", "-received_at", "-id"], name="inbox_owner_type_idx"),
+        ]
+        ordering = ["-received_at", "-id"]
+
+    def __str__(self):
+        return f"{self.type} for {self.owner_id} from {self.sender or 'unknown'}"
@@ -1,9 +1,11 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
-from django.db import models
+from django.db import models, transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
 from django.conf import settings
 from .author import Author
 from .entry import Entry
-from .comment import Comment
+from .comment import Comment, adjust_counter
 import uuid
 
 
@@ -26,6 +28,12 @@ class Like(models.Model):
     """
     class Meta:
         unique_together = ('author', 'entry')
+        # Keyset pagination walks (created_at, id) within one entry/author.
+        indexes = [
+            models.Index(fields=['entry', '-created_at', '-id'], name='like_entry_keyset_idx'),
+            models.Index(fields=['comment', '-created_at', '-id'], name='like_comment_keyset_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='like_author_keyset_idx'),
+        ]
 
     uuid = models.UUIDField(default=uuid.uuid4, editable=False, unique=True)
     id = models.CharField(primary_key=True, max_length=300, editable=False)
@@ -67,4 +75,22 @@ class Like(models.Model):
             host = self.author.host.rstrip('/') if self.author.host else settings.BASE_URL.rstrip('/')
             base = host if host.endswith('/api') else f"{host}/api"
             self.id = f"{base}/authors/{author_uuid}/liked/{self.uuid}"
-        super().save(*args, **kwargs)
+        # The counter update in post_save must commit together with the row.
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+def _adjust_like_counts(like, delta):
+    adjust_counter(Entry, like.entry_id, "like_count", delta)
+    adjust_counter(Comment, like.comment_id, "like_count", delta)
+
+
+@receiver(post_save, sender=Like)
+def on_like_created(sender, instance, created, **kwargs):
+    if created:
+        _adjust_like_counts(instance, 1)
+
+
+@receiver(post_delete, sender=Like)
+def on_like_deleted(sender, instance, **kwargs):
+    _adjust_like_counts(instance, -1)
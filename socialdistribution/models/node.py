@@ -1,9 +1,8 @@
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_init, post_save
 from django.dispatch import receiver
 from django.utils.crypto import get_random_string
 from .author import Author
-import threading
 
 
 
@@ -71,16 +70,88 @@ class RemoteNode(models.Model):
             self.service_account.is_active = value
             self.service_account.save(update_fields=["is_active"])
 
+
+class NodeSyncJob(models.Model):
+    """
+    State of one kind of background sync for one remote node.
+
+    There is a single row per node and kind, and a job only starts when its
+    row moves from an idle state to ``queued``, so at most one copy of each
+    sync runs at a time.  A request that arrives while the job is queued or
+    running sets ``rerun`` instead, and the job runs once more when it
+    finishes.  See socialdistribution.sync_jobs.
+
+    Fields:
+        - node: The remote node being synced.
+        - kind: ``backfill`` (send local content to the node) or the
+          ``entries``/``comments``/``likes`` pulls.
+        - state: ``idle`` (never run), ``queued``, ``running``, ``succeeded`` or ``failed``.
+        - rerun: Another run was requested while this one was active.
+        - runs: Completed runs, successful or not.
+        - requested_at / started_at / finished_at: Times of the last request and run.
+        - last_error: Error of the last failed run.
+    """
+    BACKFILL = "backfill"
+    ENTRIES = "entries"
+    COMMENTS = "comments"
+    LIKES = "likes"
+    KIND_CHOICES = [
+        (BACKFILL, "Send local content"),
+        (ENTRIES, "Pull entries"),
+        (COMMENTS, "Pull comments"),
+        (LIKES, "Pull likes"),
+    ]
+
+    IDLE = "idle"
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    STATE_CHOICES = [
+        (IDLE, "Never run"),
+        (QUEUED, "Queued"),
+        (RUNNING, "Running"),
+        (SUCCEEDED, "Succeeded"),
+        (FAILED, "Failed"),
+    ]
+    ACTIVE_STATES = (QUEUED, RUNNING)
+
+    node = models.ForeignKey(RemoteNode, related_name="sync_jobs", on_delete=models.CASCADE)
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    state = models.CharField(max_length=20, choices=STATE_CHOICES, default=IDLE)
+    rerun = models.BooleanField(default=False)
+    runs = models.PositiveIntegerField(default=0)
+    requested_at = models.DateTimeField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["node", "kind"], name="unique_sync_job_per_node_kind"),
+        ]
+        ordering = ["node_id", "kind"]
+
+    def __str__(self):
+        return f"{self.kind} for {self.node_id}: {self.state}"
+
+
+# Only these change where or what a sync fetches; credential saves (a new
+# service account or password, or toggling it active) do not.
+SYNC_FIELDS = ("base_url",)
+
+
+@receiver(post_init, sender=RemoteNode)
+def remember_synced_fields(sender, instance, **kwargs):
+    instance._synced_values = {f: getattr(instance, f) for f in SYNC_FIELDS}
+
+
 @receiver(post_save, sender=RemoteNode)
-def on_remote_node_saved(sender, instance, **kwargs):
-    from socialdistribution.utils import (
-        send_all_to_new_remote,
-        sync_remote_entries,
-        sync_remote_comments,
-        sync_remote_likes,
-    )
-    threading.Thread(target=send_all_to_new_remote, args=(instance,), daemon=True).start()
-    threading.Thread(target=sync_remote_entries, args=(instance,), daemon=True).start()
-    threading.Thread(target=sync_remote_comments, args=(instance,), daemon=True).start()
-    threading.Thread(target=sync_remote_likes, args=(instance,), daemon=True).start()
-    
+def on_remote_node_saved(sender, instance, created, **kwargs):
+    from socialdistribution import sync_jobs
+
+    current = {f: getattr(instance, f) for f in SYNC_FIELDS}
+    changed = created or current != getattr(instance, "_synced_values", current)
+    instance._synced_values = current
+    if changed:
+        sync_jobs.schedule(instance)
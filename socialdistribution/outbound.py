@@ -0,0 +1,242 @@
+"""
+Prioritised delivery of objects to remote inboxes.
+
+Broadcasts used to start one thread per remote author, and a new node's
+backfill posted thousands of objects from its sync thread, so a user's
+delete competed with the backfill for threads and for the peer's
+attention.  Inbox POSTs are now queued with ``enqueue()`` on one of three
+lanes:
+
+- ``INTERACTIVE``: deletes and follows, which a user is waiting to see
+  take effect;
+- ``LIVE``: broadcasts of new entries, comments and likes, and the entries
+  sent to a new follower or friend;
+- ``BULK``: backfill of everything to a new node (``send_all_to_new_remote``).
+
+Jobs are queued per lane and per node (the inbox URL's host).  Workers take
+the nodes in turn, and within a node pick a lane by smooth weighted round
+robin over ``OUTBOUND_LANE_WEIGHTS``, so an urgent job waits behind at most
+a few others while backfill still makes progress.  Further limits keep
+backfill from crowding out the rest:
+
+- at most ``OUTBOUND_BULK_WORKERS`` workers send backfill at once, and each
+  node gets its backfill one request at a time, in the order queued;
+- at most ``OUTBOUND_PER_NODE`` requests are in flight to one node;
+- ``enqueue()`` blocks while ``OUTBOUND_BULK_QUEUE`` backfill jobs are
+  waiting, so a backfill cannot build up an unbounded queue.
+
+Up to ``OUTBOUND_WORKERS`` worker threads are started as jobs arrive and
+exit once the queues are empty.  They are daemon threads, so jobs still
+queued when the process exits are dropped rather than holding it open.
+They send through ``ratelimit.PeerSession``,
+so a peer's Retry-After holds its deliveries.  Failed deliveries are not
+retried.  A caller that needs the outcome of its own jobs, such as the
+backfill, queues them with a ``Batch`` and waits on it; ``drain()`` waits
+for everyone's.
+How long jobs waited is recorded per lane in
+``socialdistribution_outbound_queue_seconds`` on /admin/metrics/.
+"""
+import logging
+import threading
+import time
+from collections import deque
+from urllib.parse import urlparse
+import requests
+from django.conf import settings
+from socialdistribution import metrics, ratelimit
+
+logger = logging.getLogger(__name__)
+
+INTERACTIVE = "interactive"
+LIVE = "live"
+BULK = "bulk"
+# In priority order; the first lane wins ties.
+LANES = (INTERACTIVE, LIVE, BULK)
+
+# Defaults for the settings of the same name.
+OUTBOUND_WORKERS = 8
+OUTBOUND_PER_NODE = 4
+OUTBOUND_BULK_WORKERS = 2
+OUTBOUND_BULK_QUEUE = 500
+OUTBOUND_LANE_WEIGHTS = {INTERACTIVE: 8, LIVE: 4, BULK: 1}
+
+_cond = threading.Condition()
+_queues = {}          # node -> {lane: deque of jobs}
+_credit = {}          # node -> {lane: weighted round robin credit}
+_ring = deque()       # nodes with queued jobs, in turn order
+_busy = {}            # node -> requests in flight
+_bulk_nodes = set()   # nodes with a backfill request in flight
+_bulk_queued = 0
+_workers = 0
+_idle = 0
+
+
+class Batch:
+    """
+    Jobs queued together, so whoever queued them can wait for their outcome.
+
+    Pass the same batch to ``enqueue()`` for each job, then call ``wait()``;
+    ``sent`` and ``failed`` count the outcomes and ``first_error`` says why
+    the first failure failed.
+    """
+
+    def __init__(self):
+        self.queued = 0
+        self.sent = 0
+        self.failed = 0
+        self.first_error = ""
+
+    @property
+    def pending(self):
+        return self.queued - self.sent - self.failed
+
+    def wait(self, timeout=None):
+        """Wait until every job in the batch has been tried; return ``False`` on timeout."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with _cond:
+            while self.pending:
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                _cond.wait(remaining)
+        return True
+
+    def _done(self, url, error):
+        # Called with ``_cond`` held.
+        if error is None:
+            self.sent += 1
+            return
+        if not self.failed:
+            self.first_error = f"{url}: {error}"
+        self.failed += 1
+
+
+class DeliveryFailed(Exception):
+    """Some jobs of a ``Batch`` could not be delivered."""
+
+
+def enqueue(url, payload, auth=None, lane=LIVE, batch=None):
+    """Queue a POST of ``payload`` to the inbox at ``url`` on ``lane``, counted in ``batch`` if given."""
+    global _bulk_queued, _workers
+    if lane not in LANES:
+        raise ValueError(f"Unknown outbound lane {lane!r}")
+    node = urlparse(url).netloc
+    job = (url, payload, auth, lane, time.monotonic(), batch)
+    with _cond:
+        if batch is not None:
+            batch.queued += 1
+        if lane == BULK:
+            limit = getattr(settings, "OUTBOUND_BULK_QUEUE", OUTBOUND_BULK_QUEUE)
+            while _bulk_queued >= limit:
+                _cond.wait()
+            _bulk_queued += 1
+        lanes = _queues.get(node)
+        if lanes is None:
+            lanes = _queues[node] = {name: deque() for name in LANES}
+            _credit[node] = dict.fromkeys(LANES, 0)
+            _ring.append(node)
+        lanes[lane].append(job)
+        _cond.notify_all()
+        if not _idle and _workers < getattr(settings, "OUTBOUND_WORKERS", OUTBOUND_WORKERS):
+            _workers += 1
+            threading.Thread(target=_work, name="outbound-worker", daemon=True).start()
+
+
+def drain(timeout=None):
+    """Wait until every queued job has been sent; return ``False`` on timeout."""
+    deadline = None if timeout is None else time.monotonic() + timeout
+    with _cond:
+        while _workers:
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            _cond.wait(remaining)
+    return True
+
+
+def _next():
+    """Pop ``(node, job)`` for the next job to send, or ``None`` if all must wait."""
+    per_node = getattr(settings, "OUTBOUND_PER_NODE", OUTBOUND_PER_NODE)
+    bulk_free = len(_bulk_nodes) < getattr(settings, "OUTBOUND_BULK_WORKERS", OUTBOUND_BULK_WORKERS)
+    weights = getattr(settings, "OUTBOUND_LANE_WEIGHTS", OUTBOUND_LANE_WEIGHTS)
+    for _ in range(len(_ring)):
+        node = _ring[0]
+        _ring.rotate(-1)
+        if _busy.get(node, 0) >= per_node:
+            continue
+        lanes = _queues[node]
+        ready = [
+            lane for lane in LANES
+            if lanes[lane] and (lane != BULK or (bulk_free and node not in _bulk_nodes))
+        ]
+        if not ready:
+            continue
+        credit = _credit[node]
+        for lane in ready:
+            credit[lane] += weights[lane]
+        lane = max(ready, key=credit.__getitem__)
+        credit[lane] -= sum(weights[name] for name in ready)
+        job = lanes[lane].popleft()
+        if not any(lanes.values()):
+            del _queues[node], _credit[node]
+            _ring.remove(node)
+        return node, job
+    return None
+
+
+def _work():
+    global _bulk_queued, _workers, _idle
+    with ratelimit.PeerSession() as session:
+        while True:
+            with _cond:
+                while True:
+                    picked = _next()
+                    if picked or not _queues:
+                        break
+                    # Everything queued is held back by a limit; wait for a slot.
+                    _idle += 1
+                    _cond.wait()
+                    _idle -= 1
+                if not picked:
+                    _workers -= 1
+                    _cond.notify_all()
+                    return
+                node, (url, payload, auth, lane, queued_at, batch) = picked
+                _busy[node] = _busy.get(node, 0) + 1
+                if lane == BULK:
+                    _bulk_nodes.add(node)
+                    _bulk_queued -= 1
+            metrics.outbound_queue_seconds.observe(time.monotonic() - queued_at, lane=lane)
+            error = "not sent"
+            try:
+                error = _send(session, url, payload, auth)
+            except Exception as exc:
+                logger.exception("outbound delivery to %s failed", url)
+                error = f"{type(exc).__name__}: {exc}"
+            finally:
+                with _cond:
+                    if batch is not None:
+                        batch._done(url, error)
+                    _busy[node] -= 1
+                    if not _busy[node]:
+                        del _busy[node]
+                    if lane == BULK:
+                        _bulk_nodes.discard(node)
+                    _cond.notify_all()
+
+
+def _send(session, url, payload, auth):
+    """POST one job; return ``None`` if the peer accepted it, or why it did not."""
+    try:
+        response = session.post(
+            url,
+            json=payload,
+            headers={"Content-Type": "application/json"},
+            timeout=5,
+            auth=auth,
+        )
+    except requests.RequestException as exc:
+        return f"{type(exc).__name__}: {exc}"
+    if response.status_code >= 400:
+        return f"HTTP {response.status_code}"
+    return None
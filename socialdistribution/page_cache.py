@@ -0,0 +1,78 @@
+"""
+Full-response cache for the pages anonymous visitors see.
+
+Every guest gets the same feed and the same page for a public entry, so
+those responses are kept in the cache for a short time and served without
+touching the database or the template engine.  Keys vary only on the path,
+the page/cursor query parameters and a small per-view variant; other query
+parameters (tracking tags and the like) do not split the cache.
+
+Every key contains ``VERSION_KEY``, which is replaced whenever a PUBLIC
+entry is created, edited or deleted, so those changes show up on the next
+request rather than after the TTL.  The cache is shared by every worker
+(see ``CACHES`` in settings), so a purge in one worker reaches the pages
+the others serve.  Like and comment counts are not purged; they may lag by
+up to the TTL.
+
+Signed-in viewers never read or fill this cache.
+"""
+import hashlib
+import uuid
+from urllib.parse import urlencode
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse
+from socialdistribution import metrics
+
+# Replaced whenever a public page may have changed; page keys include it.
+VERSION_KEY = "public-pages-version"
+# Seconds a cached guest feed page and a cached public entry page are served.
+FEED_TTL = 30
+ENTRY_TTL = 60
+# The only query parameters that select a different page.
+VARY_PARAMS = ("page", "cursor")
+
+
+def purge():
+    """Drop every cached public page."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, None)
+
+
+def purge_on_commit():
+    """Purge now, and again once the current transaction commits."""
+    purge()
+    # A guest page rendered before the commit may still hold the old rows.
+    transaction.on_commit(purge)
+
+
+def _key(request, variant):
+    params = urlencode([(p, request.GET[p]) for p in VARY_PARAMS if p in request.GET])
+    source = f"{cache.get(VERSION_KEY, '')}:{request.path}:{params}:{variant}"
+    return "public-page:" + hashlib.sha1(source.encode()).hexdigest()
+
+
+def lookup(request, variant=""):
+    """
+    Return ``(key, response)`` for an anonymous GET.
+
+    ``response`` is the cached page or ``None``; ``key`` is where a freshly
+    rendered page should be stored.  Both are ``None`` for other requests.
+    """
+    if request.method != "GET" or request.user.is_authenticated:
+        return None, None
+    key = _key(request, variant)
+    cached = cache.get(key)
+    metrics.cache_lookup("public_page", cached is not None)
+    if cached is None:
+        return key, None
+    content, content_type = cached
+    return key, HttpResponse(content, content_type=content_type)
+
+
+def store(key, response, ttl):
+    """Cache ``response`` under ``key`` once it has been rendered."""
+    if key is None or response.status_code != 200 or not hasattr(response, "add_post_render_callback"):
+        return
+    response.add_post_render_callback(
+        lambda r: cache.set(key, (r.content, r["Content-Type"]), ttl)
+    )
@@ -0,0 +1,121 @@
+"""
+Keyset (cursor) pagination shared by the list API views.
+
+Every list endpoint keeps the spec's ``?page=<n>&size=<n>`` parameters, but
+also accepts an opaque ``?cursor=<token>`` that encodes the
+``(created_at, id)`` of the last item on the previous page (or another
+timestamp column, for lists ordered by one).  A cursor page
+is a single indexed range scan, so deep pages cost the same as page 1,
+while ``page`` still uses OFFSET for compatibility.  Responses always carry
+a ``next`` link in cursor form (or ``None`` on the last page).
+"""
+import base64
+import json
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import ValidationError
+
+# Largest page any list endpoint will return, whatever ``size`` asks for.
+MAX_PAGE_SIZE = 100
+
+
+def int_query_param(request, name, default):
+    """Return a positive integer query parameter or raise a 400."""
+    raw = request.query_params.get(name)
+    if raw in (None, ""):
+        return default
+    try:
+        value = int(raw)
+    except (TypeError, ValueError):
+        raise ValidationError({name: "Must be a valid integer."})
+    if value < 1:
+        raise ValidationError({name: "Must be a positive integer."})
+    return value
+
+
+def fields_query_param(request, allowed):
+    """
+    Return the ``?fields=a,b`` projection as a list, or ``None`` if absent.
+
+    Unknown names raise a 400 listing the fields that may be requested.
+    """
+    raw = request.query_params.get("fields")
+    if not raw:
+        return None
+    fields = [f.strip() for f in raw.split(",") if f.strip()]
+    unknown = [f for f in fields if f not in allowed]
+    if unknown or not fields:
+        raise ValidationError({"fields": f"Choose from: {', '.join(allowed)}."})
+    return fields
+
+
+def set_page_headers(response, count, page_info):
+    """Expose the total count and next link as headers for clients that poll."""
+    response["X-Total-Count"] = str(count)
+    if page_info.get("next"):
+        response["Link"] = f'<{page_info["next"]}>; rel="next"'
+    return response
+
+
+def encode_cursor(obj, field="created_at") -> str:
+    """Return the opaque cursor pointing just past ``obj``, a model instance or ``.values()`` row."""
+    if isinstance(obj, dict):
+        created_at, pk = obj[field], obj["id"]
+    else:
+        created_at, pk = getattr(obj, field), obj.pk
+    raw = json.dumps([created_at.isoformat(), str(pk)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str):
+    """Return ``(created_at, pk)`` from a cursor, or raise a 400."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, pk = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        dt = parse_datetime(created_at)
+    except (ValueError, TypeError):
+        dt = None
+    if dt is None:
+        raise ValidationError({"cursor": "Invalid cursor."})
+    return dt, pk
+
+
+def _next_link(request, last, size, field):
+    params = request.GET.copy()
+    params.pop("page", None)
+    params["cursor"] = encode_cursor(last, field)
+    params["size"] = str(size)
+    return request.build_absolute_uri(f"{request.path}?{params.urlencode()}")
+
+
+def paginate(request, queryset, default_size=5, max_size=MAX_PAGE_SIZE, field="created_at"):
+    """
+    Slice ``queryset`` (newest ``field`` first) according to the request parameters.
+
+    Returns ``(items, page_info)`` where ``page_info`` holds ``size``,
+    ``next`` and, in page mode, ``page_number``; views merge it into their
+    response objects.
+    """
+    size = min(int_query_param(request, "size", default_size), max_size)
+    queryset = queryset.order_by(f"-{field}", "-pk")
+    page_info = {}
+
+    cursor = request.query_params.get("cursor")
+    if cursor:
+        created_at, pk = decode_cursor(cursor)
+        queryset = queryset.filter(
+            Q(**{f"{field}__lt": created_at}) | Q(**{field: created_at, "pk__lt": pk})
+        )
+    else:
+        page = int_query_param(request, "page", 1)
+        page_info["page_number"] = page
+        queryset = queryset[(page - 1) * size:]
+
+    # Fetch one extra row to learn whether there is a next page.
+    items = list(queryset[:size + 1])
+    has_more = len(items) > size
+    items = items[:size]
+
+    page_info["size"] = size
+    page_info["next"] = _next_link(request, items[-1], size, field) if has_more else None
+    return items, page_info
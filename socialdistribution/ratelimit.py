@@ -0,0 +1,174 @@
+"""
+Rate limits for API clients, and backing off when a peer limits us.
+
+Inbound, ``PeerRateThrottle`` (the default DRF throttle) gives every client
+a token bucket per scope, kept in the default cache.  In production that is
+Redis or Memcached, shared by every worker (see ``CACHES`` in settings), so
+the limits below are per node, not per worker; buckets expire on their own
+once they would have refilled:
+
+- a peer node's service account, or a signed-in local user, has one bucket
+  per account; anonymous clients have one per IP;
+- ``inbox`` covers POSTs to an inbox, ``read`` every GET/HEAD/OPTIONS and
+  ``write`` every other write; ``settings.RATE_LIMITS`` sets each scope's
+  refill ``rate`` (requests per second) and ``burst`` (bucket size).
+
+A request that finds its bucket empty gets ``429 Too Many Requests`` with a
+``Retry-After`` header, and is counted in
+``socialdistribution_rate_limited_total`` on /admin/metrics/.  The bucket
+is read and written without a lock, so concurrent requests can overdraw it
+by a few tokens; that is fine for shedding load.
+
+Outbound, federation traffic that runs off the request path (the outbound
+delivery workers and the ``sync_remote_*`` jobs) goes through
+``PeerSession``.  A ``429`` or ``503`` with ``Retry-After`` from a peer puts
+that host on hold in the shared cache.  Requests to a host on hold wait for
+it when the wait is at most the session's ``max_wait`` (``OUTBOUND_MAX_WAIT``
+seconds by default; a throttled request is sent once more after waiting),
+and otherwise fail straight away with ``PeerBusy``, a
+``requests.RequestException``, so callers handle it like any failed call.
+Sessions used while a user waits pass ``max_wait=0``, so they skip a held
+host rather than sleep.
+"""
+import math
+import time
+import requests
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.http import parse_http_date_safe
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+from socialdistribution import instrumentation, metrics
+
+# Defaults for settings.RATE_LIMITS.
+RATE_LIMITS = {
+    "inbox": {"rate": 20, "burst": 200},
+    "read": {"rate": 50, "burst": 500},
+    "write": {"rate": 10, "burst": 100},
+}
+# Longest Retry-After (seconds) an outbound request waits out; override with
+# settings.OUTBOUND_MAX_WAIT.
+OUTBOUND_MAX_WAIT = 10
+
+
+def take(key, rate, burst):
+    """
+    Take one token from the bucket ``key``.
+
+    Return 0 if a token was taken, or the seconds until one will be available.
+    """
+    now = time.time()
+    tokens, updated = cache.get(key) or (burst, now)
+    tokens = min(burst, tokens + (now - updated) * rate)
+    if tokens < 1:
+        return (1 - tokens) / rate
+    # Kept until a full bucket would have refilled, then it is full anyway.
+    cache.set(key, (tokens - 1, now), math.ceil(burst / rate) + 1)
+    return 0
+
+
+class PeerRateThrottle(BaseThrottle):
+    """Token bucket per account (or per IP when anonymous) and scope; see the module docstring."""
+
+    def scope(self, request, view):
+        if request.method in SAFE_METHODS:
+            return "read"
+        return getattr(view, "throttle_scope", "write")
+
+    def allow_request(self, request, view):
+        scope = self.scope(request, view)
+        limits = getattr(settings, "RATE_LIMITS", RATE_LIMITS).get(scope)
+        if not limits:
+            return True
+        user = request.user
+        ident = f"user:{user.pk}" if user and user.is_authenticated else f"ip:{self.get_ident(request)}"
+        self.wait_seconds = take(f"rate:{scope}:{ident}", limits["rate"], limits["burst"])
+        if self.wait_seconds:
+            metrics.rate_limited.inc(client=self.client_label(user), scope=scope)
+            return False
+        return True
+
+    def wait(self):
+        return self.wait_seconds
+
+    @staticmethod
+    def client_label(user):
+        """Name a limited client for the metrics: its node's host, ``local`` or ``anonymous``."""
+        from socialdistribution.models import RemoteNode
+
+        if not user or not user.is_authenticated:
+            return "anonymous"
+        base = RemoteNode.objects.filter(service_account_id=user.pk).values_list("base_url", flat=True).first()
+        return urlparse(base).netloc if base else "local"
+
+
+# --- Outbound -----------------------------------------------------------------
+
+class PeerBusy(requests.RequestException):
+    """The peer asked us to wait longer than ``OUTBOUND_MAX_WAIT``."""
+
+
+def _hold_key(host):
+    return f"peer-hold:{host}"
+
+
+def retry_after_seconds(response):
+    """Return the Retry-After of a 429 or 503 response in seconds, or ``None``."""
+    value = response.headers.get("Retry-After", "").strip()
+    if response.status_code not in (429, 503) or not value:
+        return None
+    if value.isdigit():
+        return int(value)
+    when = parse_http_date_safe(value)
+    return max(0, when - time.time()) if when is not None else None
+
+
+def hold(host, seconds):
+    """Put ``host`` on hold for ``seconds``."""
+    cache.set(_hold_key(host), time.time() + seconds, math.ceil(seconds) + 1)
+
+
+def held_for(host):
+    """Seconds ``host`` is still on hold, or 0."""
+    until = cache.get(_hold_key(host))
+    return max(0.0, until - time.time()) if until else 0.0
+
+
+class PeerSession(instrumentation.ProfiledSession):
+    """``ProfiledSession`` that honours Retry-After from peers, waiting up to ``max_wait`` seconds."""
+
+    def __init__(self, max_wait=None):
+        super().__init__()
+        self.max_wait = max_wait
+
+    def send(self, request, **kwargs):
+        host = urlparse(request.url).netloc
+        max_wait = self.max_wait
+        if max_wait is None:
+            max_wait = getattr(settings, "OUTBOUND_MAX_WAIT", OUTBOUND_MAX_WAIT)
+        wait = held_for(host)
+        if wait > max_wait:
+            metrics.outbound_requests.inc(node=host, outcome="held")
+            raise PeerBusy(f"{host} asked us to wait {wait:.0f}s", request=request)
+        if wait:
+            time.sleep(wait)
+        response = super().send(request, **kwargs)
+        delay = retry_after_seconds(response)
+        if delay is None:
+            return response
+        hold(host, delay)
+        if response.status_code == 429 and delay <= max_wait:
+            # Refused for going too fast: wait it out and send once more.
+            time.sleep(delay)
+            response = super().send(request, **kwargs)
+            delay = retry_after_seconds(response)
+            if delay is not None:
+                hold(host, delay)
+        return response
+
+
+def get(url, max_wait=None, **kwargs):
+    """``requests.get`` through a ``PeerSession``."""
+    with PeerSession(max_wait) as session:
+        return session.get(url, **kwargs)
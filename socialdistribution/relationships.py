@@ -0,0 +1,110 @@
+"""
+Relationship lists for one author: friends, following, followers and
+incoming pending requests.
+
+Only the follow edges that touch the author are read.  Each list is one
+query over those edges: both endpoints come back through
+``select_related``, and an ``EXISTS`` self-join on the reverse edge marks
+mutual follows.  Every list is paginated on its own, so a page costs
+O(page size) however many edges the node holds.
+"""
+from django.db.models import Exists, OuterRef, Q
+from socialdistribution.models import FollowRequest
+
+# Default number of people shown per relationship list.
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+LISTS = ("friends", "following", "followers", "pending")
+
+
+def page_param(params, name, default):
+    """Return a positive integer from ``params``, or ``default`` if it is invalid."""
+    try:
+        value = int(params.get(name, default))
+    except (TypeError, ValueError):
+        return default
+    return value if value > 0 else default
+
+
+def _reverse_accepted():
+    return FollowRequest.objects.filter(
+        from_author=OuterRef("to_author"),
+        to_author=OuterRef("from_author"),
+        accepted=True,
+    )
+
+
+def _outgoing(author):
+    return (
+        FollowRequest.objects.filter(from_author=author)
+        .select_related("to_author")
+        .annotate(mutual=Exists(_reverse_accepted()))
+    )
+
+
+def friend_edges(author):
+    """Accepted edges from ``author`` whose reverse is also accepted; ``to_author`` is the friend."""
+    return _outgoing(author).filter(accepted=True, mutual=True)
+
+
+def _edge_querysets(author):
+    """Return one annotated queryset per relationship list."""
+    outgoing = _outgoing(author)
+    incoming = (
+        FollowRequest.objects.filter(to_author=author)
+        .select_related("from_author")
+        .annotate(mutual=Exists(_reverse_accepted()))
+    )
+    return {
+        "friends": friend_edges(author),
+        "following": outgoing.filter(
+            Q(accepted=True, mutual=False) | Q(accepted=False, pending=True)
+        ),
+        "followers": incoming.filter(accepted=True, mutual=False).annotate(
+            # Whether the author has already asked to follow this follower back.
+            requested_back=Exists(FollowRequest.objects.filter(
+                from_author=author,
+                to_author=OuterRef("from_author"),
+                pending=True,
+            ))
+        ),
+        "pending": incoming.filter(accepted=False, pending=True),
+    }
+
+
+def _entry(name, fr):
+    """Return the template-facing item for edge ``fr`` in list ``name``."""
+    if name == "friends":
+        return fr.to_author
+    if name == "following":
+        return {"user": fr.to_author, "pending": not fr.accepted}
+    if name == "followers":
+        return {"user": fr.from_author, "pending": fr.requested_back}
+    return fr.from_author
+
+
+def get_relationships(author, pages=None, size=DEFAULT_PAGE_SIZE):
+    """
+    Return ``{list_name: {"items", "page_number", "size", "has_next"}}``.
+
+    ``pages`` maps list names to 1-based page numbers; missing lists start
+    on page 1.  ``items`` keeps the shapes relationships.html expects:
+    authors for friends and pending, ``{"user", "pending"}`` dicts for
+    following and followers.
+    """
+    pages = pages or {}
+    size = min(size, MAX_PAGE_SIZE)
+    result = {}
+    for name, qs in _edge_querysets(author).items():
+        page = pages.get(name, 1)
+        start = (page - 1) * size
+        # One extra row tells us whether there is a next page.
+        rows = list(qs.order_by("-created_at", "-pk")[start:start + size + 1])
+        result[name] = {
+            "items": [_entry(name, fr) for fr in rows[:size]],
+            "page_number": page,
+            "size": size,
+            "has_next": len(rows) > size,
+        }
+    return result
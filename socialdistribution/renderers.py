@@ -0,0 +1,44 @@
+"""
+JSON rendering for API responses.
+
+``FastJSONRenderer`` encodes with orjson when it is installed, which is
+several times faster than the standard library on the large lists peers
+page through.  The output matches DRF's ``JSONRenderer`` (compact, UTF-8,
+U+2028/U+2029 escaped, datetimes and decimals encoded the DRF way).
+Without orjson, for indented output (``Accept: application/json; indent=2``)
+and for anything orjson cannot encode, it falls back to DRF's renderer.
+"""
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# DRF's encoder handles what orjson hands back: datetimes (passed through so
+# they keep DRF's format), decimals, lazy strings and querysets.
+_default = JSONEncoder().default
+
+
+def dumps(data):
+    """Encode ``data`` as DRF's JSONRenderer would, as bytes."""
+    if orjson is not None:
+        try:
+            encoded = orjson.dumps(
+                data, default=_default,
+                option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            pass
+        else:
+            return encoded.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+    return JSONRenderer().render(data)
+
+
+class FastJSONRenderer(JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None or self.get_indent(accepted_media_type, renderer_context or {}):
+            return super().render(data, accepted_media_type, renderer_context)
+        return dumps(data)
@@ -0,0 +1,57 @@
+"""
+Server-side rendering of entry content.
+
+Markdown entries are rendered to HTML once, when they are saved: by the
+author, by an inbox delivery or by a node sync.  The HTML is stored on the
+entry with the SHA-256 of the source, so pages and the API serve it as is
+and browsers no longer parse markdown or receive it twice.
+
+Rendering follows CommonMark (markdown-it-py's ``commonmark`` preset) with
+raw HTML disabled, so tags in an entry are escaped rather than passed
+through, and markdown-it's link validation drops ``javascript:``,
+``vbscript:``, ``file:`` and non-image ``data:`` URLs.
+
+Rendered HTML is also cached by content hash, so the same source (an
+unchanged entry imported again, or a broadcast delivered twice) is parsed
+once per ``CACHE_TTL``.
+"""
+import hashlib
+from django.core.cache import cache
+from django.utils.html import escape
+from markdown_it import MarkdownIt
+from socialdistribution import metrics
+
+MARKDOWN = "text/markdown"
+# Seconds rendered HTML stays in the cache; the stored copy on the entry is permanent.
+CACHE_TTL = 24 * 60 * 60
+
+_markdown = MarkdownIt("commonmark", {"html": False})
+
+
+def content_hash(text):
+    return hashlib.sha256((text or "").encode()).hexdigest()
+
+
+def render_markdown(text, digest=None):
+    """Return sanitized HTML for markdown ``text``, cached by its hash."""
+    key = f"markdown-html:{digest or content_hash(text)}"
+    html = cache.get(key)
+    metrics.cache_lookup("markdown_html", html is not None)
+    if html is None:
+        html = _markdown.render(text or "")
+        cache.set(key, html, CACHE_TTL)
+    return html
+
+
+def entry_html(entry):
+    """HTML for an entry's content: rendered markdown, escaped text, or ``""`` for images."""
+    return content_html(entry.contentType, entry.content, entry.content_html)
+
+
+def content_html(content_type, content, stored_html):
+    """``entry_html`` for raw column values, as read by ``.values()``."""
+    if content_type == MARKDOWN:
+        return stored_html
+    if content_type.startswith("image") or content_type == "application/base64":
+        return ""
+    return escape(content)
@@ -0,0 +1,36 @@
+"""
+A throwaway database for the benchmark and simulation commands.
+"""
+import os
+import tempfile
+from contextlib import contextmanager
+from django.db import connection
+
+
+@contextmanager
+def scratch_database(label):
+    """
+    Run the block against a freshly migrated copy of the database.
+
+    On SQLite the copy is a file rather than SQLite's shared in-memory
+    database, so threads see ordinary file locking.  The copy is dropped on
+    exit; the configured database is never touched.
+    """
+    old_name = connection.settings_dict["NAME"]
+    test_settings = connection.settings_dict.setdefault("TEST", {})
+    old_test_name = test_settings.get("NAME")
+    scratch_dir = tempfile.mkdtemp(prefix=f"{label}-")
+    test_settings["NAME"] = (
+        os.path.join(scratch_dir, f"{label}.sqlite3")
+        if connection.vendor == "sqlite" else f"{old_name}_{label.replace('-', '_')}"
+    )
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        test_settings["NAME"] = old_test_name
+        if os.path.isdir(scratch_dir):
+            for filename in os.listdir(scratch_dir):
+                os.remove(os.path.join(scratch_dir, filename))
+            os.rmdir(scratch_dir)
@@ -0,0 +1,242 @@
+"""
+Author and entry search.
+
+Author search backs the navbar autocomplete and the search page.
+
+Authors carry case- and accent-folded copies of ``display_name`` and
+``username`` in indexed columns, so a prefix match is a B-tree range scan
+rather than a ``LIKE '%q%'`` table scan.  Substring and typo-tolerant
+matches come from pg_trgm on PostgreSQL and from an in-process index of the
+same columns on other backends.  Matches are ranked by the viewer's
+relationship to each author, and ranked results are cached for a short
+time so the bursts of requests an autocomplete box sends are answered
+from the cache.
+
+Entry search ranks matches with the full-text index in
+socialdistribution.fulltext, then keeps only the entries the viewer may see.
+Visibility is checked against the viewer's cached follow sets.
+"""
+import hashlib
+import threading
+import time
+from urllib.parse import urlparse
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from socialdistribution import fulltext, metrics
+from socialdistribution.models import Author, Entry, FollowRequest
+from socialdistribution.models.author import SEARCH_VERSION_KEY, normalize_search
+from socialdistribution.models.followrequest import follow_id_sets
+
+# Seconds a ranked result list is reused for the same viewer and query.
+RESULT_TTL = 30
+# Matches fetched before ranking; only the best ``limit`` are returned.
+CANDIDATES = 50
+# Seconds the in-process index may lag writes made by other processes.
+MEMORY_INDEX_TTL = 60
+# Minimum trigram similarity for a fuzzy match (pg_trgm's default).
+TRIGRAM_THRESHOLD = 0.3
+
+# Relationship buckets, best first.
+FRIEND, FOLLOWING, FOLLOWER, LOCAL, REMOTE = range(5)
+
+
+def _trigrams(text):
+    """pg_trgm-style trigrams of each word in ``text``."""
+    grams = set()
+    for word in text.split():
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+class _MemoryIndex:
+    """Normalized names of every author, kept in process for substring search."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._version = None
+        self._loaded_at = 0.0
+        self._rows = ()
+
+    def rows(self, version):
+        now = time.monotonic()
+        if version != self._version or now - self._loaded_at > MEMORY_INDEX_TTL:
+            with self._lock:
+                if version != self._version or now - self._loaded_at > MEMORY_INDEX_TTL:
+                    self._rows = tuple(
+                        (pk, name, username, _trigrams(f"{name} {username}"))
+                        for pk, name, username in Author.objects.values_list(
+                            "pk", "search_name", "search_username"
+                        ).iterator(chunk_size=1000)
+                    )
+                    self._version, self._loaded_at = version, now
+        return self._rows
+
+    def match(self, q, version, exclude, limit):
+        """Return up to ``limit`` author pks containing or resembling ``q``."""
+        rows = self.rows(version)
+        hits = [pk for pk, name, username, _ in rows
+                if pk not in exclude and (q in name or q in username)]
+        if len(hits) < limit and len(q) >= 3:
+            wanted = _trigrams(q)
+            seen = exclude.union(hits)
+            scored = []
+            for pk, _, _, grams in rows:
+                if pk in seen:
+                    continue
+                score = len(wanted & grams) / len(wanted)
+                if score >= TRIGRAM_THRESHOLD:
+                    scored.append((score, pk))
+            scored.sort(reverse=True)
+            hits.extend(pk for _, pk in scored)
+        return hits[:limit]
+
+
+_memory_index = _MemoryIndex()
+
+
+def _prefix_q(q):
+    if connection.vendor == "postgresql":
+        # Django's varchar_pattern_ops index serves LIKE 'q%' here.
+        return Q(search_name__startswith=q) | Q(search_username__startswith=q)
+    # SQLite compares the folded columns bytewise, so a range is a prefix scan.
+    upper = q + "\U0010ffff"
+    return (Q(search_name__gte=q, search_name__lt=upper)
+            | Q(search_username__gte=q, search_username__lt=upper))
+
+
+def _candidates(q, version):
+    fields = ("pk", "display_name", "search_name", "search_username", "host")
+    found = list(Author.objects.filter(_prefix_q(q)).only(*fields)[:CANDIDATES])
+    if len(found) >= CANDIDATES:
+        return found
+
+    exclude = {a.pk for a in found}
+    if connection.vendor == "postgresql":
+        fuzzy = Author.objects.filter(
+            Q(search_name__trigram_word_similar=q) | Q(search_username__trigram_word_similar=q)
+        ).exclude(pk__in=exclude).only(*fields)[:CANDIDATES - len(found)]
+        return found + list(fuzzy)
+
+    pks = _memory_index.match(q, version, exclude, CANDIDATES - len(found))
+    by_pk = Author.objects.only(*fields).in_bulk(pks)
+    return found + [by_pk[pk] for pk in pks if pk in by_pk]
+
+
+def _relationship_buckets(viewer, authors):
+    """Return ``{author_pk: bucket}`` for the viewer's ties to ``authors``."""
+    local = urlparse(settings.BASE_URL).netloc
+    buckets = {
+        a.pk: LOCAL if urlparse(a.host or "").netloc in ("", local) else REMOTE
+        for a in authors
+    }
+    if viewer is None or not buckets:
+        return buckets
+
+    edges = FollowRequest.objects.filter(accepted=True).filter(
+        Q(from_author=viewer, to_author__in=list(buckets))
+        | Q(to_author=viewer, from_author__in=list(buckets))
+    ).values_list("from_author_id", "to_author_id")
+    following, followers = set(), set()
+    for from_id, to_id in edges:
+        if from_id == viewer.pk:
+            following.add(to_id)
+        else:
+            followers.add(from_id)
+    for pk in following & followers:
+        buckets[pk] = FRIEND
+    for pk in following - followers:
+        buckets[pk] = FOLLOWING
+    for pk in followers - following:
+        buckets[pk] = FOLLOWER
+    return buckets
+
+
+def search_authors(query, viewer=None, limit=5):
+    """
+    Return up to ``limit`` ``{"id", "display_name"}`` dicts matching ``query``.
+
+    Exact matches rank above prefix matches, which rank above substring or
+    fuzzy ones; within each, friends come first, then people the viewer
+    follows, their followers, other local authors, and remote authors last.
+    """
+    q = normalize_search(query)
+    if not q:
+        return []
+    viewer = viewer if viewer is not None and viewer.is_authenticated else None
+
+    version = cache.get(SEARCH_VERSION_KEY, "")
+    key_source = f"{version}:{viewer.pk if viewer else ''}:{limit}:{q}"
+    key = "author-search:" + hashlib.sha1(key_source.encode()).hexdigest()
+    cached = cache.get(key)
+    metrics.cache_lookup("author_search", cached is not None)
+    if cached is not None:
+        return cached
+
+    authors = _candidates(q, version)
+    buckets = _relationship_buckets(viewer, authors)
+
+    def rank(a):
+        if q in (a.search_name, a.search_username):
+            quality = 0
+        elif a.search_name.startswith(q) or a.search_username.startswith(q):
+            quality = 1
+        else:
+            quality = 2
+        return (quality, buckets[a.pk], len(a.search_name), a.search_name)
+
+    results = [
+        {"id": str(a.pk), "display_name": a.display_name}
+        for a in sorted(authors, key=rank)[:limit]
+    ]
+    cache.set(key, results, RESULT_TTL)
+    return results
+
+
+def find_author(query, viewer=None):
+    """Return the best author whose display name equals ``query``, or ``None``."""
+    q = normalize_search(query)
+    if not q:
+        return None
+    matches = list(Author.objects.filter(search_name=q).only("pk", "host")[:CANDIDATES])
+    if not matches:
+        return None
+    buckets = _relationship_buckets(
+        viewer if viewer is not None and viewer.is_authenticated else None, matches
+    )
+    return min(matches, key=lambda a: buckets[a.pk])
+
+
+def visible_entries(viewer):
+    """Entries ``viewer`` may find: their own, public, unlisted from people they follow, and friends-only from friends."""
+    entries = Entry.objects.filter(is_deleted=False).exclude(visibility="DELETED")
+    if viewer is None or not viewer.is_authenticated:
+        return entries.filter(visibility="PUBLIC")
+    following_ids, follower_ids = follow_id_sets(viewer.pk)
+    return entries.filter(
+        Q(author=viewer)
+        | Q(visibility="PUBLIC")
+        | Q(visibility="UNLISTED", author_id__in=following_ids)
+        | Q(visibility="FRIENDS", author_id__in=following_ids & follower_ids)
+    )
+
+
+def search_entry_ids(query, viewer=None):
+    """Return the ids of entries matching ``query`` that ``viewer`` may see, best first."""
+    entries = visible_entries(viewer)
+    if not fulltext.available():
+        # No index on this backend: fall back to a scan, newest first.
+        text = (Q(title__icontains=query) | Q(description__icontains=query)
+                | (Q(content__icontains=query) & ~Q(contentType__endswith="base64")))
+        return list(
+            entries.filter(text).order_by("-created_at")
+            .values_list("id", flat=True)[:fulltext.MAX_MATCHES]
+        )
+
+    ranked = fulltext.match_ids(query)
+    if not ranked:
+        return []
+    allowed = set(entries.filter(id__in=ranked).values_list("id", flat=True))
+    return [entry_id for entry_id in ranked if entry_id in allowed]
@@ -6,3 +6,6 @@ from .entrydetailserializer import EntryDetailSerializer
 from .commentserializer import CommentSerializer
 from .likeserializer import LikeSerializer
 from .inboxserializer import InboxItemSerializer
+from .plainserializers import (
+    PlainAuthorSerializer, PlainCommentSerializer, PlainEntrySerializer, PlainLikeSerializer,
+)
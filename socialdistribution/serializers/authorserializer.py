@@ -1,10 +1,36 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-07-09
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import Author
 from urllib.parse import quote
 from django.conf import settings
+from socialdistribution import author_cache
+
+# Model columns each output field reads; used to narrow queries for ?fields=.
+FIELD_COLUMNS = {
+    "type": (),
+    "id": ("id",),
+    "host": ("host",),
+    "displayName": ("display_name",),
+    "github": ("github_link",),
+    "profileImage": ("profile_image",),
+    "web": ("id",),
+}
+
+
+class AuthorListSerializer(ProfiledListSerializer):
+    """Serve a list of authors from the representation cache in one round trip."""
+
+    def to_representation(self, data):
+        authors = list(data.all() if hasattr(data, "all") else data)
+        if any(author.get_deferred_fields() for author in authors):
+            return super().to_representation(authors)
+        return [self.child.trim(item) for item in author_cache.for_authors(authors)]
+
+
+class AuthorSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    """Author representation; pass ``fields=[...]`` to emit only those keys."""
 
-class AuthorSerializer(serializers.ModelSerializer):
     type        = serializers.SerializerMethodField()
     id          = serializers.SerializerMethodField()
     host        = serializers.SerializerMethodField()
@@ -16,6 +42,26 @@ class AuthorSerializer(serializers.ModelSerializer):
     class Meta:
         model  = Author
         fields = ["type", "id", "host", "displayName", "github", "profileImage", "web"]
+        list_serializer_class = AuthorListSerializer
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+    def to_representation(self, instance):
+        if instance.get_deferred_fields():
+            # Narrowed by ``fields``; read only the columns that were loaded.
+            return super().to_representation(instance)
+        return self.trim(author_cache.for_author(instance))
+
+    def trim(self, data):
+        """Drop the keys left out by ``fields``."""
+        if len(data) == len(self.fields):
+            return data
+        return {name: data[name] for name in self.fields}
 
     def get_type(self, obj):
         return "author"
@@ -1,9 +1,10 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import Author
 from django.conf import settings
 
-class AuthorSignupSerializer(serializers.ModelSerializer):
+class AuthorSignupSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     password = serializers.CharField(
         write_only = True,
         min_length = 8,
@@ -16,6 +17,7 @@ class AuthorSignupSerializer(serializers.ModelSerializer):
     
     class Meta:
         model = Author
+        list_serializer_class = ProfiledListSerializer
         fields = ["username", "display_name", "password"]
 
     def create(self, validated_data):
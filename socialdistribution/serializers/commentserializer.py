@@ -1,13 +1,14 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from django.conf import settings
 from socialdistribution.models import Comment, Like
-from .authorserializer import AuthorSerializer
+from socialdistribution import author_cache
 from urllib.parse import quote
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     type = serializers.SerializerMethodField()
-    author = AuthorSerializer(read_only=True)
+    author = serializers.SerializerMethodField()
     comment = serializers.CharField()
     contentType = serializers.CharField(source='content_type')
     published = serializers.DateTimeField(source='created_at', format="%Y-%m-%dT%H:%M:%S%z")
@@ -18,6 +19,7 @@ class CommentSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Comment
+        list_serializer_class = ProfiledListSerializer
         fields = [
             'type',
             'author',
@@ -32,6 +34,9 @@ class CommentSerializer(serializers.ModelSerializer):
     def get_type(self, obj):
         return 'comment'
 
+    def get_author(self, obj):
+        return author_cache.author_of(obj)
+
 
     def get_id(self, obj):
         return obj.id
@@ -50,15 +55,15 @@ class CommentSerializer(serializers.ModelSerializer):
 
     def get_likes(self, obj):
         qs = Like.objects.filter(comment=obj).order_by("-created_at")
-        count = qs.count()
+        count = obj.like_count
         size = 5
+        likes = list(qs[:size])
+        authors = author_cache.for_ids(l.author_id for l in likes)
         data = []
-        for l in qs[:size]:
-            host = l.author.host.rstrip('/')
-            id_host = host if host.endswith('/api') else f"{host}/api"
+        for l in likes:
             data.append({
                 'type': 'like',
-                'author': AuthorSerializer(l.author).data,
+                'author': authors[l.author_id],
                 'published': l.created_at.isoformat(),
                 'id': l.id,
                 'object': self.get_id(obj)
@@ -1,10 +1,13 @@
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from django.conf import settings
 from socialdistribution.models import Entry, Comment, Like
+from socialdistribution import author_cache
+from socialdistribution.rendering import entry_html
 from .authorserializer import AuthorSerializer
 from urllib.parse import quote
 
-class EntryDetailSerializer(serializers.ModelSerializer):
+class EntryDetailSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     type = serializers.SerializerMethodField()
     id = serializers.SerializerMethodField()
     web = serializers.SerializerMethodField()
@@ -19,6 +22,7 @@ class EntryDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Entry
+        list_serializer_class = ProfiledListSerializer
         fields = [
             "type",
             "title",
@@ -37,6 +41,15 @@ class EntryDetailSerializer(serializers.ModelSerializer):
     def get_type(self, obj):
         return "entry"
 
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # ``?render=html`` adds the server-rendered content for clients that
+        # would otherwise parse markdown themselves.
+        request = self.context.get("request")
+        if request is not None and request.GET.get("render") == "html":
+            data["contentHtml"] = entry_html(instance)
+        return data
+
     def create(self, validated_data):
         return super().create(validated_data)
 
@@ -61,20 +74,23 @@ class EntryDetailSerializer(serializers.ModelSerializer):
     def get_comments(self, obj):
         qs = Comment.objects.filter(entry=obj).order_by("-created_at")
         entry_path = self._entry_path(obj)
-        count = qs.count()
+        count = obj.comment_count
         size = 5
+        comments = list(qs[:size])
+        comment_likes = {
+            c.id: list(Like.objects.filter(comment=c).order_by("-created_at")[:5]) for c in comments
+        }
+        authors = author_cache.for_ids([
+            *(c.author_id for c in comments),
+            *(l.author_id for likes in comment_likes.values() for l in likes),
+        ])
         data = []
-        for c in qs[:size]:
-            host = c.author.host.rstrip('/')
-            id_host = host if host.endswith('/api') else f"{host}/api"
-            like_qs = Like.objects.filter(comment=c).order_by("-created_at")
+        for c in comments:
             like_data = []
-            for l in like_qs[:5]:
-                l_host = l.author.host.rstrip('/')
-                l_id_host = l_host if l_host.endswith('/api') else f"{l_host}/api"
+            for l in comment_likes[c.id]:
                 like_data.append({
                     "type": "like",
-                    "author": AuthorSerializer(l.author).data,
+                    "author": authors[l.author_id],
                     "published": l.created_at.isoformat(),
                     "id": l.id,
                     "object": c.id,
@@ -82,7 +98,7 @@ class EntryDetailSerializer(serializers.ModelSerializer):
 
             data.append({
                 "type": "comment",
-                "author": AuthorSerializer(c.author).data,
+                "author": authors[c.author_id],
                 "comment": c.comment,
                 "contentType": "text/plain",
                 "published": c.created_at.isoformat(),
@@ -95,7 +111,7 @@ class EntryDetailSerializer(serializers.ModelSerializer):
                     "web": f"{settings.BASE_URL}/authors/{obj.author.uuid}/entries/{entry_path}/",
                     "page_number": 1,
                     "size": 5,
-                    "count": like_qs.count(),
+                    "count": c.like_count,
                     "src": like_data,
                 },
             })
@@ -116,15 +132,15 @@ class EntryDetailSerializer(serializers.ModelSerializer):
     def get_likes(self, obj):
         qs = Like.objects.filter(entry=obj).order_by("-created_at")
         entry_path = self._entry_path(obj)
-        count = qs.count()
+        count = obj.like_count
         size = 5
+        likes = list(qs[:size])
+        authors = author_cache.for_ids(l.author_id for l in likes)
         data = []
-        for l in qs[:size]:
-            host = l.author.host.rstrip('/')
-            id_host = host if host.endswith('/api') else f"{host}/api"
+        for l in likes:
             data.append({
                 "type": "like",
-                "author": AuthorSerializer(l.author).data,
+                "author": authors[l.author_id],
                 "published": l.created_at.isoformat(),
                 "id": l.id,
                 "object": obj.id,
@@ -1,8 +1,9 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import Entry
 
-class EntrySerializer(serializers.ModelSerializer):
+class EntrySerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     """
     Serializer for the Entry model.
 
@@ -13,6 +14,7 @@ class EntrySerializer(serializers.ModelSerializer):
     """
     class Meta:
         model  = Entry
+        list_serializer_class = ProfiledListSerializer
         # fields = [
         #     "id",
         #     "title",
@@ -1,8 +1,9 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import FollowRequest, Author
 
-class FollowRequestSerializer(serializers.Serializer):
+class FollowRequestSerializer(ProfiledSerializerMixin, serializers.Serializer):
     """
     Serializer for FollowRequest objects in Inbox API, independent of model fields.
     """
@@ -12,6 +13,9 @@ class FollowRequestSerializer(serializers.Serializer):
     object  = serializers.JSONField(source='object_data')
     state   = serializers.SerializerMethodField()
 
+    class Meta:
+        list_serializer_class = ProfiledListSerializer
+
     def get_type(self, obj):
         return 'follow'
         
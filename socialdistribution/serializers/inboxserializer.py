@@ -1,12 +1,16 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import FollowRequest, Like, Comment, Entry
 from socialdistribution.serializers import EntryDetailSerializer, FollowRequestSerializer, LikeSerializer, CommentSerializer
 
-class InboxItemSerializer(serializers.Serializer):
+class InboxItemSerializer(ProfiledSerializerMixin, serializers.Serializer):
     """
     Polymorphic serializer for inbox items.
     """
+    class Meta:
+        list_serializer_class = ProfiledListSerializer
+
     def to_representation(self, instance):
         if isinstance(instance, Entry):
             return EntryDetailSerializer(instance, context=self.context).data
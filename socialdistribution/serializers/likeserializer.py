@@ -1,20 +1,24 @@
 # The following written with completion assistance from Microsoft, Copilot/ ChatGPT, OpenAI 2025-06-18
 
 from rest_framework import serializers
+from socialdistribution.instrumentation import ProfiledListSerializer, ProfiledSerializerMixin
 from socialdistribution.models import Like, Entry, Author, Comment
 from django.shortcuts import get_object_or_404
-from .authorserializer import AuthorSerializer
+from socialdistribution import author_cache
 
-class LikeSerializer(serializers.Serializer):
+class LikeSerializer(ProfiledSerializerMixin, serializers.Serializer):
     type      = serializers.CharField()
     author    = serializers.SerializerMethodField()
     published = serializers.DateTimeField(source='created_at', read_only=True)
     id        = serializers.CharField(required=False)
     object    = serializers.CharField()
 
+    class Meta:
+        list_serializer_class = ProfiledListSerializer
+
     def get_author(self, obj):
         """Return the full serialized author object."""
-        return AuthorSerializer(obj.author, context=self.context).data
+        return author_cache.author_of(obj)
 
     def validate(self, attrs):
         """
@@ -75,7 +79,6 @@ class LikeSerializer(serializers.Serializer):
         return like
 
     def to_representation(self, instance):
-        author = instance.author
         # Choose object target
         if instance.object_url:
             object_url = instance.object_url
@@ -88,7 +91,7 @@ class LikeSerializer(serializers.Serializer):
 
         return {
             'type': 'like',
-            'author': AuthorSerializer(author, context=self.context).data,
+            'author': author_cache.author_of(instance),
             'published': instance.created_at.isoformat(),
             'id':        instance.id,
             'object':    object_url,
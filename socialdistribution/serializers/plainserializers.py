@@ -0,0 +1,236 @@
+"""
+Read-only serializers for the list endpoints.
+
+Each class produces exactly what its DRF counterpart does (``AuthorSerializer``,
+``LikeSerializer``, ``CommentSerializer``, ``EntryDetailSerializer``) but builds
+the dicts straight from ``.values()`` rows: no model instances, no field
+objects and no nested serializer per object.  The newest five comments and
+likes embedded in comments and entries are fetched for the whole page at once,
+with one window-function query per level, so a page costs a fixed number of
+queries however many objects it holds.
+
+Usage mirrors DRF::
+
+    rows, page_info = paginate(request, PlainCommentSerializer.rows(qs))
+    data = PlainCommentSerializer(rows, context={"request": request}).data
+"""
+from urllib.parse import quote
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+from socialdistribution import author_cache, instrumentation
+from socialdistribution.models import Comment, Like
+from socialdistribution.rendering import content_html
+
+# Newest comments and likes embedded in an entry or comment, as in the DRF serializers.
+EMBEDDED = 5
+# ``published`` format of the DRF serializers' DateTimeFields.
+PUBLISHED_FORMAT = "%Y-%m-%dT%H:%M:%S%z"
+
+AUTHOR_COLUMNS = author_cache.COLUMNS
+
+
+def _author_columns(prefix):
+    return tuple(f"{prefix}{column}" for column in AUTHOR_COLUMNS)
+
+
+def _author(row, prefix, base):
+    return author_cache.build(row, prefix, base)
+
+
+def _published(value):
+    return timezone.localtime(value).strftime(PUBLISHED_FORMAT) if value else None
+
+
+def _entry_path(entry_id, base):
+    entry_id = str(entry_id).rstrip("/")
+    if entry_id.startswith(f"{base}/api/"):
+        return entry_id.split("/")[-1]
+    return quote(entry_id, safe="")
+
+
+def _newest(queryset, partition, columns):
+    """Group the newest ``EMBEDDED`` rows of ``queryset`` per ``partition`` value."""
+    ranked = queryset.annotate(rank=Window(
+        RowNumber(), partition_by=F(partition), order_by=[F("created_at").desc(), F("pk").desc()],
+    )).filter(rank__lte=EMBEDDED).order_by(partition, "rank").values(partition, *columns)
+    groups = {}
+    for row in ranked:
+        groups.setdefault(row[partition], []).append(row)
+    return groups
+
+
+class PlainSerializer:
+    """Serialize ``.values()`` rows from ``rows()``; read ``.data`` for the list."""
+
+    columns = ()
+
+    def __init__(self, rows, context=None):
+        self.instance = list(rows)
+        self.context = context or {}
+
+    @classmethod
+    def rows(cls, queryset):
+        return queryset.values(*cls.columns)
+
+    @property
+    def data(self):
+        base = settings.BASE_URL.rstrip("/")
+        with instrumentation.serializing():
+            return [self.represent(row, base) for row in self.instance]
+
+
+class PlainAuthorSerializer(PlainSerializer):
+    columns = AUTHOR_COLUMNS
+
+    def represent(self, row, base):
+        return _author(row, "", base)
+
+
+class PlainLikeSerializer(PlainSerializer):
+    columns = ("id", "created_at", "object_url", "comment_id", "entry_id", *_author_columns("author__"))
+
+    def represent(self, row, base):
+        return {
+            "type": "like",
+            "author": _author(row, "author__", base),
+            "published": row["created_at"].isoformat(),
+            "id": row["id"],
+            "object": row["object_url"] or row["comment_id"] or row["entry_id"],
+        }
+
+
+# Columns of an embedded like; the object is the entry or comment it is nested in.
+EMBEDDED_LIKE_COLUMNS = ("id", "created_at", *_author_columns("author__"))
+
+
+def _embedded_like(row, object_id, base):
+    return {
+        "type": "like",
+        "author": _author(row, "author__", base),
+        "published": row["created_at"].isoformat(),
+        "id": row["id"],
+        "object": object_id,
+    }
+
+
+class PlainCommentSerializer(PlainSerializer):
+    columns = (
+        "id", "comment", "content_type", "created_at", "like_count", "entry_id",
+        "entry__author__uuid", *_author_columns("author__"),
+    )
+
+    @property
+    def data(self):
+        self.likes = _newest(
+            Like.objects.filter(comment_id__in=[r["id"] for r in self.instance]),
+            "comment_id", EMBEDDED_LIKE_COLUMNS,
+        ) if self.instance else {}
+        return super().data
+
+    def represent(self, row, base):
+        comment_id = row["id"]
+        entry_path = f"{row['entry__author__uuid']}/entries/{_entry_path(row['entry_id'], base)}"
+        return {
+            "type": "comment",
+            "author": _author(row, "author__", base),
+            "comment": row["comment"],
+            "contentType": row["content_type"],
+            "published": _published(row["created_at"]),
+            "id": comment_id,
+            "entry": row["entry_id"],
+            "likes": {
+                "type": "likes",
+                "web": f"{base}/authors/{entry_path}/",
+                "id": f"{base}/api/authors/{entry_path}/comments/{quote(comment_id, safe='')}/likes/",
+                "page_number": 1,
+                "size": EMBEDDED,
+                "count": row["like_count"],
+                "src": [_embedded_like(l, comment_id, base) for l in self.likes.get(comment_id, ())],
+            },
+        }
+
+
+class PlainEntrySerializer(PlainSerializer):
+    columns = (
+        "id", "title", "description", "contentType", "content", "content_html", "created_at",
+        "visibility", "like_count", "comment_count", "author__uuid", *_author_columns("author__"),
+    )
+    comment_columns = ("id", "comment", "created_at", "like_count", *_author_columns("author__"))
+
+    @property
+    def data(self):
+        ids = [r["id"] for r in self.instance]
+        self.comments = _newest(
+            Comment.objects.filter(entry_id__in=ids), "entry_id", self.comment_columns
+        ) if ids else {}
+        comment_ids = [c["id"] for group in self.comments.values() for c in group]
+        self.comment_likes = _newest(
+            Like.objects.filter(comment_id__in=comment_ids), "comment_id", EMBEDDED_LIKE_COLUMNS
+        ) if comment_ids else {}
+        self.likes = _newest(
+            Like.objects.filter(entry_id__in=ids), "entry_id", EMBEDDED_LIKE_COLUMNS
+        ) if ids else {}
+        request = self.context.get("request")
+        self.render_html = request is not None and request.GET.get("render") == "html"
+        return super().data
+
+    def represent(self, row, base):
+        entry_id = row["id"]
+        author_uuid = row["author__uuid"]
+        entry_path = _entry_path(entry_id, base)
+        entry_web = f"{base}/authors/{author_uuid}/entries/{entry_path}/"
+        host = row["author__host"].rstrip("/")
+        id_host = host if host.endswith("/api") else f"{host}/api"
+        comments = [{
+            "type": "comment",
+            "author": _author(c, "author__", base),
+            "comment": c["comment"],
+            "contentType": "text/plain",
+            "published": c["created_at"].isoformat(),
+            "id": c["id"],
+            "entry": entry_id,
+            "likes": {
+                "type": "likes",
+                "id": f"{base}/api/authors/{author_uuid}/entries/{entry_path}/comments/{quote(c['id'], safe='')}/likes",
+                "web": entry_web,
+                "page_number": 1,
+                "size": EMBEDDED,
+                "count": c["like_count"],
+                "src": [_embedded_like(l, c["id"], base) for l in self.comment_likes.get(c["id"], ())],
+            },
+        } for c in self.comments.get(entry_id, ())]
+        data = {
+            "type": "entry",
+            "title": row["title"],
+            "id": entry_id,
+            "web": entry_web,
+            "description": row["description"],
+            "contentType": row["contentType"],
+            "content": row["content"],
+            "author": _author(row, "author__", base),
+            "comments": {
+                "type": "comments",
+                "web": entry_web,
+                "id": f"{id_host}/authors/{author_uuid}/entries/{entry_path}/comments",
+                "page_number": 1,
+                "size": EMBEDDED,
+                "count": row["comment_count"],
+                "src": comments,
+            },
+            "likes": {
+                "type": "likes",
+                "web": entry_web,
+                "id": f"{id_host}/authors/{author_uuid}/entries/{entry_path}/likes",
+                "page_number": 1,
+                "size": EMBEDDED,
+                "count": row["like_count"],
+                "src": [_embedded_like(l, entry_id, base) for l in self.likes.get(entry_id, ())],
+            },
+            "published": _published(row["created_at"]),
+            "visibility": row["visibility"],
+        }
+        if self.render_html:
+            data["contentHtml"] = content_html(row["contentType"], row["content"], row["content_html"])
+        return data
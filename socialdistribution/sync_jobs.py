@@ -0,0 +1,125 @@
+"""
+Background sync jobs for remote nodes.
+
+Adding a node used to start four sync threads on every save of the node,
+and the admin saves a new node three times, so one new node could run a
+dozen overlapping syncs.  Each sync now has a ``NodeSyncJob`` row per node
+and kind, and a run only starts when its row can be moved from an idle
+state to ``queued`` with one conditional UPDATE:
+
+- a request for a job that is already queued or running sets ``rerun``,
+  so that job runs once more when it finishes rather than in parallel,
+- a job left ``running`` for ``STALE_AFTER`` (its process died) may be
+  claimed again,
+- runs start after the surrounding transaction commits, so they see the
+  node that was just saved,
+- deleting a node deletes its jobs, and a run in progress then just stops.
+
+``schedule()`` is called for new nodes and for saves that change the
+node's URL, and by the admin's resync actions.
+"""
+import logging
+import threading
+from datetime import timedelta
+from functools import partial
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from socialdistribution.models import NodeSyncJob
+
+logger = logging.getLogger(__name__)
+
+# A job still running after this long is assumed dead and may be claimed again.
+STALE_AFTER = timedelta(hours=1)
+
+PULL_KINDS = (NodeSyncJob.ENTRIES, NodeSyncJob.COMMENTS, NodeSyncJob.LIKES)
+ALL_KINDS = (NodeSyncJob.BACKFILL, *PULL_KINDS)
+
+
+def _runner(kind):
+    # Looked up on each run, so tests can patch the functions in utils.
+    from socialdistribution import utils
+
+    return {
+        NodeSyncJob.BACKFILL: utils.send_all_to_new_remote,
+        NodeSyncJob.ENTRIES: utils.sync_remote_entries,
+        NodeSyncJob.COMMENTS: utils.sync_remote_comments,
+        NodeSyncJob.LIKES: utils.sync_remote_likes,
+    }[kind]
+
+
+def schedule(node, kinds=ALL_KINDS):
+    """
+    Request a run of each of ``kinds`` for ``node``.
+
+    Return the kinds that were started; the others were already queued or
+    running and will run again once they finish.
+    """
+    started = []
+    for kind in kinds:
+        job, _ = NodeSyncJob.objects.get_or_create(node=node, kind=kind)
+        while True:
+            now = timezone.now()
+            stale = now - STALE_AFTER
+            claimable = (~Q(state__in=NodeSyncJob.ACTIVE_STATES)
+                         | Q(state=NodeSyncJob.RUNNING, started_at__lt=stale))
+            if NodeSyncJob.objects.filter(claimable, pk=job.pk).update(
+                state=NodeSyncJob.QUEUED, rerun=False, requested_at=now
+            ):
+                transaction.on_commit(partial(_start, job.pk))
+                started.append(kind)
+                break
+            if NodeSyncJob.objects.filter(
+                pk=job.pk, state__in=NodeSyncJob.ACTIVE_STATES
+            ).update(rerun=True, requested_at=now):
+                break
+            if not NodeSyncJob.objects.filter(pk=job.pk).exists():
+                # The node (and with it the job) was deleted meanwhile.
+                break
+            # The job finished between the two updates; try to claim it again.
+    return started
+
+
+def _start(job_id):
+    threading.Thread(target=_run_in_thread, args=(job_id,), daemon=True).start()
+
+
+def _run_in_thread(job_id):
+    try:
+        run_job(job_id)
+    finally:
+        connection.close()
+
+
+def run_job(job_id):
+    """Run a queued job, then again for as long as reruns keep being requested."""
+    while True:
+        if not NodeSyncJob.objects.filter(pk=job_id, state=NodeSyncJob.QUEUED).update(
+            state=NodeSyncJob.RUNNING, started_at=timezone.now()
+        ):
+            return
+        job = NodeSyncJob.objects.select_related("node").filter(pk=job_id).first()
+        if job is None:
+            return
+        error = ""
+        try:
+            _runner(job.kind)(job.node)
+        except Exception as exc:
+            logger.exception("Sync job %s failed", job)
+            error = f"{type(exc).__name__}: {exc}"
+
+        done = {"runs": F("runs") + 1, "finished_at": timezone.now(), "last_error": error}
+        while True:
+            # Each update is conditional on ``rerun``, so a request made while
+            # finishing is either picked up here or sees the job idle.
+            if NodeSyncJob.objects.filter(pk=job_id, rerun=True).update(
+                state=NodeSyncJob.QUEUED, rerun=False, **done
+            ):
+                break
+            if NodeSyncJob.objects.filter(pk=job_id, rerun=False).update(
+                state=NodeSyncJob.FAILED if error else NodeSyncJob.SUCCEEDED, **done
+            ):
+                return
+            if not NodeSyncJob.objects.filter(pk=job_id).exists():
+                # The node was deleted while the job ran, taking the job with it.
+                return
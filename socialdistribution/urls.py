@@ -63,6 +63,7 @@ urlpatterns = [
     # Other APIs
     path("profile/<path:pk>/relationships/", views.RelationshipsPageView.as_view(), name="relationships_page"),
     # path("authors/<path:pk>/", views.ProfilePageView.as_view(), name = "profile_page"),
+    path("api/profile/stats/", views.BulkProfileStatsAPIView.as_view(), name="api_profile_stats_bulk"),
     path("api/profile/<path:pk>/stats/", views.ProfileStatsAPIView.as_view(), name="api_profile_stats"),
     path("api/profile/edit/", views.AuthorProfileEditAPIView.as_view(), name="api_profile_edit"),
 
@@ -87,5 +88,6 @@ urlpatterns = [
 
     path("search/authors/", views.AuthorSearchView.as_view(), name="author_search"),
     path("api/author_autocomplete/", views.author_autocomplete, name="author_autocomplete"),
+    path("api/search/entries/", views.EntrySearchAPIView.as_view(), name="api_entry_search"),
     path("api/sync_remote_authors/", views.sync_remote_authors_view, name="sync_remote_authors"),
 ]
\ No newline at end of file
@@ -10,8 +10,10 @@ from requests.auth import HTTPBasicAuth
 from urllib.parse import urlparse
 from django.utils.dateparse import parse_datetime
 from django.utils import timezone
+import time
 import uuid
-import threading
+from . import metrics, outbound, ratelimit
+from .identity import AuthorIdentityMap
 
 def _remote_nodes():
     """Yield (base_url, auth) for each configured remote node."""
@@ -40,66 +42,17 @@ def _get_auth_for_url(url: str):
             return auth
     return None
 
-def get_or_create_remote_author(data, default_host=None):
-    """Create or update a local Author entry from remote data."""
-    author_url = data.get("id") if isinstance(data, dict) else None
-    if not author_url:
-        return None
-
-    author_fqid = str(author_url).rstrip("/")
-    author_uuid = author_fqid.split("/")[-1]
-
-    if default_host:
-        base = default_host.rstrip("/")
-    else:
-        parsed = urlparse(author_url)
-        base = f"{parsed.scheme}://{parsed.netloc}"
-
-    host = base.rstrip('/')
-    if host.endswith('/api'):
-        host = host + '/'
-    else:
-        host = host + '/api/'
-    defaults = {
-        "username": author_uuid[:60],
-        "display_name": data.get("displayName", author_uuid),
-        "host": host,
-        "profile_image": data.get("profileImage", data.get("profile_image", "")),
-        "github_link": data.get("github", ""),
-        "uuid": author_uuid,
-    }
-
-    author = Author.objects.filter(uuid=author_uuid).first()
-    if not author:
-        author = Author.objects.filter(id=author_fqid).first()
+def get_or_create_remote_author(data, default_host=None, authors=None):
+    """
+    Create or update a local Author entry from remote data.
 
-    if author is None:
-        author = Author(id=author_fqid, **defaults)
-        author.set_unusable_password()
-        author.is_approved = True
-        author.save()
-        return author
-
-    updates = []
-    local_host = settings.BASE_URL.rstrip('/') + '/api/'
-    if author.host != host and author.host.rstrip('/') != local_host.rstrip('/'):
-        author.host = host
-        updates.append("host")
-    display_name = data.get("displayName")
-    profile_image = data.get("profileImage") or data.get("profile_image")
-    github_link = data.get("github")
-    if display_name and author.display_name != display_name:
-        author.display_name = display_name
-        updates.append("display_name")
-    if profile_image and author.profile_image != profile_image:
-        author.profile_image = profile_image
-        updates.append("profile_image")
-    if github_link and author.github_link != github_link:
-        author.github_link = github_link
-        updates.append("github")
-    if updates:
-        author.save(update_fields=updates)
-    return author
+    Pass the batch's ``AuthorIdentityMap`` as ``authors`` to reuse earlier
+    lookups; without one the author is resolved and saved on its own.
+    """
+    if authors is not None:
+        return authors.resolve(data, default_host=default_host)
+    with AuthorIdentityMap() as authors:
+        return authors.resolve(data, default_host=default_host)
 
 
 def sync_remote_authors(remote_node):
@@ -109,167 +62,94 @@ def sync_remote_authors(remote_node):
     if remote_node.username and remote_node.password:
         auth = HTTPBasicAuth(remote_node.username, remote_node.password)
     try:
-        res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
+        res = ratelimit.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
         res.raise_for_status()
         authors = res.json().get("authors", [])
     except requests.RequestException:
         print(f"Failed to fetch authors from {base}")
         return []
 
-    for item in authors:
-        get_or_create_remote_author(item, default_host=base)
+    with AuthorIdentityMap() as identities:
+        identities.prefetch(authors, default_host=base)
+        for item in authors:
+            if get_or_create_remote_author(item, default_host=base, authors=identities):
+                metrics.sync_items.inc(node=urlparse(base).netloc, kind="authors")
+    metrics.sync_last_run.set(time.time(), node=urlparse(base).netloc, kind="authors")
     return authors
 
 
-def broadcast_entry_to_remotes(entry_data):
-    def send_to_author(author, base, auth):
-        author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
-        inbox_url = f"{base}api/authors/{author_id}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=entry_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=auth,
-            )
-        except requests.RequestException:
-            pass
+def _send_to_remote_authors(payloads, lane, skip_netloc=""):
+    """
+    Queue ``payloads`` for the inbox of every author on every remote node.
 
+    Each node's author list is fetched once for all the payloads; nodes on
+    ``skip_netloc`` are left out.
+    """
     for base, auth in _remote_nodes():
+        if skip_netloc and urlparse(base).netloc == skip_netloc:
+            continue
         try:
-            res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
+            # Often on a request thread: skip a node on hold rather than wait for it.
+            res = ratelimit.get(f"{base}api/authors/?size=100", max_wait=0, timeout=5, auth=auth)
             res.raise_for_status()
             authors = res.json().get('authors', [])
         except requests.RequestException:
             continue
         for author in authors:
-            threading.Thread(target=send_to_author, args=(author, base, auth)).start()
+            author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
+            inbox_url = f"{base}api/authors/{author_id}/inbox/"
+            for data in payloads:
+                outbound.enqueue(inbox_url, data, auth, lane=lane)
 
-def broadcast_like_to_remotes(like_data):
-    """Send a like object to all remote node inboxes in parallel."""
+def broadcast_entry_to_remotes(entry_data):
+    """Send an entry to all remote node inboxes."""
+    _send_to_remote_authors([entry_data], outbound.LIVE)
 
-    def send_to_author(author, base, auth):
-        author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
-        inbox_url = f"{base}api/authors/{author_id}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=like_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=auth,
-            )
-        except requests.RequestException:
-            pass
+def broadcast_entries_to_remotes(entries_data):
+    """
+    Send several entries to every remote inbox in one pass.
 
-    for base, auth in _remote_nodes():
-        try:
-            res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
-            res.raise_for_status()
-            authors = res.json().get('authors', [])
-        except requests.RequestException:
-            continue
+    Each node's author list is fetched once for the whole batch rather than
+    once per entry.
+    """
+    if not entries_data:
+        return
+    _send_to_remote_authors(entries_data, outbound.LIVE)
 
-        for author in authors:
-            threading.Thread(target=send_to_author, args=(author, base, auth)).start()
+def broadcast_like_to_remotes(like_data):
+    """Send a like object to all remote node inboxes."""
+    _send_to_remote_authors([like_data], outbound.LIVE)
 
 def broadcast_comment_to_remotes(comment_data):
-    """Send a comment object to all remote node inboxes in parallel."""
+    """Send a comment object to all remote node inboxes."""
     origin_host = ""
     author = comment_data.get("author")
     if isinstance(author, dict):
         origin_host = author.get("host") or author.get("id", "")
     if not origin_host:
         origin_host = comment_data.get("id", "")
-    origin_netloc = urlparse(origin_host).netloc
-
-    def send_to_author(author, base, auth):
-        author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
-        inbox_url = f"{base}api/authors/{author_id}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=comment_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=auth,
-            )
-        except requests.RequestException:
-            pass
-
-    for base, auth in _remote_nodes():
-        # Skip sending back to the originating host
-        if origin_netloc and urlparse(base).netloc == origin_netloc:
-            continue
-        try:
-            res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
-            res.raise_for_status()
-            authors = res.json().get('authors', [])
-        except requests.RequestException:
-            continue
-
-        for author in authors:
-            threading.Thread(target=send_to_author, args=(author, base, auth)).start()
+    # Skip sending back to the originating host
+    _send_to_remote_authors([comment_data], outbound.LIVE, skip_netloc=urlparse(origin_host).netloc)
 
 def broadcast_delete_to_remotes(entry_data):
     """Notify remote nodes that an entry has been deleted."""
 
     data = dict(entry_data)
     data["visibility"] = "DELETED"
-
-    def send_to_author(author, base, auth):
-        author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
-        inbox_url = f"{base}api/authors/{author_id}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=auth,
-            )
-        except requests.RequestException:
-            pass
-
-    for base, auth in _remote_nodes():
-        try:
-            res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
-            res.raise_for_status()
-            authors = res.json().get('authors', [])
-        except requests.RequestException:
-            continue
-
-        for author in authors:
-            threading.Thread(target=send_to_author, args=(author, base, auth)).start()
+    _send_to_remote_authors([data], outbound.INTERACTIVE)
 
 def broadcast_follow_to_remotes(follow_data):
-    def send_to_author(author, base, auth):
-        author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
-        inbox_url = f"{base}api/authors/{author_id}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=follow_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=auth,
-            )
-        except requests.RequestException:
-            pass
-
-    for base, auth in _remote_nodes():
-        try:
-            res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
-            res.raise_for_status()
-            authors = res.json().get('authors', [])
-        except requests.RequestException:
-            continue
-        for author in authors:
-            threading.Thread(target=send_to_author, args=(author, base, auth)).start()
+    _send_to_remote_authors([follow_data], outbound.INTERACTIVE)
 
 def send_all_to_new_remote(remote_node):
-    """Send all local public entries, comments and likes to a new remote."""
+    """
+    Send all local public entries, comments and likes to a new remote.
+
+    The POSTs go on the outbound backfill lane, so they yield to live
+    traffic.  This returns once every one has been tried, so the sync job
+    stays running until the backfill is done, and raises
+    ``outbound.DeliveryFailed`` if any failed.
+    """
     base = remote_node.base_url.rstrip('/') + '/'
     auth = None
     if remote_node.username and remote_node.password:
@@ -285,50 +165,27 @@ def send_all_to_new_remote(remote_node):
         Q(comment__entry__visibility="PUBLIC")
         )
 
+    batch = outbound.Batch()
     for author in authors:
         author_id = str(author.get('id', '')).rstrip('/').split('/')[-1]
         inbox_url = f"{base}api/authors/{author_id}/inbox/"
 
         for entry in entries:
-            entry_data = EntryDetailSerializer(entry).data
-            try:
-                requests.post(
-                    inbox_url,
-                    json=entry_data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5,
-                    auth=auth,
-                )
-            except requests.RequestException:
-                continue
+            outbound.enqueue(inbox_url, EntryDetailSerializer(entry).data, auth, lane=outbound.BULK, batch=batch)
 
         for comment in comments:
-            comment_data = CommentSerializer(comment).data
-            try:
-                requests.post(
-                    inbox_url,
-                    json=comment_data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5,
-                    auth=auth,
-                )
-            except requests.RequestException:
-                continue
+            outbound.enqueue(inbox_url, CommentSerializer(comment).data, auth, lane=outbound.BULK, batch=batch)
 
         for like in likes:
-            like_data = LikeSerializer(like).data
-            try:
-                requests.post(
-                    inbox_url,
-                    json=like_data,
-                    headers={"Content-Type": "application/json"},
-                    timeout=5,
-                    auth=auth,
-                )
-            except requests.RequestException:
-                continue
+            outbound.enqueue(inbox_url, LikeSerializer(like).data, auth, lane=outbound.BULK, batch=batch)
+
+    batch.wait()
+    if batch.failed:
+        raise outbound.DeliveryFailed(
+            f"{batch.failed} of {batch.queued} deliveries to {base} failed; first: {batch.first_error}"
+        )
 
-def import_remote_entry(entry_data, default_host=None):
+def import_remote_entry(entry_data, default_host=None, authors=None):
     """Create or update an Entry object from remote data."""
 
     entry_id = entry_data.get("id")
@@ -336,7 +193,7 @@ def import_remote_entry(entry_data, default_host=None):
     if not entry_id or not author_info:
         return None
 
-    author = get_or_create_remote_author(author_info, default_host=default_host)
+    author = get_or_create_remote_author(author_info, default_host=default_host, authors=authors)
     if author is None:
         return None
 
@@ -370,41 +227,47 @@ def sync_remote_entries(remote_node):
         auth = HTTPBasicAuth(remote_node.username, remote_node.password)
 
     try:
-        res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
+        res = ratelimit.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
         res.raise_for_status()
         authors = res.json().get("authors", [])
     except requests.RequestException:
         print(f"Failed to fetch authors from {base}")
         return
 
-    for item in authors:
-        author = get_or_create_remote_author(item, default_host=base)
-        if not author:
-            continue
-        try:
-            resp = requests.get(
-                f"{base}api/authors/{author.uuid}/entries/",
-                timeout=5,
-                auth=auth,
-            )
-            resp.raise_for_status()
-            entries = resp.json()
-        except requests.RequestException:
-            continue
+    # One identity map per page: authors named again by their entries,
+    # comments and likes resolve once, and profile changes land in one write.
+    with AuthorIdentityMap() as identities:
+        identities.prefetch(authors, default_host=base)
+        for item in authors:
+            author = get_or_create_remote_author(item, default_host=base, authors=identities)
+            if not author:
+                continue
+            try:
+                resp = ratelimit.get(
+                    f"{base}api/authors/{author.uuid}/entries/",
+                    timeout=5,
+                    auth=auth,
+                )
+                resp.raise_for_status()
+                entries = resp.json()
+            except requests.RequestException:
+                continue
 
-        if isinstance(entries, dict):
-            entries = (
-                entries.get("src")
-                or entries.get("items")
-                or entries.get("results")
-                or entries.get("entries")
-                or []
-            )
+            if isinstance(entries, dict):
+                entries = (
+                    entries.get("src")
+                    or entries.get("items")
+                    or entries.get("results")
+                    or entries.get("entries")
+                    or []
+                )
 
-        for e in entries:
-            import_remote_entry(e, default_host=base)
+            for e in entries:
+                if import_remote_entry(e, default_host=base, authors=identities):
+                    metrics.sync_items.inc(node=urlparse(base).netloc, kind="entries")
+    metrics.sync_last_run.set(time.time(), node=urlparse(base).netloc, kind="entries")
 
-def import_remote_comment(comment_data, default_host=None):
+def import_remote_comment(comment_data, default_host=None, authors=None):
     """Create or update a Comment object from remote data."""
 
     comment_id = comment_data.get("id")
@@ -413,7 +276,7 @@ def import_remote_comment(comment_data, default_host=None):
     if not comment_id or not author_info or not entry_url:
         return None
 
-    author = get_or_create_remote_author(author_info, default_host=default_host)
+    author = get_or_create_remote_author(author_info, default_host=default_host, authors=authors)
     if author is None:
         return None
 
@@ -452,59 +315,65 @@ def sync_remote_comments(remote_node):
         auth = HTTPBasicAuth(remote_node.username, remote_node.password)
 
     try:
-        res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
+        res = ratelimit.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
         res.raise_for_status()
         authors = res.json().get("authors", [])
     except requests.RequestException:
         print(f"Failed to fetch authors from {base}")
         return
 
-    for item in authors:
-        author = get_or_create_remote_author(item, default_host=base)
-        if not author:
-            continue
-        try:
-            resp = requests.get(
-                f"{base}api/authors/{author.uuid}/entries/",
-                timeout=5,
-                auth=auth,
-            )
-            resp.raise_for_status()
-            entries = resp.json()
-        except requests.RequestException:
-            continue
-
-        if isinstance(entries, dict):
-            entries = (
-                entries.get("src")
-                or entries.get("items")
-                or entries.get("results")
-                or entries.get("entries")
-                or []
-            )
-
-        for e in entries:
-            entry_id = str(e.get("id", ""))
-            if not entry_id:
+    # One identity map per page: authors named again by their entries,
+    # comments and likes resolve once, and profile changes land in one write.
+    with AuthorIdentityMap() as identities:
+        identities.prefetch(authors, default_host=base)
+        for item in authors:
+            author = get_or_create_remote_author(item, default_host=base, authors=identities)
+            if not author:
                 continue
-            entry_uuid = entry_id.rstrip("/").split("/")[-1]
-            comments_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/"
             try:
-                c_resp = requests.get(comments_url, timeout=5, auth=auth)
-                c_resp.raise_for_status()
-                comments_obj = c_resp.json()
+                resp = ratelimit.get(
+                    f"{base}api/authors/{author.uuid}/entries/",
+                    timeout=5,
+                    auth=auth,
+                )
+                resp.raise_for_status()
+                entries = resp.json()
             except requests.RequestException:
                 continue
 
-            if isinstance(comments_obj, dict):
-                comments = comments_obj.get("src") or comments_obj.get("comments") or comments_obj.get("items") or comments_obj.get("results") or []
-            else:
-                comments = comments_obj
+            if isinstance(entries, dict):
+                entries = (
+                    entries.get("src")
+                    or entries.get("items")
+                    or entries.get("results")
+                    or entries.get("entries")
+                    or []
+                )
 
-            for c in comments:
-                import_remote_comment(c, default_host=base)
+            for e in entries:
+                entry_id = str(e.get("id", ""))
+                if not entry_id:
+                    continue
+                entry_uuid = entry_id.rstrip("/").split("/")[-1]
+                comments_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/"
+                try:
+                    c_resp = ratelimit.get(comments_url, timeout=5, auth=auth)
+                    c_resp.raise_for_status()
+                    comments_obj = c_resp.json()
+                except requests.RequestException:
+                    continue
+
+                if isinstance(comments_obj, dict):
+                    comments = comments_obj.get("src") or comments_obj.get("comments") or comments_obj.get("items") or comments_obj.get("results") or []
+                else:
+                    comments = comments_obj
+
+                for c in comments:
+                    if import_remote_comment(c, default_host=base, authors=identities):
+                        metrics.sync_items.inc(node=urlparse(base).netloc, kind="comments")
+    metrics.sync_last_run.set(time.time(), node=urlparse(base).netloc, kind="comments")
 
-def import_remote_like(like_data, default_host=None):
+def import_remote_like(like_data, default_host=None, authors=None):
     """Create or update a Like object from remote data."""
 
     like_id = like_data.get("id")
@@ -513,7 +382,7 @@ def import_remote_like(like_data, default_host=None):
     if not like_id or not author_info or not obj_url:
         return None
 
-    author = get_or_create_remote_author(author_info, default_host=default_host)
+    author = get_or_create_remote_author(author_info, default_host=default_host, authors=authors)
     if author is None:
         return None
 
@@ -566,87 +435,94 @@ def sync_remote_likes(remote_node):
         auth = HTTPBasicAuth(remote_node.username, remote_node.password)
 
     try:
-        res = requests.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
+        res = ratelimit.get(f"{base}api/authors/?size=100", timeout=5, auth=auth)
         res.raise_for_status()
         authors = res.json().get("authors", [])
     except requests.RequestException:
         return
 
-    for item in authors:
-        author = get_or_create_remote_author(item, default_host=base)
-        if not author:
-            continue
-        try:
-            resp = requests.get(
-                f"{base}api/authors/{author.uuid}/entries/",
-                timeout=5,
-                auth=auth,
-            )
-            resp.raise_for_status()
-            entries = resp.json()
-        except requests.RequestException:
-            continue
-
-        if isinstance(entries, dict):
-            entries = (
-                entries.get("src")
-                or entries.get("items")
-                or entries.get("results")
-                or entries.get("entries")
-                or []
-            )
-
-        for e in entries:
-            entry_id = str(e.get("id", ""))
-            if not entry_id:
+    # One identity map per page: authors named again by their entries,
+    # comments and likes resolve once, and profile changes land in one write.
+    with AuthorIdentityMap() as identities:
+        identities.prefetch(authors, default_host=base)
+        for item in authors:
+            author = get_or_create_remote_author(item, default_host=base, authors=identities)
+            if not author:
                 continue
-            entry_uuid = entry_id.rstrip('/').split('/')[-1]
-
-            likes_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/likes/"
-            try:
-                l_resp = requests.get(likes_url, timeout=5, auth=auth)
-                l_resp.raise_for_status()
-                likes_obj = l_resp.json()
-            except requests.RequestException:
-                likes_obj = None
-            if isinstance(likes_obj, dict):
-                likes = likes_obj.get("src") or likes_obj.get("items") or likes_obj.get("results") or []
-            else:
-                likes = likes_obj or []
-            for l in likes:
-                import_remote_like(l, default_host=base)
-
-            comments_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/"
             try:
-                c_resp = requests.get(comments_url, timeout=5, auth=auth)
-                c_resp.raise_for_status()
-                comments_obj = c_resp.json()
+                resp = ratelimit.get(
+                    f"{base}api/authors/{author.uuid}/entries/",
+                    timeout=5,
+                    auth=auth,
+                )
+                resp.raise_for_status()
+                entries = resp.json()
             except requests.RequestException:
                 continue
 
-            if isinstance(comments_obj, dict):
-                comments = comments_obj.get("src") or comments_obj.get("comments") or comments_obj.get("items") or comments_obj.get("results") or []
-            else:
-                comments = comments_obj
+            if isinstance(entries, dict):
+                entries = (
+                    entries.get("src")
+                    or entries.get("items")
+                    or entries.get("results")
+                    or entries.get("entries")
+                    or []
+                )
 
-            for c in comments:
-                comment_id = str(c.get("id", ""))
-                if not comment_id:
+            for e in entries:
+                entry_id = str(e.get("id", ""))
+                if not entry_id:
                     continue
-                comment_uuid = comment_id.rstrip('/').split('/')[-1]
-                c_likes_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/{comment_uuid}/likes/"
+                entry_uuid = entry_id.rstrip('/').split('/')[-1]
+
+                likes_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/likes/"
+                try:
+                    l_resp = ratelimit.get(likes_url, timeout=5, auth=auth)
+                    l_resp.raise_for_status()
+                    likes_obj = l_resp.json()
+                except requests.RequestException:
+                    likes_obj = None
+                if isinstance(likes_obj, dict):
+                    likes = likes_obj.get("src") or likes_obj.get("items") or likes_obj.get("results") or []
+                else:
+                    likes = likes_obj or []
+                for l in likes:
+                    if import_remote_like(l, default_host=base, authors=identities):
+                        metrics.sync_items.inc(node=urlparse(base).netloc, kind="likes")
+
+                comments_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/"
                 try:
-                    cl_resp = requests.get(c_likes_url, timeout=5, auth=auth)
-                    cl_resp.raise_for_status()
-                    comment_likes_obj = cl_resp.json()
+                    c_resp = ratelimit.get(comments_url, timeout=5, auth=auth)
+                    c_resp.raise_for_status()
+                    comments_obj = c_resp.json()
                 except requests.RequestException:
-                    comment_likes_obj = None
-                if isinstance(comment_likes_obj, dict):
-                    comment_likes = comment_likes_obj.get("src") or comment_likes_obj.get("items") or comment_likes_obj.get("results") or []
+                    continue
+
+                if isinstance(comments_obj, dict):
+                    comments = comments_obj.get("src") or comments_obj.get("comments") or comments_obj.get("items") or comments_obj.get("results") or []
                 else:
-                    comment_likes = comment_likes_obj or []
-                for l in comment_likes:
-                    import_remote_like(l, default_host=base)
+                    comments = comments_obj
+
+                for c in comments:
+                    comment_id = str(c.get("id", ""))
+                    if not comment_id:
+                        continue
+                    comment_uuid = comment_id.rstrip('/').split('/')[-1]
+                    c_likes_url = f"{base}api/authors/{author.uuid}/entries/{entry_uuid}/comments/{comment_uuid}/likes/"
+                    try:
+                        cl_resp = ratelimit.get(c_likes_url, timeout=5, auth=auth)
+                        cl_resp.raise_for_status()
+                        comment_likes_obj = cl_resp.json()
+                    except requests.RequestException:
+                        comment_likes_obj = None
+                    if isinstance(comment_likes_obj, dict):
+                        comment_likes = comment_likes_obj.get("src") or comment_likes_obj.get("items") or comment_likes_obj.get("results") or []
+                    else:
+                        comment_likes = comment_likes_obj or []
+                    for l in comment_likes:
+                        if import_remote_like(l, default_host=base, authors=identities):
+                            metrics.sync_items.inc(node=urlparse(base).netloc, kind="likes")
+    metrics.sync_last_run.set(time.time(), node=urlparse(base).netloc, kind="likes")
 
 def broadcast_unlisted_entry_to_followers(entry_data):
     """Send an unlisted entry to remote followers' inboxes."""
@@ -674,16 +550,7 @@ def broadcast_unlisted_entry_to_followers(entry_data):
         if host.rstrip('/') == local_base.rstrip('/'):
             continue
         inbox_url = f"{host}/authors/{follower.uuid}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=entry_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=_get_auth_for_url(inbox_url),
-            )
-        except requests.RequestException:
-            continue
+        outbound.enqueue(inbox_url, entry_data, _get_auth_for_url(inbox_url), lane=outbound.LIVE)
 
 def send_unlisted_entries_to_follower(author: Author, follower: Author):
     """Send all existing unlisted entries from `author` to a follower's inbox."""
@@ -698,16 +565,7 @@ def send_unlisted_entries_to_follower(author: Author, follower: Author):
 
     for entry in Entry.objects.filter(author=author, visibility='UNLISTED'):
         entry_data = EntryDetailSerializer(entry).data
-        try:
-            requests.post(
-                inbox_url,
-                json=entry_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=_get_auth_for_url(inbox_url),
-            )
-        except requests.RequestException:
-            continue
+        outbound.enqueue(inbox_url, entry_data, _get_auth_for_url(inbox_url), lane=outbound.LIVE)
 
 def send_friends_entries_to_friend(author: Author, friend: Author):
     """Send all existing friends-only entries from `author` to a friend's inbox."""
@@ -722,16 +580,7 @@ def send_friends_entries_to_friend(author: Author, friend: Author):
 
     for entry in Entry.objects.filter(author=author, visibility='FRIENDS'):
         entry_data = EntryDetailSerializer(entry).data
-        try:
-            requests.post(
-                inbox_url,
-                json=entry_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=_get_auth_for_url(inbox_url),
-            )
-        except requests.RequestException:
-            continue
+        outbound.enqueue(inbox_url, entry_data, _get_auth_for_url(inbox_url), lane=outbound.LIVE)
 
 def broadcast_entry_to_friends(entry_data):
     """Send a friends-only entry to remote friends' inboxes."""
@@ -765,13 +614,4 @@ def broadcast_entry_to_friends(entry_data):
         if host.rstrip('/') == local_base.rstrip('/'):
             continue
         inbox_url = f"{host}/authors/{friend.uuid}/inbox/"
-        try:
-            requests.post(
-                inbox_url,
-                json=entry_data,
-                headers={"Content-Type": "application/json"},
-                timeout=5,
-                auth=_get_auth_for_url(inbox_url),
-            )
-        except requests.RequestException:
-            continue
\ No newline at end of file
+        outbound.enqueue(inbox_url, entry_data, _get_auth_for_url(inbox_url), lane=outbound.LIVE)
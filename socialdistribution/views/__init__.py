@@ -6,4 +6,5 @@ from .comment_views import *
 from .like_views import *
 from .profile_views import *
 from .github_update_views import *
-from .search_view import *
\ No newline at end of file
+from .search_view import *
+from .performance_views import *
\ No newline at end of file
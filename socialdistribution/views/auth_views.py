@@ -5,7 +5,9 @@ from rest_framework.authentication import SessionAuthentication, BasicAuthentica
 from rest_framework import parsers
 from socialdistribution.models import Author
 from socialdistribution.models.author import FIELD_MAX_LENGTH
-from socialdistribution.serializers import AuthorSignupSerializer, AuthorSerializer
+from socialdistribution.serializers import AuthorSignupSerializer, PlainAuthorSerializer
+from socialdistribution.renderers import dumps
+from socialdistribution.conditional import ConditionalGetMixin
 from django.views.generic import TemplateView
 from rest_framework.response import Response
 from rest_framework import status
@@ -13,8 +15,13 @@ from django.contrib.auth import authenticate, login
 from django.shortcuts import redirect
 from django.contrib.auth import logout
 from django.conf import settings
-from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
+from django.db.models import Count, Max
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
 import base64
+from datetime import timezone as dt_timezone
+from itertools import islice
 
 class AuthorSignupAPIView(APIView):
     """
@@ -221,45 +228,75 @@ class AuthorProfileEditAPIView(APIView):
 
         return Response({"error": "Invalid field."}, status=status.HTTP_400_BAD_REQUEST)
 
-class AuthorsAPIView(APIView):
+class AuthorsAPIView(ConditionalGetMixin, APIView):
     """
-    GET /api/authors/?page=<page_number>&size=<size>
+    GET /api/authors/?page=<page_number>&size=<size>&updated_since=<iso datetime>
     Return {
         "type": "authors",
+        "page_number": <page>,
+        "size": <size>,
+        "count": <matching authors>,
         "authors": [ …AuthorSerializer… ]
     }
+
+    Pages default to DEFAULT_PAGE_SIZE authors and never exceed MAX_PAGE_SIZE.
+    ``updated_since`` limits the page to authors whose public representation
+    changed after that time, so peers can sync incrementally.  The body is
+    streamed in chunks, and a weak ETag lets unchanged directories answer
+    ``If-None-Match`` with a 304.
     """
 
     authentication_classes = [SessionAuthentication, BasicAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def get(self, request):
-        page_param = request.query_params.get('page', None)
-        size_param = request.query_params.get('size', None)
+    DEFAULT_PAGE_SIZE = 100
+    MAX_PAGE_SIZE = 500
+    CHUNK_SIZE = 100
 
-        authors_queryset = Author.objects.all().order_by('id')
-        
-        if page_param is not None and size_param is not None:
-            try:
-                page = int(page_param)
-                size = int(size_param)
-            except (ValueError, TypeError):
-                return Response({"error": "Page and size must be valid integers."}, status=400)
-
-            paginator = Paginator(authors_queryset, size)
-            try:
-                authors_to_serialize = paginator.page(page).object_list
-            except (EmptyPage, PageNotAnInteger):
-                authors_to_serialize = []
-        else:
-            authors_to_serialize = authors_queryset
-
-        serializer = AuthorSerializer(
-            authors_to_serialize,
-            many=True,
-            context={'request': request}
-        )
-        return Response({
+    def get(self, request):
+        try:
+            page = int(request.query_params.get('page', 1))
+            size = int(request.query_params.get('size', self.DEFAULT_PAGE_SIZE))
+        except (ValueError, TypeError):
+            return Response({"error": "Page and size must be valid integers."}, status=400)
+        if page < 1 or size < 1:
+            return Response({"error": "Page and size must be positive integers."}, status=400)
+        size = min(size, self.MAX_PAGE_SIZE)
+
+        authors_queryset = Author.objects.all()
+
+        updated_since = request.query_params.get('updated_since')
+        if updated_since:
+            since = parse_datetime(updated_since)
+            if since is None:
+                return Response({"error": "updated_since must be an ISO 8601 datetime."}, status=400)
+            if timezone.is_naive(since):
+                since = timezone.make_aware(since, dt_timezone.utc)
+            authors_queryset = authors_queryset.filter(updated_at__gt=since)
+
+        # One aggregate query decides whether the client's copy is current.
+        summary = authors_queryset.aggregate(count=Count('pk'), last=Max('updated_at'))
+        not_modified = self.not_modified(request, summary['count'], summary['last'])
+        if not_modified is not None:
+            return not_modified
+
+        start = (page - 1) * size
+        rows = PlainAuthorSerializer.rows(authors_queryset.order_by('id'))[start:start + size]
+        header = {
             'type': 'authors',
-            'authors': serializer.data
-        })
+            'page_number': page,
+            'size': size,
+            'count': summary['count'],
+        }
+
+        def stream():
+            yield dumps(header)[:-1] + b',"authors":['
+            it = rows.iterator(chunk_size=self.CHUNK_SIZE)
+            separator = b''
+            # Each chunk is encoded as a list, then its brackets are dropped.
+            while chunk := list(islice(it, self.CHUNK_SIZE)):
+                yield separator + dumps(PlainAuthorSerializer(chunk).data)[1:-1]
+                separator = b','
+            yield b']}'
+
+        return StreamingHttpResponse(stream(), content_type='application/json')
@@ -3,13 +3,17 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from socialdistribution.models import Comment, Entry, Author
-from socialdistribution.serializers import CommentSerializer
+from socialdistribution.serializers import CommentSerializer, PlainCommentSerializer
+from socialdistribution.pagination import paginate
+from socialdistribution.conditional import ConditionalGetMixin
+from django.db.models import Max, Sum
 from django.shortcuts import get_object_or_404
 from urllib.parse import unquote, urlparse
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 from rest_framework.permissions import IsAuthenticated
 from socialdistribution.utils import broadcast_comment_to_remotes, _get_auth_for_url
 import requests
+from socialdistribution import instrumentation
 from django.conf import settings
 
 class CommentAPIView(APIView):
@@ -90,7 +94,7 @@ class CommentAPIView(APIView):
 
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
-class CommentsListAPIView(APIView):
+class CommentsListAPIView(ConditionalGetMixin, APIView):
     """
     GET /api/authors/{author_id}/entries/{entry_id}/comments/
       - LOCAL: entry_id is UUID, return comments object
@@ -118,7 +122,7 @@ class CommentsListAPIView(APIView):
                 if parsed.netloc and parsed.netloc != base_netloc:
                     remote_url = lookup_id.rstrip('/') + '/comments/'
                     try:
-                        resp = requests.get(remote_url, headers={'Accept': 'application/json'})
+                        resp = instrumentation.get(remote_url, headers={'Accept': 'application/json'})
                         data = resp.json()
                     except (requests.RequestException, ValueError) as e:
                         return Response(
@@ -129,29 +133,28 @@ class CommentsListAPIView(APIView):
 
             entry = get_object_or_404(Entry, id=lookup_id, author__uuid=author_id)
 
-        page = int(request.query_params.get('page', 1))
-        qs = Comment.objects.filter(entry=entry).order_by('-created_at')
-        total = qs.count()
-        size = int(request.query_params.get('size', total))
-        start = (page - 1) * size
-        end = start + size
-        page_qs = qs[start:end]
+        qs = Comment.objects.filter(entry=entry)
+        total = entry.comment_count
+        summary = qs.aggregate(last=Max('created_at'), likes=Sum('like_count'))
+        not_modified = self.not_modified(request, total, summary['last'], summary['likes'])
+        if not_modified is not None:
+            return not_modified
+        rows, page_info = paginate(request, PlainCommentSerializer.rows(qs))
 
-        serializer = CommentSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainCommentSerializer(rows, context={'request': request})
 
         base_api = request.build_absolute_uri(f'/api/authors/{author_id}/entries/{decoded}')
         comments_obj = {
             "type": "comments",
             "id": request.build_absolute_uri(f'/api/authors/{author_id}/entries/{decoded}/comments/'),
             "web": request.build_absolute_uri(f'/authors/{author_id}/entries/{decoded}/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
         return Response(comments_obj, status=status.HTTP_200_OK)
 
-class GlobalEntryCommentsAPIView(APIView):
+class GlobalEntryCommentsAPIView(ConditionalGetMixin, APIView):
     """
     GET /api/entries/{entry_fqid}/comments/
       - LOCAL: entry_fqid is UUID
@@ -177,7 +180,7 @@ class GlobalEntryCommentsAPIView(APIView):
                 for url in urls_to_try:
                     try:
                         auth = _get_auth_for_url(url)
-                        resp = requests.get(url, headers={'Accept': 'application/json'}, auth=auth)
+                        resp = instrumentation.get(url, headers={'Accept': 'application/json'}, auth=auth)
                         resp.raise_for_status() 
                         data = resp.json()
                         return Response(data, status=resp.status_code)
@@ -192,22 +195,21 @@ class GlobalEntryCommentsAPIView(APIView):
 
         entry = get_object_or_404(Entry, id=decoded)
 
-        page = int(request.query_params.get('page', 1))
-        qs = Comment.objects.filter(entry=entry).order_by('-created_at')
-        total = qs.count()
-        size = int(request.query_params.get('size', total))
-        start = (page - 1) * size
-        end = start + size
-        page_qs = qs[start:end]
+        qs = Comment.objects.filter(entry=entry)
+        total = entry.comment_count
+        summary = qs.aggregate(last=Max('created_at'), likes=Sum('like_count'))
+        not_modified = self.not_modified(request, total, summary['last'], summary['likes'])
+        if not_modified is not None:
+            return not_modified
+        rows, page_info = paginate(request, PlainCommentSerializer.rows(qs))
 
-        serializer = CommentSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainCommentSerializer(rows, context={'request': request})
 
         comments_obj = {
             "type": "comments",
             "id": request.build_absolute_uri(f'/api/entries/{entry.id}/comments/'),
             "web": request.build_absolute_uri(f'/entries/{entry.id}/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
@@ -244,7 +246,7 @@ class EntryCommentDetailAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         try:
-            resp = requests.get(decoded, headers={'Accept': 'application/json'})
+            resp = instrumentation.get(decoded, headers={'Accept': 'application/json'})
             data = resp.json()
             return Response(data, status=resp.status_code)
         except (requests.RequestException, ValueError) as e:
@@ -329,7 +331,7 @@ class CommentLikesListAPIView(APIView):
         else:
             remote_url = decoded.rstrip('/') + '/likes/'
             try:
-                resp = requests.get(remote_url, headers={'Accept': 'application/json'})
+                resp = instrumentation.get(remote_url, headers={'Accept': 'application/json'})
                 data = resp.json()
                 return Response(data, status=resp.status_code)
             except (requests.RequestException, ValueError) as e:
@@ -384,7 +386,7 @@ class AuthorCommentDetailAPIView(APIView):
             # build the exact same path the client requested
             remote_url = f"{author_url}{request.path}"
             try:
-                resp = requests.get(
+                resp = instrumentation.get(
                     remote_url,
                     headers={'Accept': 'application/json'},
                     timeout=5
@@ -428,7 +430,7 @@ class AuthorCommentListCreateAPIView(APIView):
             # simply forward
             remote_url = decoded.rstrip('/') + '/commented/'
             try:
-                resp = requests.get(remote_url, params=request.query_params, headers={'Accept': 'application/json'})
+                resp = instrumentation.get(remote_url, params=request.query_params, headers={'Accept': 'application/json'})
                 data = resp.json()
                 return Response(data, status=resp.status_code)
             except (requests.RequestException, ValueError) as e:
@@ -436,22 +438,17 @@ class AuthorCommentListCreateAPIView(APIView):
         else:
             # local: list comments on any entry
             author = get_object_or_404(Author, uuid=decoded)
-            qs = Comment.objects.filter(author=author).order_by('-created_at')
+            qs = Comment.objects.filter(author=author)
             # pagination
-            page = int(request.query_params.get('page', 1))
-            size = int(request.query_params.get('size', 5))
-            start = (page - 1) * size
-            end = start + size
             total = qs.count()
-            page_qs = qs[start:end]
+            rows, page_info = paginate(request, PlainCommentSerializer.rows(qs), default_size=5)
 
-            serializer = CommentSerializer(page_qs, many=True, context={'request': request})
+            serializer = PlainCommentSerializer(rows, context={'request': request})
             base = request.build_absolute_uri(f'/api/authors/{author.id}/commented')
             comments_obj = {
                 'type': 'comments',
                 'id': f'{base}/',
-                'page_number': page,
-                'size': size,
+                **page_info,
                 'count': total,
                 'src': serializer.data,
             }
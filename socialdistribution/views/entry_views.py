@@ -5,7 +5,7 @@ from rest_framework import status, permissions
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 from rest_framework.permissions    import IsAuthenticated
 from django.conf import settings
-from django.db.models import Q
+from django.db.models import Count, Max, Q, Sum
 from django.shortcuts import get_object_or_404
 from django.views.generic import TemplateView
 from socialdistribution.models import Author, FollowRequest, Entry, Comment
@@ -13,7 +13,10 @@ from django.http import HttpResponse, Http404
 import base64
 import imghdr
 from django.urls import reverse
-from socialdistribution.serializers import EntryDetailSerializer
+from socialdistribution.serializers import EntryDetailSerializer, PlainEntrySerializer
+from socialdistribution import metrics, page_cache
+from socialdistribution.pagination import paginate
+from socialdistribution.conditional import ConditionalGetMixin
 from urllib.parse import unquote, urlparse
 from socialdistribution.utils import (
     broadcast_entry_to_remotes,
@@ -23,6 +26,14 @@ from socialdistribution.utils import (
 )
 from django.shortcuts import redirect
 
+def _entry_not_modified(view, request, entry):
+    """Check the entry's validators: its own and its author's edit times, and its counts."""
+    edited = max(entry.updated_at, entry.author.updated_at)
+    return view.not_modified(
+        request, entry.updated_at, entry.author.updated_at, entry.like_count, entry.comment_count,
+        last_modified=edited,
+    )
+
 class EntryDetailPageView(TemplateView):
     """
     Renders the detail page for a specific entry, including the comments.
@@ -41,6 +52,12 @@ class EntryDetailPageView(TemplateView):
     template_name = "entry_detail.html"
 
     def dispatch(self, request, *args, **kwargs):
+        # Guests get a cached copy of public entries; the back link is the
+        # only part of the page that differs between them.
+        key, cached = page_cache.lookup(request, variant=self._back_url())
+        if cached is not None:
+            return cached
+
         entry_id = unquote(self.kwargs["entry_id"])
         raw_author = self.kwargs["author_id"]
         decoded_author = unquote(str(raw_author)).rstrip("/")
@@ -99,27 +116,29 @@ class EntryDetailPageView(TemplateView):
 
         # Save entry for use in context
         self.entry = entry
-        return super().dispatch(request, *args, **kwargs)
+        response = super().dispatch(request, *args, **kwargs)
+        if entry.visibility == "PUBLIC" and not entry.is_deleted:
+            page_cache.store(key, response, page_cache.ENTRY_TTL)
+        return response
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
 
         comments = Comment.objects.filter(entry=self.entry).select_related("author").order_by("-created_at")
         context.update({"entry": self.entry, "comments": comments})
+        context["back_url"] = self._back_url()
+        return context
 
-        # Set back button link
+    def _back_url(self):
+        """Link back to the author's profile when the viewer came from it, else to the feed."""
         referer = self.request.META.get("HTTP_REFERER")
-        back_url = reverse("feed_page")
-
         if referer:
             path = urlparse(referer).path
             author_id = self.kwargs.get("author_id")
             profile_path = reverse("profile_page", args=[str(author_id)])
             if path.startswith(profile_path):
-                back_url = profile_path
-
-        context["back_url"] = back_url
-        return context
+                return profile_path
+        return reverse("feed_page")
     
 class EditEntryPageView(TemplateView):
     """Render a page to edit an existing entry."""
@@ -146,7 +165,7 @@ class EditEntryPageView(TemplateView):
         context["entry"] = entry
         return context
 
-class EntryAPIView(APIView):
+class EntryAPIView(ConditionalGetMixin, APIView):
     """
     API endpoint to manage posts (entries) by a given author.
 
@@ -203,21 +222,25 @@ class EntryAPIView(APIView):
                 else:
                     pass
 
-            entries = entries.order_by("-created_at")
-
-            page = int(request.query_params.get("page", 1))
-            size = int(request.query_params.get("size", 5))
-            total = entries.count()
-            start, end = (page - 1) * size, page * size
-            page_qs = entries[start:end]
+            # One aggregate gives the count and everything the ETag needs.
+            summary = entries.aggregate(
+                count=Count("pk"), last=Max("updated_at"),
+                likes=Sum("like_count"), comments=Sum("comment_count"),
+            )
+            not_modified = self.not_modified(
+                request, author.updated_at, *summary.values()
+            )
+            if not_modified is not None:
+                return not_modified
+            total = summary["count"]
+            rows, page_info = paginate(request, PlainEntrySerializer.rows(entries), default_size=5)
 
-            serializer = EntryDetailSerializer(page_qs, many=True, context={"request": request})
+            serializer = PlainEntrySerializer(rows, context={"request": request})
 
             entries_obj = {
                 "type": "entries",
                 "id": request.build_absolute_uri(),
-                "page_number": page,
-                "size": size,
+                **page_info,
                 "count": total,
                 "src": serializer.data,
             }
@@ -231,7 +254,7 @@ class EntryAPIView(APIView):
         uuid_str = decoded_id.rstrip('/').split('/')[-1]
         full_id = f"{host}/authors/{author_obj.uuid}/entries/{uuid_str}"
         lookup_id = entry_id if str(entry_id).startswith('http') else full_id
-        entry = get_object_or_404(Entry, id=lookup_id)
+        entry = get_object_or_404(Entry.objects.select_related("author"), id=lookup_id)
         viewer = request.user
         if entry.visibility == "DELETED" and not viewer.is_staff:
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -254,8 +277,11 @@ class EntryAPIView(APIView):
             )
             if not allowed:
                 return Response(status=status.HTTP_403_FORBIDDEN)
-   
-        serializer = EntryDetailSerializer(entry)
+
+        not_modified = _entry_not_modified(self, request, entry)
+        if not_modified is not None:
+            return not_modified
+        serializer = EntryDetailSerializer(entry, context={"request": request})
         return Response(serializer.data, status=status.HTTP_200_OK)
 
     def post(self, request, author_id, entry_id=None):
@@ -439,9 +465,10 @@ class EntryImageAPIView(APIView):
         else:
             mime = entry.contentType.replace(";base64", "")
 
+        metrics.image_bytes.inc(len(data))
         return HttpResponse(data, content_type=mime)
 
-class GlobalEntryDetailAPIView(APIView):
+class GlobalEntryDetailAPIView(ConditionalGetMixin, APIView):
     """Return a single entry referenced by its FQID."""
 
     authentication_classes = [SessionAuthentication]
@@ -460,7 +487,7 @@ class GlobalEntryDetailAPIView(APIView):
         except (ValueError, IndexError):
             return Response({'detail': 'Invalid entry FQID.'}, status=status.HTTP_400_BAD_REQUEST)
 
-        entry = get_object_or_404(Entry, id=decoded)
+        entry = get_object_or_404(Entry.objects.select_related("author"), id=decoded)
 
         if entry.visibility == "DELETED":
             return Response(status=status.HTTP_404_NOT_FOUND)
@@ -485,5 +512,8 @@ class GlobalEntryDetailAPIView(APIView):
             if not (viewer.is_staff or viewer == entry.author):
                 return Response(status=status.HTTP_403_FORBIDDEN)
 
+        not_modified = _entry_not_modified(self, request, entry)
+        if not_modified is not None:
+            return not_modified
         serializer = EntryDetailSerializer(entry, context={'request': request})
         return Response(serializer.data, status=status.HTTP_200_OK)
@@ -8,6 +8,7 @@ from rest_framework import status
 from django.shortcuts import get_object_or_404, render
 from urllib.parse import unquote, urlparse
 import requests
+from socialdistribution import instrumentation
 from django.conf import settings
 from socialdistribution.utils import (
     send_unlisted_entries_to_follower,
@@ -17,6 +18,21 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.shortcuts import redirect
+from django.http import JsonResponse
+from socialdistribution.relationships import (
+    DEFAULT_PAGE_SIZE,
+    LISTS,
+    friend_edges,
+    get_relationships,
+    page_param,
+)
+from socialdistribution.pagination import (
+    MAX_PAGE_SIZE,
+    fields_query_param,
+    paginate,
+    set_page_headers,
+)
+from socialdistribution.serializers.authorserializer import FIELD_COLUMNS as AUTHOR_FIELD_COLUMNS
 
 class FollowManagerAPIView(APIView):
     """
@@ -101,22 +117,36 @@ class FriendListAPIView(APIView):
 
     Parameters:
     - author (UUID): Required. The user whose friends you want to retrieve.
+    - page / size / cursor: see pagination; the next link and total are sent
+      in the Link and X-Total-Count headers so the body stays a plain list.
+    - fields (optional): comma-separated subset of FIELDS to return.
     """
     
     permission_classes = [IsAuthenticated]
 
+    # Output key -> Author column.
+    FIELDS = {
+        "id": "id",
+        "username": "username",
+        "displayName": "display_name",
+        "host": "host",
+        "profileImage": "profile_image",
+    }
+
     def get(self, request):
         author_id = request.query_params.get("author")
         author = get_object_or_404(Author, id = author_id)
+        fields = fields_query_param(request, list(self.FIELDS)) or ["id", "username"]
 
-        # retrieve people that I'm following, and people that are following me.
-        followings = author.followings.filter(accepted = True).values_list("to_author_id", flat = True)
-        followers = author.followers.filter(accepted = True).values_list("from_author_id", flat = True)
-        
-        mutual_ids = set(followings).intersection(set(followers))
-        friends = Author.objects.filter(id__in = mutual_ids)
+        columns = [f"to_author__{self.FIELDS[f]}" for f in fields]
+        edges = friend_edges(author).only("pk", "created_at", "to_author", *columns)
+        page, page_info = paginate(request, edges, default_size=MAX_PAGE_SIZE)
 
-        return Response([{"id": str(f.id), "username": f.username} for f in friends])
+        friends = [
+            {f: getattr(fr.to_author, self.FIELDS[f]) for f in fields}
+            for fr in page
+        ]
+        return set_page_headers(Response(friends), friend_edges(author).count(), page_info)
 
 # class RelationshipsPageView(TemplateView):
 class RelationshipsPageView(LoginRequiredMixin, TemplateView):
@@ -131,6 +161,11 @@ class RelationshipsPageView(LoginRequiredMixin, TemplateView):
     URL parameter:
     - pk (UUID): The ID of the current user whose relationships are being displayed.
 
+    Query parameters:
+    - size: people per list (default 50).
+    - friends_page, followers_page, following_page, pending_page: page of each list.
+    - format=json: return the same lists as JSON instead of HTML.
+
     Template: relationships.html
     """
     template_name = "relationships.html"
@@ -144,90 +179,89 @@ class RelationshipsPageView(LoginRequiredMixin, TemplateView):
         self.kwargs["pk"] = author_id
         return super().dispatch(request, *args, **kwargs)
     
+    def _relationships(self):
+        params = self.request.GET
+        current_user = get_object_or_404(Author, id=self.kwargs.get("pk"))
+        size = page_param(params, "size", DEFAULT_PAGE_SIZE)
+        pages = {name: page_param(params, f"{name}_page", 1) for name in LISTS}
+        return get_relationships(current_user, pages=pages, size=size)
+
+    def get(self, request, *args, **kwargs):
+        if request.GET.get("format") != "json":
+            return super().get(request, *args, **kwargs)
+
+        relationships = self._relationships()
+        context = {"request": request}
+
+        def author(user):
+            return AuthorSerializer(user, context=context).data
+
+        body = {"type": "relationships"}
+        for name, page in relationships.items():
+            if name in ("following", "followers"):
+                items = [{"author": author(i["user"]), "pending": i["pending"]} for i in page["items"]]
+            else:
+                items = [author(user) for user in page["items"]]
+            body[name] = {**page, "items": items}
+        return JsonResponse(body)
+
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        author_id = self.kwargs.get("pk")
-        current_user = get_object_or_404(Author, id=author_id)
-
-        all_requests = FollowRequest.objects.all()
-        friends_set = set()
-        followers = []
-        following = []
-        pending_requests = []
-
-        pending_sent = set(
-            FollowRequest.objects.filter(from_author=current_user, pending=True)
-            .values_list("to_author_id", flat=True)
-        )
-
-        from_to_map = {(str(fr.from_author_id), str(fr.to_author_id)): fr for fr in all_requests}
-
-        for fr in all_requests:
-            from_id = str(fr.from_author_id)
-            to_id = str(fr.to_author_id)
-
-            if from_id == str(current_user.id):
-                if fr.accepted:
-                    reverse_fr = from_to_map.get((to_id, from_id))
-                    if reverse_fr and reverse_fr.accepted:
-                        friends_set.add(fr.to_author)
-                    else:
-                        following.append({"user": fr.to_author, "pending": False})
-                elif fr.pending:
-                    following.append({"user": fr.to_author, "pending": True})
-
-            elif to_id == str(current_user.id):
-                pending = fr.from_author.id in pending_sent
-                if fr.accepted:
-                    reverse_fr = from_to_map.get((to_id, from_id))
-                    if reverse_fr and reverse_fr.accepted:
-                        friends_set.add(fr.from_author)
-                    else:
-                        followers.append({"user": fr.from_author, "pending": pending})
-                elif fr.pending:
-                    pending_requests.append(fr.from_author)
-
+        relationships = self._relationships()
         context.update({
-            "author_id": author_id,
-            "friends_list": list(friends_set),
-            "following_list": following,
-            "followers_list": followers,
-            "pending_requests_list": pending_requests,
+            "author_id": self.kwargs.get("pk"),
+            "friends_list": relationships["friends"]["items"],
+            "following_list": relationships["following"]["items"],
+            "followers_list": relationships["followers"]["items"],
+            "pending_requests_list": relationships["pending"]["items"],
+            "relationship_pages": relationships,
         })
         return context
 
 class FollowersListAPIView(APIView):
     """
-    GET /api/authors/{pk}/followers/
+    GET /api/authors/{pk}/followers/?page=<n>&size=<n>&cursor=<token>&fields=<a,b>
     Return JSON {
         "type": "followers",
+        "page_number" | "size" | "next": see pagination,
+        "count": <accepted followers>,
         "followers": [ …AuthorSerializer… ]
     }
+
+    Followers are hydrated with a single JOIN; ``fields`` trims both the
+    author objects and the columns read.  The count and next link are
+    repeated in the X-Total-Count and Link headers.
     """
     authentication_classes = [SessionAuthentication, BasicAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, pk):
         author = get_object_or_404(Author, uuid=pk)
-        author_id = author.id
+        fields = fields_query_param(request, list(AUTHOR_FIELD_COLUMNS))
 
         frs = FollowRequest.objects.filter(
-            to_author_id=author_id,
+            to_author_id=author.id,
             accepted=True
-        )
-
-        followers = [fr.from_author for fr in frs]
+        ).select_related("from_author")
+        if fields:
+            columns = {c for f in fields for c in AUTHOR_FIELD_COLUMNS[f]}
+            frs = frs.only("pk", "created_at", "from_author", *(f"from_author__{c}" for c in columns))
+        page, page_info = paginate(request, frs, default_size=MAX_PAGE_SIZE)
 
         serializer = AuthorSerializer(
-            followers,
+            [fr.from_author for fr in page],
             many=True,
+            fields=fields,
             context={'request': request}
         )
 
-        return Response({
+        response = Response({
             'type': 'followers',
+            **page_info,
+            'count': author.follower_count,
             'followers': serializer.data
         }, status=status.HTTP_200_OK)
+        return set_page_headers(response, author.follower_count, page_info)
 
 class FollowerDetailAPIView(APIView):
     """
@@ -278,7 +312,7 @@ class FollowerDetailAPIView(APIView):
             return Response(serializer.data, status=status.HTTP_200_OK)
 
         try:
-            resp = requests.get(decoded_url, headers={'Accept': 'application/json'})
+            resp = instrumentation.get(decoded_url, headers={'Accept': 'application/json'})
             data = resp.json()
         except requests.RequestException as e:
             return Response(
@@ -6,8 +6,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework import status
 from django.shortcuts import get_object_or_404
 from socialdistribution.models import Entry, Author, Like
-from socialdistribution.serializers import LikeSerializer
+from socialdistribution.serializers import LikeSerializer, PlainLikeSerializer
+from socialdistribution.pagination import paginate, int_query_param
+from socialdistribution.conditional import ConditionalGetMixin
+from django.db.models import Max
 import requests
+from socialdistribution import instrumentation
 from django.conf import settings
 from urllib.parse import unquote, urlparse
 
@@ -16,21 +20,27 @@ class LikeAPIView(APIView):
     API endpoint for liking and retrieving likes on an entry.
 
     Methods:
-    - GET: Retrieve all likes for a specific entry.
+    - GET: Retrieve all likes for a specific entry, or the one named by like_id.
     - POST: Like a specific entry by the given author (only once).
 
     URL parameters:
     - author_id (UUID): The ID of the author performing the like.
     - entry_id (UUID): The ID of the entry being liked.
+    - like_id (UUID, optional): A single like on that entry.
     """
 
-    def get(self, request, author_id, entry_id):
+    def get(self, request, author_id, entry_id, like_id=None):
         entry = get_object_or_404(Entry, id=entry_id)
+        if like_id is not None:
+            like = get_object_or_404(Like.objects.select_related("author"), uuid=like_id, entry=entry)
+            return Response(LikeSerializer(like).data, status=status.HTTP_200_OK)
         likes = Like.objects.filter(entry=entry)
         serializer = LikeSerializer(likes, many=True)
         return Response(serializer.data, status=status.HTTP_200_OK)
 
-    def post(self, request, author_id, entry_id):
+    def post(self, request, author_id, entry_id, like_id=None):
+        if like_id is not None:
+            return self.http_method_not_allowed(request)
         entry = get_object_or_404(Entry, id=entry_id)
         author = get_object_or_404(Author, uuid=author_id)
 
@@ -42,7 +52,7 @@ class LikeAPIView(APIView):
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
 
-class EntryLikesListAPIView(APIView):
+class EntryLikesListAPIView(ConditionalGetMixin, APIView):
     """
     GET /api/authors/{author_id}/entries/{entry_id}/likes/
     """
@@ -54,8 +64,8 @@ class EntryLikesListAPIView(APIView):
 
         author = get_object_or_404(Author, uuid=author_id)
 
-        page = int(request.query_params.get('page', 1))
-        size = int(request.query_params.get('size', 50))
+        page = int_query_param(request, 'page', 1)
+        size = int_query_param(request, 'size', 50)
 
         entry_id_str = str(entry_id)        
         decoded = unquote(entry_id_str)
@@ -63,7 +73,7 @@ class EntryLikesListAPIView(APIView):
 
             remote_url = decoded.rstrip('/') + '/likes/'
             try:
-                resp = requests.get(
+                resp = instrumentation.get(
                     remote_url,
                     params={'page': page, 'size': size},
                     headers={'Accept': 'application/json'}
@@ -103,7 +113,7 @@ class EntryLikesListAPIView(APIView):
                         f"{author_host_raw}/api/authors/{author_id}/entries/{decoded}/likes/"
                     )
                 try:
-                    resp = requests.get(
+                    resp = instrumentation.get(
                         remote_url,
                         params={'page': page, 'size': size},
                         headers={'Accept': 'application/json'}
@@ -117,27 +127,27 @@ class EntryLikesListAPIView(APIView):
 
             return Response({'detail': 'No Entry matches the given query.'}, status=status.HTTP_404_NOT_FOUND)
 
-        qs = Like.objects.filter(entry=entry).order_by('-created_at') 
-        total = qs.count()
-        start = (page - 1) * size
-        end = start + size
-        page_qs = qs[start:end]
+        qs = Like.objects.filter(entry=entry)
+        total = entry.like_count
+        not_modified = self.not_modified(request, total, qs.aggregate(last=Max('created_at'))['last'])
+        if not_modified is not None:
+            return not_modified
+        rows, page_info = paginate(request, PlainLikeSerializer.rows(qs), default_size=50)
 
-        serializer = LikeSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainLikeSerializer(rows, context={'request': request})
 
         base = request.build_absolute_uri(f'/api/authors/{author_id}/entries/{decoded}')
         likes_obj = {
             "type": "likes",
             "id": f"{base}/likes/",
             "web": request.build_absolute_uri(f'/authors/{author_id}/entries/{decoded}/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
         return Response(likes_obj, status=status.HTTP_200_OK)
 
-class GlobalEntryLikesAPIView(APIView):
+class GlobalEntryLikesAPIView(ConditionalGetMixin, APIView):
     """
     GET /api/entries/{entry_fqid}/likes/
       - LOCAL only
@@ -153,24 +163,21 @@ class GlobalEntryLikesAPIView(APIView):
 
         entry = get_object_or_404(Entry, id=decoded)
 
-        page = int(request.query_params.get('page', 1))
-        size = int(request.query_params.get('size', 50))
+        qs = Like.objects.filter(entry=entry)
+        total = entry.like_count
+        not_modified = self.not_modified(request, total, qs.aggregate(last=Max('created_at'))['last'])
+        if not_modified is not None:
+            return not_modified
+        rows, page_info = paginate(request, PlainLikeSerializer.rows(qs), default_size=50)
 
-        qs = Like.objects.filter(entry=entry).order_by('-created_at')
-        total = qs.count()
-        start = (page - 1) * size
-        end = start + size
-        page_qs = qs[start:end]
-
-        serializer = LikeSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainLikeSerializer(rows, context={'request': request})
 
         base_api = request.build_absolute_uri(f'/api/entries/{entry.id}')
         likes_obj = {
             "type": "likes",
             "id": f"{base_api}/likes/",
             "web": request.build_absolute_uri(f'/entries/{entry.id}/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
@@ -187,8 +194,8 @@ class AuthorLikedListAPIView(APIView):
 
         author = get_object_or_404(Author, uuid=author_id)
 
-        page = int(request.query_params.get('page', 1))
-        size = int(request.query_params.get('size', 50))
+        page = int_query_param(request, 'page', 1)
+        size = int_query_param(request, 'size', 50)
 
         def _normalize(url: str) -> str:
             url = url.rstrip('/')
@@ -205,7 +212,7 @@ class AuthorLikedListAPIView(APIView):
             else:
                 remote_url = f"{author_base_raw}/api/authors/{author.id}/liked/"
             try:
-                resp = requests.get(
+                resp = instrumentation.get(
                     remote_url,
                     params={'page': page, 'size': size},
                     headers={'Accept': 'application/json'}
@@ -217,20 +224,18 @@ class AuthorLikedListAPIView(APIView):
                     status=status.HTTP_502_BAD_GATEWAY
                 )
 
-        qs = Like.objects.filter(author=author).order_by('-created_at')
+        qs = Like.objects.filter(author=author)
         total = qs.count()
-        start, end = (page - 1) * size, page * size
-        page_qs = qs[start:end]
+        rows, page_info = paginate(request, PlainLikeSerializer.rows(qs), default_size=50)
 
-        serializer = LikeSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainLikeSerializer(rows, context={'request': request})
 
         base_api = request.build_absolute_uri(f'/api/authors/{author_id}')
         likes_obj = {
             "type": "likes",
             "id": f"{base_api}/liked/",
             "web": request.build_absolute_uri(f'/authors/{author_id}/liked/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
@@ -263,7 +268,7 @@ class AuthorLikeDetailAPIView(APIView):
             else:
                 remote_url = f"{author_host_raw}/api/authors/{author_id}/liked/{like_id}/"
             try:
-                resp = requests.get(remote_url, headers={'Accept': 'application/json'})
+                resp = instrumentation.get(remote_url, headers={'Accept': 'application/json'})
                 return Response(resp.json(), status=resp.status_code)
             except requests.RequestException as e:
                 return Response(
@@ -299,23 +304,18 @@ class GlobalAuthorLikedListAPIView(APIView):
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        qs = Like.objects.filter(author__uuid=author_id).order_by('-created_at')
+        qs = Like.objects.filter(author__uuid=author_id)
         total = qs.count()
+        rows, page_info = paginate(request, PlainLikeSerializer.rows(qs), default_size=50)
 
-        page = int(request.query_params.get('page', 1))
-        size = int(request.query_params.get('size', 50))
-        start, end = (page - 1) * size, page * size
-        page_qs = qs[start:end]
-
-        serializer = LikeSerializer(page_qs, many=True, context={'request': request})
+        serializer = PlainLikeSerializer(rows, context={'request': request})
 
         base_api = request.build_absolute_uri(f'/api/authors/{author_id}')
         likes_obj = {
             "type": "likes",
             "id": f"{base_api}/liked/",
             "web": request.build_absolute_uri(f'/authors/{author_id}/liked/'),
-            "page_number": page,
-            "size": size,
+            **page_info,
             "count": total,
             "src": serializer.data,
         }
@@ -0,0 +1,36 @@
+from django.contrib import admin
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.views.generic import TemplateView
+from rest_framework.authentication import SessionAuthentication, BasicAuthentication
+from rest_framework.permissions import IsAdminUser
+from rest_framework.views import APIView
+from socialdistribution import metrics
+from socialdistribution.instrumentation import SIMILAR_QUERY_THRESHOLD, view_stats
+
+
+class PerformancePageView(TemplateView):
+    """Per-view latency percentiles and query counts collected by PerformanceMiddleware."""
+    template_name = "admin/performance.html"
+
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        context.update(admin.site.each_context(self.request))
+        context["title"] = "Request performance"
+        context["rows"] = view_stats.summary()
+        context["similar_threshold"] = SIMILAR_QUERY_THRESHOLD
+        return context
+
+    def post(self, request):
+        view_stats.clear()
+        return redirect("admin_performance")
+
+
+class MetricsAPIView(APIView):
+    """Node metrics, merged across worker processes, in Prometheus text format."""
+    # Basic auth so a Prometheus scraper can use a staff account.
+    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return HttpResponse(metrics.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
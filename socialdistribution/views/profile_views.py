@@ -11,9 +11,12 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import SessionAuthentication, BasicAuthentication
 from socialdistribution.models.author import FIELD_MAX_LENGTH
 from socialdistribution.models import Author, FollowRequest, Entry
+from socialdistribution.models.followrequest import follow_counts
 from socialdistribution.serializers import AuthorSerializer
+from socialdistribution.conditional import ConditionalGetMixin
 
 import requests
+from socialdistribution import instrumentation
 from urllib.parse import unquote
 
 class ProfilePageView(TemplateView):
@@ -34,13 +37,10 @@ class ProfilePageView(TemplateView):
         fqid = unquote(encoded)
         author_uuid = fqid.rstrip("/").split("/")[-1]
         profile_author = get_object_or_404(Author, uuid=author_uuid)
-        
-        follower_count = FollowRequest.objects.filter(
-            to_author=profile_author, accepted=True
-        ).count()
-        following_count = FollowRequest.objects.filter(
-            from_author=profile_author, accepted=True
-        ).count()
+
+        # Follow counts are cached on the Author row itself.
+        follower_count = profile_author.follower_count
+        following_count = profile_author.following_count
 
         user = self.request.user
         is_self = (user == profile_author)
@@ -77,7 +77,11 @@ class ProfilePageView(TemplateView):
             "is_self": is_self,
         })
 
-        entries = Entry.objects.filter(author=profile_author).exclude(visibility="DELETED")
+        entries = (
+            Entry.objects.filter(author=profile_author)
+            .select_related("author")
+            .exclude(visibility="DELETED")
+        )
 
         if is_self:
             context["posts"] = entries.order_by("-created_at")
@@ -116,19 +120,34 @@ class ProfileStatsAPIView(APIView):
     """
     def get(self, request, pk):
         author_id = unquote(pk)
-        profile_author = get_object_or_404(Author, uuid=author_id)
-        follower_count = FollowRequest.objects.filter(
-            to_author=profile_author, accepted=True
-        ).count()
-        following_count = FollowRequest.objects.filter(
-            from_author=profile_author, accepted=True
-        ).count()
-        return Response({
-            "follower_count": follower_count,
-            "following_count": following_count,
-        })
+        stats = Author.objects.filter(uuid=author_id).values(
+            "follower_count", "following_count"
+        ).first()
+        if stats is None:
+            return Response({"detail": "No Author matches the given query."},
+                            status=status.HTTP_404_NOT_FOUND)
+        return Response(stats)
+
+class BulkProfileStatsAPIView(APIView):
+    """
+    GET /api/profile/stats/?id=<author_fqid>&id=<author_fqid>...
 
-class SingleAuthorAPIView(APIView):
+    Return follower and following counts for a list of authors in one query.
+    Unknown ids are left out of the response.
+    """
+    MAX_IDS = 100
+
+    def get(self, request):
+        ids = [unquote(i) for i in request.query_params.getlist("id") if i]
+        if not ids:
+            return Response({"error": "At least one 'id' query parameter is required."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(ids) > self.MAX_IDS:
+            return Response({"error": f"At most {self.MAX_IDS} ids per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return Response({"type": "stats", "stats": follow_counts(ids)})
+
+class SingleAuthorAPIView(ConditionalGetMixin, APIView):
     """
     GET /api/authors/{pk}/  — open profile to any users
     PUT /api/authors/{pk}/  — only allow authors to edit their profiles by themselves
@@ -144,6 +163,10 @@ class SingleAuthorAPIView(APIView):
     def get(self, request, pk):
         """Return the author with the given UUID."""
         author = get_object_or_404(Author, uuid=str(pk))
+        # Every field of the representation moves updated_at when it changes.
+        not_modified = self.not_modified(request, author.updated_at, last_modified=author.updated_at)
+        if not_modified is not None:
+            return not_modified
         serializer = AuthorSerializer(author, context={'request': request})
         return Response(serializer.data)
 
@@ -242,7 +265,7 @@ class RemoteSingleAuthorAPIView(APIView):
         author_url = unquote(fqid)
 
         try:
-            resp = requests.get(author_url, headers={'Accept': 'application/json'})
+            resp = instrumentation.get(author_url, headers={'Accept': 'application/json'})
         except requests.RequestException as e:
             return Response(
                 {'error': 'Failed to fetch remote author', 'detail': str(e)},
@@ -1,25 +1,39 @@
-from django.shortcuts import redirect, get_object_or_404
+from django.shortcuts import redirect
 from django.views import View
-from socialdistribution.models import Author, RemoteNode
-from django.http import JsonResponse
+from socialdistribution.models import RemoteNode
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
 from django.views.decorators.http import require_GET
 import threading
 from socialdistribution.utils import sync_remote_authors
+from socialdistribution.search import RESULT_TTL, find_author, search_authors, search_entry_ids
+from socialdistribution.models import Entry
+from socialdistribution.pagination import MAX_PAGE_SIZE, int_query_param
+from socialdistribution.serializers import PlainEntrySerializer
+from rest_framework.views import APIView
+from rest_framework.response import Response
+from rest_framework import status
+from rest_framework.authentication import SessionAuthentication, BasicAuthentication
+from rest_framework.permissions import IsAuthenticated
 
 class AuthorSearchView(View):
     def get(self, request):
         query = request.GET.get("q", "").strip()
-        author = get_object_or_404(Author, display_name__iexact=query)
+        author = find_author(query, viewer=request.user)
+        if author is None:
+            raise Http404("No author matches the given query.")
         return redirect("profile_page", pk=author.id)
     
 def author_autocomplete(request):
     q = request.GET.get("q", "").strip()
     if not q:
         return JsonResponse({"results": []})
-    
-    authors = Author.objects.filter(display_name__icontains=q)[:5]
-    data = [{"id": str(author.id), "display_name": author.display_name} for author in authors]
-    return JsonResponse({"results": data})
+
+    data = search_authors(q, viewer=request.user)
+    response = JsonResponse({"results": data})
+    # Let the browser reuse answers while the user types and backspaces.
+    patch_cache_control(response, private=True, max_age=RESULT_TTL)
+    return response
 
 @require_GET
 def sync_remote_authors_view(request):
@@ -29,3 +43,42 @@ def sync_remote_authors_view(request):
 
     threading.Thread(target=do_sync, daemon=True).start()
     return JsonResponse({"status": "ok"})
+
+
+class EntrySearchAPIView(APIView):
+    """
+    GET /api/search/entries/?q=<text>&page=<n>&size=<n>
+    Return {
+        "type": "entries",
+        "page_number": <page>,
+        "size": <size>,
+        "count": <visible matches>,
+        "src": [ …entry objects, as in the entry APIs… ]
+    }
+
+    Searches entry titles, descriptions and text content, best match first,
+    and returns only entries the requesting author is allowed to see.
+    """
+    authentication_classes = [SessionAuthentication, BasicAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response({"error": "The 'q' query parameter is required."}, status=status.HTTP_400_BAD_REQUEST)
+        page = int_query_param(request, "page", 1)
+        size = min(int_query_param(request, "size", 10), MAX_PAGE_SIZE)
+
+        ids = search_entry_ids(query, viewer=request.user)
+        page_ids = ids[(page - 1) * size:page * size]
+        by_id = {row["id"]: row for row in PlainEntrySerializer.rows(Entry.objects.filter(pk__in=page_ids))}
+        rows = [by_id[entry_id] for entry_id in page_ids if entry_id in by_id]
+
+        serializer = PlainEntrySerializer(rows, context={"request": request})
+        return Response({
+            "type": "entries",
+            "page_number": page,
+            "size": size,
+            "count": len(ids),
+            "src": serializer.data,
+        }, status=status.HTTP_200_OK)
@@ -7,17 +7,23 @@ from rest_framework.authentication import SessionAuthentication, BasicAuthentica
 from django.views.generic import TemplateView
 from django.db.models import Q
 from django.shortcuts import get_object_or_404
-from socialdistribution.models import Author, FollowRequest, Entry, Like, Comment, RemoteNode
+from socialdistribution.models import Author, FollowRequest, Entry, Like, Comment, RemoteNode, InboxItem
 from socialdistribution.models.entry import Entry
 from socialdistribution.serializers import EntryDetailSerializer, FollowRequestSerializer, LikeSerializer, InboxItemSerializer, CommentSerializer
 from django.contrib.auth.mixins import LoginRequiredMixin
-from django.db import IntegrityError
+from django.db import DatabaseError, IntegrityError
 from urllib.parse import unquote, urlparse
 from django.utils.crypto import get_random_string
 import requests
 from django.conf import settings
 from requests.auth import HTTPBasicAuth
+import json
+import logging
+import time
 import uuid
+from socialdistribution import inbox_store, instrumentation, metrics, page_cache
+from socialdistribution.pagination import paginate, set_page_headers
+from socialdistribution.identity import AuthorIdentityMap
 from socialdistribution.utils import (
     broadcast_like_to_remotes,
     broadcast_comment_to_remotes,
@@ -25,78 +31,83 @@ from socialdistribution.utils import (
     send_friends_entries_to_friend,
 )
 
+logger = logging.getLogger(__name__)
+
 # to test it, create an author mnanually in the signup page or use an existing
 # in the admin panel. copy the uuid of the author, and send a POST request 
 # using postman to /service/api/authors/author id copied/inbox. ALso set content-type.
+INBOX_TYPES = ('entry', 'comment', 'like', 'follow')
+
 class InboxAPIView(APIView):
+    """
+    GET  /api/authors/{author_id}/inbox/?page=<n>&size=<n>&cursor=<token>&type=<type>&sender=<fqid>
+    POST /api/authors/{author_id}/inbox/
+
+    POST applies a delivered entry, comment, like or follow and, once it is
+    accepted, records the payload as an InboxItem (see
+    socialdistribution.inbox_store).  GET lets the owner page through those
+    records, newest first, optionally narrowed to one type or sender.
+    """
     authentication_classes = [SessionAuthentication, BasicAuthentication,]
     permission_classes = [IsAuthenticated]
+    # Deliveries draw from their own rate-limit budget; see socialdistribution.ratelimit.
+    throttle_scope = "inbox"
+
+    def get(self, request, author_id):
+        if getattr(request.user, "uuid", None) != author_id:
+            return Response({"detail": "Forbidden"}, status=status.HTTP_403_FORBIDDEN)
+        items = InboxItem.objects.filter(owner=request.user)
+        if request.query_params.get("type"):
+            items = items.filter(type=request.query_params["type"])
+        if request.query_params.get("sender"):
+            items = items.filter(sender=request.query_params["sender"].rstrip("/"))
+        count = items.count()
+        page, page_info = paginate(request, items.only("id", "received_at", "payload"), field="received_at")
+        response = Response({
+            "type": "inbox",
+            "author": request.user.id,
+            **page_info,
+            "count": count,
+            "items": [json.loads(item.payload) for item in page],
+        })
+        return set_page_headers(response, count, page_info)
 
     def _get_or_create_author(self, data, default_host=None):
         """Return an Author instance from the payload."""
-        author_url = data.get('id') if isinstance(data, dict) else None
-        if not author_url:
-            return None
-
-        author_fqid = str(author_url).rstrip('/')
-        author_uuid = author_fqid.split('/')[-1]
-        if default_host:
-            base = default_host.rstrip('/')
-        else:
-            parsed = urlparse(author_url)
-            base = f"{parsed.scheme}://{parsed.netloc}"
-        host = base.rstrip('/')
-        if host.endswith('/api'):
-            host = host + '/'
-        else:
-            host = host + '/api/'
-        defaults = {
-            'username': author_uuid[:60],
-            'display_name': data.get('displayName', author_uuid),
-            'host': host,
-            'profile_image': data.get('profileImage', data.get('profile_image', '')),
-        }
-        defaults['uuid'] = author_uuid
-        
-        author = Author.objects.filter(uuid=author_uuid).first()
-        if not author:
-            author = Author.objects.filter(id=author_fqid).first()
-
-        if author is None:
-            author = Author(id=author_fqid, **defaults)
-            author.set_unusable_password()
-            author.is_approved = True
-
-            author.save()
-            return author
-
-        updates = []
-        local_host = settings.BASE_URL.rstrip('/') + '/api/'
-        if author.host != host and author.host.rstrip('/') != local_host.rstrip('/'):
-            author.host = host
-            updates.append('host')
-        display_name = data.get('displayName')
-        profile_image = data.get('profileImage') or data.get('profile_image')
-        if display_name and author.display_name != display_name:
-            author.display_name = display_name
-            updates.append('display_name')
-        if profile_image and author.profile_image != profile_image:
-            author.profile_image = profile_image
-            updates.append('profile_image')
-        if updates:
-            author.save(update_fields=updates)
-        return author
-
+        return self.authors.resolve(data, default_host=default_host)
 
     def post(self, request, author_id):
+        # One identity map per delivery: an author named several times in the
+        # payload is looked up once, and profile changes are written at the end.
+        with AuthorIdentityMap() as self.authors:
+            return self._receive(request, author_id)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        if request.method == "POST":
+            metrics.inbox_requests.inc(
+                type=getattr(self, "inbox_type", "unknown"), status=response.status_code
+            )
+            if response.status_code < 400 and getattr(self, "received", None) is not None:
+                try:
+                    inbox_store.record(inbox_store.owner_id(kwargs["author_id"]), self.inbox_type, self.received)
+                except DatabaseError:
+                    # The delivery was applied; failing now would only make the peer send it again.
+                    logger.exception("inbox could not store a %s delivery", self.inbox_type)
+        return response
+
+    def _receive(self, request, author_id):
         remote_node = RemoteNode.objects.filter(service_account=request.user).first()
         if not request.auth and remote_node is None and not request.user.is_authenticated:
             return Response({"detail": "Unknown remote node."}, status=status.HTTP_403_FORBIDDEN)
         payload  = request.data
         obj_type = payload.get('type')
+        self.inbox_type = obj_type if obj_type in INBOX_TYPES else 'other'
+        if obj_type in INBOX_TYPES:
+            # As delivered; the like branch rewrites ``object`` in place.
+            self.received = payload.dict() if hasattr(payload, 'dict') else dict(payload)
 
         if obj_type == 'entry':
-            print(payload)
             payload_id = payload.get("id")
             entry = None
             if payload_id:
@@ -120,7 +131,6 @@ class InboxAPIView(APIView):
         elif obj_type == 'comment':
             serializer = CommentSerializer(data=payload, context={'request': request})
         elif obj_type == 'like':
-            print(payload)
             raw_object = payload.get('object', '')
             entry_url  = unquote(raw_object).rstrip('/')
             payload['object'] = entry_url
@@ -167,7 +177,7 @@ class InboxAPIView(APIView):
                 if object_host and obj_netloc != local_netloc:
                     inbox_url = f"{object_host.rstrip('/')}/authors/{author_id}/inbox/"
                     try:
-                        requests.post(
+                        instrumentation.post(
                             inbox_url,
                             json=follow_data,
                             headers={'Content-Type': 'application/json'},
@@ -207,7 +217,7 @@ class InboxAPIView(APIView):
                     author_uuid = str(target.author.id).rstrip('/').split('/')[-1]
                     inbox_url = f"{entry_host}/api/authors/{author_uuid}/inbox/"
                     try:
-                        requests.post(
+                        instrumentation.post(
                             inbox_url,
                             json=like_data,
                             headers={'Content-Type': 'application/json'},
@@ -296,7 +306,24 @@ class FeedPageView(TemplateView):
     template_name = "feed.html"
 
     def dispatch(self, request, *args, **kwargs):
-        return super().dispatch(request, *args, **kwargs)
+        start = time.perf_counter()
+        # Guests all see the same public stream; serve it from the page cache.
+        key, cached = page_cache.lookup(request)
+        if cached is not None:
+            metrics.feed_render_seconds.observe(time.perf_counter() - start)
+            return cached
+        response = super().dispatch(request, *args, **kwargs)
+        page_cache.store(key, response, page_cache.FEED_TTL)
+        if not hasattr(response, "add_post_render_callback"):
+            # Not a template response (e.g. 405 for a POST); nothing left to render.
+            metrics.feed_render_seconds.observe(time.perf_counter() - start)
+            return response
+        # The template (and the lazy entry queryset) is rendered after
+        # dispatch returns, so stop the clock once rendering is done.
+        response.add_post_render_callback(
+            lambda r: metrics.feed_render_seconds.observe(time.perf_counter() - start)
+        )
+        return response
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -307,7 +334,8 @@ class FeedPageView(TemplateView):
             context['username'] = user.username
 
             # Build base queryset
-            entries = Entry.objects.all()
+            # Cards show the author's name and avatar; load them in the same query.
+            entries = Entry.objects.select_related("author")
             entries = entries.exclude(visibility="DELETED")
 
             # Determine follower and friend relationships
@@ -334,7 +362,7 @@ class FeedPageView(TemplateView):
         else:
             context['display_name'] = "Guest"
             context['username'] = None
-            context['entries'] = Entry.objects.filter(
+            context['entries'] = Entry.objects.select_related("author").filter(
                 visibility="PUBLIC"
             ).exclude(visibility="DELETED").order_by("-created_at")
         return context
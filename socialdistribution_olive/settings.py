@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -51,6 +52,8 @@ INSTALLED_APPS = [
 AUTH_USER_MODEL = 'socialdistribution.Author'
 
 MIDDLEWARE = [
+    # First, so its timings cover every other middleware.
+    'socialdistribution.instrumentation.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -92,6 +95,8 @@ if os.environ.get("DATABASE_URL") != None:
             ssl_require=True
         )
     }
+    # Trigram lookups for the author search (see socialdistribution/search.py).
+    INSTALLED_APPS.append('django.contrib.postgres')
 else:
     # Running locally.
     DATABASES = {
@@ -101,6 +106,35 @@ else:
         }
     }
 
+# Cache shared by every worker process, so purges, rate limit buckets and
+# invalidations made in one worker are seen by the others.  Every API request
+# reads and writes its rate limit bucket here, so it must be an in-memory
+# store: Redis (REDIS_URL, needs the ``redis`` package) or Memcached
+# (MEMCACHED_URL, needs ``pymemcache``).  One of them is required when running
+# on Heroku; locally each process gets its own LocMemCache, which is fine for
+# runserver and the tests.
+if os.environ.get("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.environ["REDIS_URL"],
+        }
+    }
+elif os.environ.get("MEMCACHED_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.memcached.PyMemcacheCache",
+            "LOCATION": os.environ["MEMCACHED_URL"],
+        }
+    }
+elif os.environ.get("DATABASE_URL") is not None:
+    raise ImproperlyConfigured("Set REDIS_URL or MEMCACHED_URL: the workers need a shared cache.")
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -168,10 +202,70 @@ REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.SessionAuthentication",
         # "rest_framework.authentication.BasicAuthentication",
-    ]
+    ],
+    # orjson-backed when installed; same output as DRF's JSONRenderer.
+    "DEFAULT_RENDERER_CLASSES": [
+        "socialdistribution.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    # Token buckets per peer node, user or anonymous IP; see RATE_LIMITS.
+    "DEFAULT_THROTTLE_CLASSES": [
+        "socialdistribution.ratelimit.PeerRateThrottle",
+    ],
 }
 
+# API rate limits per scope: ``rate`` requests per second refill a bucket of
+# ``burst``.  ``inbox`` is inbox deliveries, ``read`` every GET and ``write``
+# every other write.  A scope left out is not limited.
+RATE_LIMITS = {
+    "inbox": {"rate": 20, "burst": 200},
+    "read": {"rate": 50, "burst": 500},
+    "write": {"rate": 10, "burst": 100},
+}
+# Longest Retry-After (seconds) background federation requests (deliveries and
+# syncs) wait out before giving up; see socialdistribution.ratelimit.
+OUTBOUND_MAX_WAIT = 10
+
+# Outbound inbox deliveries (socialdistribution.outbound): worker threads,
+# requests in flight per remote node, workers that may send backfill at once,
+# backfill jobs queued before the backfill waits, and how often each lane is
+# picked relative to the others.
+OUTBOUND_WORKERS = 8
+OUTBOUND_PER_NODE = 4
+OUTBOUND_BULK_WORKERS = 2
+OUTBOUND_BULK_QUEUE = 500
+OUTBOUND_LANE_WEIGHTS = {"interactive": 8, "live": 4, "bulk": 1}
+
 BASE_URL = os.environ.get("BASE_URL", "http://localhost:8000")
 
+# Requests slower than this (ms) are logged with their top queries; None disables.
+SLOW_REQUEST_MS = int(os.environ.get("SLOW_REQUEST_MS", 1000))
+
+# Shared by all workers on a node so /admin/metrics/ can merge their counters;
+# defaults to a directory under the system temp dir.
+METRICS_DIR = os.environ.get("METRICS_DIR")
+
+# Received inbox items are kept for INBOX_RETENTION_DAYS.
+INBOX_RETENTION_DAYS = int(os.environ.get("INBOX_RETENTION_DAYS", 30))
+
+# App log lines go to stderr as ``key=value`` records; LOG_LEVEL=DEBUG adds
+# every inbox delivery with its payload.
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "plain": {"format": "%(asctime)s level=%(levelname)s logger=%(name)s %(message)s"},
+    },
+    "handlers": {
+        "console": {"class": "logging.StreamHandler", "formatter": "plain"},
+    },
+    "loggers": {
+        "socialdistribution": {
+            "handlers": ["console"],
+            "level": os.environ.get("LOG_LEVEL", "INFO"),
+        },
+    },
+}
+
 REQUIRE_ADMIN_APPROVAL = False  # or False so users can sign up without approval.
 
@@ -16,8 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path, include
+from socialdistribution.views import MetricsAPIView, PerformancePageView
 
 urlpatterns = [
+    # Registered ahead of the admin so its catch-all does not swallow it.
+    path('admin/performance/', admin.site.admin_view(PerformancePageView.as_view()), name='admin_performance'),
+    path('admin/metrics/', MetricsAPIView.as_view(), name='admin_metrics'),
     path('admin/', admin.site.urls),
     path('', include('socialdistribution.urls')),
     path('api-auth/', include('rest_framework.urls')), 